@@ -7,10 +7,6 @@ local level, but this will at least provide a foundation.
 
 """
 
-from importlib.metadata import version
-
-__version__ = version("looper")
-
 # Lazy imports - only loaded when accessed
 _lazy_imports = {
     "DEFAULT_COMPUTE_RESOURCES_NAME": ".divvy",
@@ -21,14 +17,26 @@ _lazy_imports = {
     "write_submission_yaml": ".conductor",
     "PipelineInterface": ".pipeline_interface",
     "write_custom_template": ".plugins",
+    "write_custom_template_batch": ".plugins",
     "write_sample_yaml": ".plugins",
     "write_sample_yaml_cwl": ".plugins",
     "write_sample_yaml_prj": ".plugins",
+    "write_sample_yaml_batch": ".plugins",
+    "write_sample_yaml_cwl_batch": ".plugins",
+    "write_sample_yaml_prj_batch": ".plugins",
+    "write_sample_jsonl": ".plugins",
+    "read_sample_jsonl": ".plugins",
     "Project": ".project",
 }
 
 
 def __getattr__(name):
+    if name == "__version__":
+        # reading the package metadata costs more than the rest of this module
+        from importlib.metadata import version
+
+        value = globals()["__version__"] = version("looper")
+        return value
     if name in _lazy_imports:
         module_path = _lazy_imports[name]
         import importlib
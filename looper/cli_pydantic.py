@@ -8,13 +8,13 @@ allowing for type-checking and validation of arguments.
 import os
 import sys
 from argparse import Namespace
+from typing import TYPE_CHECKING
 
-from pydantic_settings import get_subcommand
+if TYPE_CHECKING:
+    from .command_models.commands import TopLevelParser
 
-from .command_models.commands import SUPPORTED_COMMANDS, TopLevelParser
 
-
-def flatten_args(args: TopLevelParser) -> Namespace:
+def flatten_args(args: "TopLevelParser") -> Namespace:
     """Convert pydantic-settings args to argparse.Namespace for compatibility.
 
     pydantic-settings produces a nested structure where subcommand args are
@@ -25,6 +25,10 @@ def flatten_args(args: TopLevelParser) -> Namespace:
     Only one subcommand is ever active at a time, so there are no conflicts
     between arguments with the same name on different subcommands.
     """
+    from pydantic_settings import get_subcommand
+
+    from .command_models.commands import SUPPORTED_COMMANDS
+
     subcmd_args = get_subcommand(args, is_required=True)
 
     # Determine command name from the subcommand model
@@ -73,35 +77,89 @@ def validate_post_parse(
         problems.append(
             f"Used multiple mutually exclusive options: {', '.join(used_exclusives)}"
         )
+    if getattr(args, "then_runp", None) and getattr(args, "shard", None):
+        problems.append(
+            "--then-runp can't be combined with --shard: every shard would "
+            "submit its own project pipelines"
+        )
+    if getattr(args, "plan", None) and getattr(args, "then_runp", None):
+        problems.append(
+            "--plan can't be combined with --then-runp: the project pipelines "
+            "depend on the IDs of submitted jobs"
+        )
+    if getattr(args, "chunk_size", None) is not None:
+        if args.chunk_size < 1:
+            problems.append("--chunk-size must be a positive integer")
+        # these need the whole sample table before the first submission
+        problems.extend(
+            f"--chunk-size can't be combined with {opt}"
+            for opt, attr in map(
+                opt_attr_pair, ["limit", "skip", "lump-j", "then-runp"]
+            )
+            if getattr(args, attr, None)
+        )
+    if getattr(args, "jobs", None) is not None and args.jobs < 1:
+        problems.append("--jobs must be a positive integer")
+    from .const import TABLE_FORMATS
+
+    if getattr(args, "format", None) and args.format not in TABLE_FORMATS:
+        problems.append(f"--format must be one of: {', '.join(TABLE_FORMATS)}")
+    if getattr(args, "shard", None):
+        from .utils import parse_shard
+
+        try:
+            parse_shard(args.shard)
+        except ValueError as e:
+            problems.append(str(e))
     return problems
 
 
-def run_looper(args: Namespace, test_args=None):
+def run_looper(args: Namespace, test_args=None, project_cache=None):
     """Run looper with parsed arguments.
 
     Args:
         args: Flattened arguments from pydantic-settings
         test_args: Optional test arguments for testing purposes
+        project_cache: Optional `looper.daemon.ProjectCache` to reuse
+            already loaded projects from, given when serving the command
+            from a daemon
+
+    Raises:
+        looper.daemon.RunLocally: When serving from a daemon a command that
+            would execute jobs in the foreground.
     """
+    trace_path = getattr(args, "profile_trace", None)
+    if not (getattr(args, "profile", False) or trace_path):
+        return _run_looper(args, test_args, project_cache)
+    from .profiling import profiling
+
+    with profiling(trace_path):
+        return _run_looper(args, test_args, project_cache)
+
+
+def _run_looper(args: Namespace, test_args=None, project_cache=None):
     # Lazy imports - only load when actually running commands
     import logmuse
     import yaml
-    from eido import inspect_project
-    from pephubclient import PEPHubClient
-    from rich.console import Console
 
     from . import __version__
     from .const import (
         CLI_KEY,
         CLI_PROJ_ATTRS,
+        DRY_RUN_KEY,
         EXAMPLE_COMPUTE_SPEC_FMT,
+        JOB_ID_PATTERN_KEY,
         PROJECT_PL_ARG,
         SAMPLE_EXCLUSION_OPTNAME,
         SAMPLE_INCLUSION_OPTNAME,
         SAMPLE_PL_ARG,
         PipelineLevel,
     )
-    from .divvy import DEFAULT_COMPUTE_RESOURCES_NAME, select_divvy_config
+    from .divvy import (
+        DEFAULT_COMPUTE_RESOURCES_NAME,
+        ComputingConfiguration,
+        select_divvy_config,
+    )
     from .exceptions import (
         MisconfigurationException,
         PipestatConfigurationException,
@@ -116,7 +174,9 @@ def run_looper(args: Namespace, test_args=None):
         Reporter,
         Runner,
         Tabulator,
+        Watcher,
     )
+    from .profiling import phase
     from .project import Project, ProjectContext
     from .utils import (
         dotfile_path,
@@ -134,7 +194,9 @@ def run_looper(args: Namespace, test_args=None):
 
     global _LOGGER
 
-    _LOGGER = logmuse.logger_via_cli(args, make_root=True)
+    # Log to the current stderr rather than the one logmuse saw at import,
+    # which matters when a daemon serves the command
+    _LOGGER = logmuse.logger_via_cli(args, make_root=True, stream=sys.stderr)
 
     subcommand_name = args.command
 
@@ -151,6 +213,8 @@ def run_looper(args: Namespace, test_args=None):
         sys.exit(1)
 
     if subcommand_name == "init":
+        from rich.console import Console
+
         console = Console()
         console.clear()
         console.rule("\n[magenta]Looper initialization[/magenta]")
@@ -174,15 +238,21 @@ def run_looper(args: Namespace, test_args=None):
     if subcommand_name == "init_piface":
         sys.exit(int(not init_generic_pipeline()))
 
+    if subcommand_name == "daemon":
+        from .daemon import default_socket_path, serve
+
+        return serve(args.socket or default_socket_path())
+
     _LOGGER.info("Looper version: {}\nCommand: {}".format(__version__, subcommand_name))
 
     looper_cfg_path = os.path.relpath(dotfile_path(), start=os.curdir)
     try:
-        if args.config:
-            looper_config_dict = read_looper_config_file(args.config)
-        else:
-            looper_config_dict = read_looper_dotfile()
-            _LOGGER.info(f"Using looper config ({looper_cfg_path}).")
+        with phase("config.read"):
+            if args.config:
+                looper_config_dict = read_looper_config_file(args.config)
+            else:
+                looper_config_dict = read_looper_dotfile()
+                _LOGGER.info(f"Using looper config ({looper_cfg_path}).")
 
         cli_modifiers_dict = None
         for looper_config_key, looper_config_item in looper_config_dict.items():
@@ -208,6 +278,10 @@ def run_looper(args: Namespace, test_args=None):
         cli_modifiers=cli_modifiers_dict,
     )
 
+    if getattr(args, "plan", None):
+        # plan like a dry run, which doesn't create the project's folders
+        args.dry_run = True
+
     # If project pipeline interface defined in the cli, change name to: "pipeline_interface"
     if getattr(args, PROJECT_PL_ARG, None):
         args.pipeline_interfaces = getattr(args, PROJECT_PL_ARG)
@@ -221,22 +295,78 @@ def run_looper(args: Namespace, test_args=None):
 
     # Initialize project
     if is_PEP_file_type(args.pep_config) and os.path.exists(args.pep_config):
-        try:
-            p = Project(
-                cfg=args.pep_config,
+        project_kwargs = {
+            attr: getattr(args, attr) for attr in CLI_PROJ_ATTRS if hasattr(args, attr)
+        }
+        cache_key = p = snapshot = None
+        # a streamed run creates the samples chunk by chunk, as it goes
+        defer_samples = getattr(args, "chunk_size", None) is not None
+        if project_cache is not None and not defer_samples:
+            cache_key = _project_cache_key(
+                args.pep_config,
+                args.amend,
+                divcfg,
+                subcommand_name == "runp",
+                project_kwargs,
+            )
+            p = project_cache.get(cache_key)
+        if (
+            getattr(args, "project_snapshot", False)
+            and project_kwargs.get("output_dir")
+            and not defer_samples
+        ):
+            from .snapshot import load_snapshot, snapshot_path
+
+            snapshot = snapshot_path(
+                project_kwargs["output_dir"],
+                pep_config=os.path.abspath(args.pep_config),
                 amendments=args.amend,
-                divcfg_path=divcfg,
                 runp=subcommand_name == "runp",
-                **{
-                    attr: getattr(args, attr)
-                    for attr in CLI_PROJ_ATTRS
-                    if hasattr(args, attr)
-                },
+                project_kwargs=project_kwargs,
+            )
+            if p is None:
+                p = load_snapshot(snapshot)
+                if p is not None and cache_key is not None:
+                    project_cache.put(cache_key, p, _project_sources(p, divcfg))
+        if p is not None:
+            _LOGGER.debug(f"Reusing loaded project: {args.pep_config}")
+            # compute package activation is per command, start from scratch
+            p.dcc = (
+                None
+                if divcfg is None
+                else ComputingConfiguration.from_yaml_file(filepath=divcfg)
             )
-        except yaml.parser.ParserError as e:
-            _LOGGER.error(f"Project config parse failed -- {e}")
-            sys.exit(1)
+            # pipestat backends read their results only once; drop the old
+            # managers so that each command configures pipestat anew
+            for piface in [*p.pipeline_interfaces, *p.project_pipeline_interfaces]:
+                vars(piface).pop("psm", None)
+            if DRY_RUN_KEY in p and not p[DRY_RUN_KEY]:
+                p.make_project_dirs()
+        else:
+            try:
+                with phase("project.init"):
+                    p = Project(
+                        cfg=args.pep_config,
+                        amendments=args.amend,
+                        divcfg_path=divcfg,
+                        runp=subcommand_name == "runp",
+                        defer_samples=defer_samples,
+                        **project_kwargs,
+                    )
+            except yaml.parser.ParserError as e:
+                _LOGGER.error(f"Project config parse failed -- {e}")
+                sys.exit(1)
+            if cache_key is not None:
+                project_cache.put(cache_key, p, _project_sources(p, divcfg))
+            if snapshot is not None:
+                from .snapshot import save_snapshot
+
+                # resolve the interfaces now, so that they are part of it
+                p.pipeline_interfaces, p.project_pipeline_interfaces  # noqa: B018
+                save_snapshot(p, snapshot, _project_sources(p, None))
     elif is_pephub_registry_path(args.pep_config):
+        from pephubclient import PEPHubClient
+
         if getattr(args, SAMPLE_PL_ARG, None):
             p = Project(
                 amendments=args.amend,
@@ -258,6 +388,15 @@ def run_looper(args: Namespace, test_args=None):
             "Cannot load PEP. Check file path or registry path to pep."
         )
 
+    if project_cache is None and subcommand_name in (
+        "check",
+        "destroy",
+        "clean",
+        "table",
+    ):
+        # these only read a few attributes of each sample
+        p.compact_samples()
+
     selected_compute_pkg = p.selected_compute_package or DEFAULT_COMPUTE_RESOURCES_NAME
     if p.dcc is not None and not p.dcc.activate_package(selected_compute_pkg):
         _LOGGER.info(
@@ -265,6 +404,18 @@ def run_looper(args: Namespace, test_args=None):
                 selected_compute_pkg
             )
         )
+    if (
+        project_cache is not None
+        and subcommand_name in ("run", "rerun", "runp")
+        and not getattr(args, "dry_run", False)
+        and p.dcc is not None
+    ):
+        from .daemon import LOCAL_SUBMISSION_COMMANDS, RunLocally
+
+        sub_cmd = (p.dcc.compute.get("submission_command") or "").strip() or "."
+        if sub_cmd.split()[0] in LOCAL_SUBMISSION_COMMANDS:
+            # the daemon serves one command at a time; don't block it on jobs
+            raise RunLocally(subcommand_name)
 
     with ProjectContext(
         prj=p,
@@ -273,6 +424,7 @@ def run_looper(args: Namespace, test_args=None):
         selector_exclude=args.sel_excl,
         selector_flag=args.sel_flag,
         exclusion_flag=args.exc_flag,
+        selector_expression=getattr(args, "sel_expr", None),
     ) as prj:
         # Check at the beginning if user wants to use pipestat and pipestat is configurable
         is_pipestat_configured = (
@@ -293,7 +445,24 @@ def run_looper(args: Namespace, test_args=None):
                     args, read_yaml_file, EXAMPLE_COMPUTE_SPEC_FMT, _LOGGER
                 )
 
-                return run(args, rerun=rerun, **compute_kwargs)
+                run_debug = run(args, rerun=rerun, **compute_kwargs)
+                if getattr(args, "then_runp", None) and run_debug is not False:
+                    if run.num_missing_job_ids:
+                        # Chaining on a partial list would let project
+                        # pipelines start before all sample jobs finish
+                        _LOGGER.error(
+                            f"Not submitting project pipelines: job IDs of "
+                            f"{run.num_missing_job_ids} sample job submission(s) "
+                            f"are unknown. Set '{JOB_ID_PATTERN_KEY}' in the "
+                            f"compute package to capture them."
+                        )
+                        sys.exit(1)
+                    _LOGGER.info(
+                        f"Submitting project pipelines dependent on "
+                        f"{len(run.job_ids)} sample job(s)"
+                    )
+                    Collator(prj)(args, dependencies=run.job_ids, **compute_kwargs)
+                return run_debug
             except SampleFailedException:
                 sys.exit(1)
             except IOError:
@@ -312,6 +481,12 @@ def run_looper(args: Namespace, test_args=None):
             collate(args, **compute_kwargs)
             return collate.debug
 
+        if subcommand_name == "watch":
+            compute_kwargs = _proc_resources_spec(
+                args, read_yaml_file, EXAMPLE_COMPUTE_SPEC_FMT, _LOGGER
+            )
+            return Watcher(prj)(args, **compute_kwargs)
+
         if subcommand_name == "destroy":
             return Destroyer(prj)(args)
 
@@ -343,6 +518,8 @@ def run_looper(args: Namespace, test_args=None):
             return Cleaner(prj)(args)
 
         if subcommand_name == "inspect":
+            from eido import inspect_project
+
             # Inspect PEP from Eido
             sample_names = []
             for sample in p.samples:
@@ -366,6 +543,8 @@ def main(test_args=None) -> dict:
     Returns:
         Result from run_looper
     """
+    from .command_models.commands import TopLevelParser
+
     if test_args:
         args = TopLevelParser(_cli_parse_args=test_args)
     else:
@@ -376,9 +555,57 @@ def main(test_args=None) -> dict:
 
 
 def main_cli() -> None:
+    if sys.argv[1:] == ["--version"]:
+        # answered before the parser and its dependencies are imported
+        from . import __version__
+
+        print(f"looper {__version__}")
+        sys.exit(0)
+
+    from .daemon import DAEMON_SOCKET_VARNAME, forward
+
+    socket_path = os.environ.get(DAEMON_SOCKET_VARNAME)
+    if socket_path:
+        code = forward(sys.argv[1:], socket_path)
+        if code is not None:
+            sys.exit(code)
     main()
 
 
+def _project_cache_key(
+    pep_config: str, amendments, divcfg: str | None, runp: bool, project_kwargs: dict
+) -> str:
+    """Key under which a loaded project can be reused by later commands.
+
+    Captures everything the project is constructed with; relative paths are
+    resolved against the working directory, so that is part of the key too.
+    """
+    import json
+
+    return json.dumps(
+        [
+            os.getcwd(),
+            os.path.abspath(pep_config),
+            amendments,
+            divcfg,
+            runp,
+            project_kwargs,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+
+
+def _project_sources(prj, divcfg: str | None) -> list[str]:
+    """Files a loaded project depends on; see `looper.daemon.ProjectCache`."""
+    sources = [prj.config_file, *prj.sample_table_sources]
+    sources.extend(prj.pipeline_interface_sources)
+    sources.extend(prj.project_pipeline_interface_sources)
+    if divcfg is not None:
+        sources.append(divcfg)
+    return [src for src in sources if src and os.path.isfile(src)]
+
+
 def _proc_resources_spec(
     args, read_yaml_file, example_compute_spec_fmt, logger
 ) -> dict[str, str]:
@@ -183,6 +183,12 @@ class ArgumentEnum(enum.Enum):
         default=(int | None, None),
         description="Skip samples by numerical index",
     )
+    SHARD = Argument(
+        name="shard",
+        default=(str | None, None),
+        description="Select shard K of N (e.g. 2/4); samples are assigned to "
+        "shards by a stable hash of their sample table index",
+    )
     CONFIG = Argument(
         name="config",
         alias="c",
@@ -255,6 +261,12 @@ class ArgumentEnum(enum.Enum):
         default=(str, ""),
         description="Exclude samples with these values",
     )
+    SEL_EXPR = Argument(
+        name="sel_expr",
+        default=(str | None, None),
+        description="Include only samples for which this expression over sample "
+        "attributes holds, e.g. \"protocol in ['ATAC', 'RNA'] and read_length > 50\"",
+    )
     SEL_FLAG = Argument(
         name="sel_flag", default=(list, []), description="Sample selection flag"
     )
@@ -280,7 +292,8 @@ class ArgumentEnum(enum.Enum):
     )
     DIVVY = Argument(
         name="divvy",
-        default=(str, os.getenv("DIVCFG", None)),
+        # None defers to $DIVCFG when the config is selected, not at import
+        default=(str | None, None),
         description=(
             "Path to divvy configuration file. Default=$DIVCFG env "
             "variable. Currently: {}".format(os.getenv("DIVCFG") or "not set")
@@ -313,6 +326,93 @@ class ArgumentEnum(enum.Enum):
         default=(bool, False),
         description="Makes html report portable.",
     )
+    CLAIM_TTL = Argument(
+        name="claim_ttl",
+        default=(int | None, None),
+        description="Claim samples before submission so that concurrent looper "
+        "processes don't submit duplicate jobs; claims expire after this many seconds",
+    )
+    SHARDED_SUBMISSION = Argument(
+        name="sharded_submission",
+        default=(bool, False),
+        description="Spread submission scripts and logs over subfolders of the "
+        "submission folder, named by a hash prefix of the job name",
+    )
+    CHUNK_SIZE = Argument(
+        name="chunk_size",
+        default=(int | None, None),
+        description="Create, validate and submit samples this many at a time, "
+        "instead of processing the whole sample table first",
+    )
+    JOBS = Argument(
+        name="jobs",
+        default=(int | None, None),
+        description="Number of sample folders to remove, cleanup scripts to "
+        "run, or report pages to render at a time",
+    )
+    SUBMIT = Argument(
+        name="submit",
+        default=(bool, False),
+        description="Submit the cleanup scripts of each sample as a job, with "
+        "the active compute package, rather than run them here",
+    )
+    TABLE_FORMAT = Argument(
+        name="format",
+        default=(str | None, None),
+        description="Write all results to a single table in this format, one "
+        "of: tsv, parquet, arrow, instead of the stats and objects summaries",
+    )
+    PLAN = Argument(
+        name="plan",
+        default=(str | None, None),
+        description="Write the execution plan as JSON Lines to this file ('-' "
+        "for stdout) instead of writing and submitting job scripts",
+    )
+    PROFILE = Argument(
+        name="profile",
+        default=(bool, False),
+        description="Report the time spent in each phase of the command",
+    )
+    PROFILE_TRACE = Argument(
+        name="profile_trace",
+        default=(str | None, None),
+        description="Write the timed phases to this Chrome trace event file; "
+        "implies --profile",
+    )
+    PROJECT_SNAPSHOT = Argument(
+        name="project_snapshot",
+        default=(bool, False),
+        description="Reuse the processed project saved in the output directory "
+        "by an earlier run with the same arguments, unless its files changed",
+    )
+    SOCKET = Argument(
+        name="socket",
+        default=(str | None, None),
+        description="Path of the Unix socket to listen on. "
+        "Default: $LOOPER_DAEMON_SOCKET, $XDG_RUNTIME_DIR/looper.sock or a "
+        "private per-user directory in the temp directory",
+    )
+    THEN_RUNP = Argument(
+        name="then_runp",
+        default=(bool, False),
+        description="After submitting sample jobs, submit project pipelines "
+        "that depend on them (requires a compute package 'dependency_template')",
+    )
+    POLL_INTERVAL = Argument(
+        name="poll_interval",
+        default=(int, 30),
+        description="Seconds to wait between checks for new samples and input files",
+    )
+    MAX_POLLS = Argument(
+        name="max_polls",
+        default=(int | None, None),
+        description="Stop watching after this many checks. Default: watch until interrupted",
+    )
+    DIGEST_INTERVAL = Argument(
+        name="digest_interval",
+        default=(int, 600),
+        description="Seconds between status digests while nothing is submitted",
+    )
     PROJECT_LEVEL = Argument(
         name="project",
         default=(bool, False),
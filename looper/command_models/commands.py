@@ -96,8 +96,10 @@ SHARED_ARGUMENTS = [
     ArgumentEnum.SEL_ATTR.value,
     ArgumentEnum.SEL_INCL.value,
     ArgumentEnum.SEL_EXCL.value,
+    ArgumentEnum.SEL_EXPR.value,
     ArgumentEnum.LIMIT.value,
     ArgumentEnum.SKIP.value,
+    ArgumentEnum.SHARD.value,
     ArgumentEnum.PEP_CONFIG.value,
     ArgumentEnum.OUTPUT_DIR.value,
     ArgumentEnum.CONFIG.value,
@@ -106,6 +108,9 @@ SHARED_ARGUMENTS = [
     ArgumentEnum.PIPESTAT.value,
     ArgumentEnum.AMEND.value,
     ArgumentEnum.PROJECT_LEVEL.value,
+    ArgumentEnum.PROJECT_SNAPSHOT.value,
+    ArgumentEnum.PROFILE.value,
+    ArgumentEnum.PROFILE_TRACE.value,
 ]
 
 RunParser = Command(
@@ -124,6 +129,11 @@ RunParser = Command(
         ArgumentEnum.SKIP_FILE_CHECKS.value,
         ArgumentEnum.COMPUTE.value,
         ArgumentEnum.PACKAGE.value,
+        ArgumentEnum.THEN_RUNP.value,
+        ArgumentEnum.CLAIM_TTL.value,
+        ArgumentEnum.SHARDED_SUBMISSION.value,
+        ArgumentEnum.CHUNK_SIZE.value,
+        ArgumentEnum.PLAN.value,
     ],
 )
 
@@ -144,6 +154,11 @@ RerunParser = Command(
         ArgumentEnum.SKIP_FILE_CHECKS.value,
         ArgumentEnum.COMPUTE.value,
         ArgumentEnum.PACKAGE.value,
+        ArgumentEnum.THEN_RUNP.value,
+        ArgumentEnum.CLAIM_TTL.value,
+        ArgumentEnum.SHARDED_SUBMISSION.value,
+        ArgumentEnum.CHUNK_SIZE.value,
+        ArgumentEnum.PLAN.value,
     ],
 )
 
@@ -163,6 +178,33 @@ RunProjectParser = Command(
         ArgumentEnum.SKIP_FILE_CHECKS.value,
         ArgumentEnum.COMPUTE.value,
         ArgumentEnum.PACKAGE.value,
+        ArgumentEnum.SHARDED_SUBMISSION.value,
+        ArgumentEnum.PLAN.value,
+    ],
+)
+
+# WATCH
+WatchParser = Command(
+    "watch",
+    MESSAGE_BY_SUBCOMMAND["watch"],
+    [
+        ArgumentEnum.IGNORE_FLAGS.value,
+        ArgumentEnum.TIME_DELAY.value,
+        ArgumentEnum.DRY_RUN.value,
+        ArgumentEnum.COMMAND_EXTRA.value,
+        ArgumentEnum.COMMAND_EXTRA_OVERRIDE.value,
+        ArgumentEnum.LUMP.value,
+        ArgumentEnum.LUMPN.value,
+        ArgumentEnum.LUMPJ.value,
+        ArgumentEnum.DIVVY.value,
+        ArgumentEnum.SKIP_FILE_CHECKS.value,
+        ArgumentEnum.COMPUTE.value,
+        ArgumentEnum.PACKAGE.value,
+        ArgumentEnum.CLAIM_TTL.value,
+        ArgumentEnum.SHARDED_SUBMISSION.value,
+        ArgumentEnum.POLL_INTERVAL.value,
+        ArgumentEnum.MAX_POLLS.value,
+        ArgumentEnum.DIGEST_INTERVAL.value,
     ],
 )
 
@@ -172,6 +214,7 @@ TableParser = Command(
     MESSAGE_BY_SUBCOMMAND["table"],
     [
         ArgumentEnum.REPORT_OUTPUT_DIR.value,
+        ArgumentEnum.TABLE_FORMAT.value,
     ],
 )
 
@@ -183,6 +226,7 @@ ReportParser = Command(
     [
         ArgumentEnum.PORTABLE.value,
         ArgumentEnum.REPORT_OUTPUT_DIR.value,
+        ArgumentEnum.JOBS.value,
     ],
 )
 
@@ -193,6 +237,7 @@ DestroyParser = Command(
     [
         ArgumentEnum.DRY_RUN.value,
         ArgumentEnum.FORCE_YES.value,
+        ArgumentEnum.JOBS.value,
     ],
 )
 
@@ -214,6 +259,11 @@ CleanParser = Command(
     [
         ArgumentEnum.DRY_RUN.value,
         ArgumentEnum.FORCE_YES.value,
+        ArgumentEnum.JOBS.value,
+        ArgumentEnum.SUBMIT.value,
+        ArgumentEnum.SHARDED_SUBMISSION.value,
+        ArgumentEnum.DIVVY.value,
+        ArgumentEnum.PACKAGE.value,
     ],
 )
 
@@ -257,11 +307,22 @@ LinkParser = Command(
 )
 
 
+# DAEMON
+DaemonParser = Command(
+    "daemon",
+    MESSAGE_BY_SUBCOMMAND["daemon"],
+    [
+        ArgumentEnum.SOCKET.value,
+    ],
+)
+
+
 # Add shared arguments for all commands that use them
 for arg in SHARED_ARGUMENTS:
     RunParser.arguments.append(arg)
     RerunParser.arguments.append(arg)
     RunProjectParser.arguments.append(arg)
+    WatchParser.arguments.append(arg)
     ReportParser.arguments.append(arg)
     DestroyParser.arguments.append(arg)
     CheckParser.arguments.append(arg)
@@ -274,6 +335,7 @@ for arg in SHARED_ARGUMENTS:
 RunParserModel = RunParser.create_model()
 RerunParserModel = RerunParser.create_model()
 RunProjectParserModel = RunProjectParser.create_model()
+WatchParserModel = WatchParser.create_model()
 ReportParserModel = ReportParser.create_model()
 DestroyParserModel = DestroyParser.create_model()
 CheckParserModel = CheckParser.create_model()
@@ -283,12 +345,14 @@ LinkParserModel = LinkParser.create_model()
 InspectParserModel = InspectParser.create_model()
 InitParserModel = InitParser.create_model()
 InitPifaceParserModel = InitPifaceParser.create_model()
+DaemonParserModel = DaemonParser.create_model()
 
 
 SUPPORTED_COMMANDS = [
     RunParser,
     RerunParser,
     RunProjectParser,
+    WatchParser,
     TableParser,
     ReportParser,
     DestroyParser,
@@ -298,6 +362,7 @@ SUPPORTED_COMMANDS = [
     InitPifaceParser,
     LinkParser,
     InspectParser,
+    DaemonParser,
 ]
 
 
@@ -320,6 +385,9 @@ class TopLevelParser(BaseSettings):
     runp: CliSubCommand[RunProjectParserModel] = Field(
         description=MESSAGE_BY_SUBCOMMAND["runp"]
     )
+    watch: CliSubCommand[WatchParserModel] = Field(
+        description=MESSAGE_BY_SUBCOMMAND["watch"]
+    )
     table: CliSubCommand[TableParserModel] = Field(
         description=MESSAGE_BY_SUBCOMMAND["table"]
     )
@@ -347,6 +415,9 @@ class TopLevelParser(BaseSettings):
     inspect: CliSubCommand[InspectParserModel] = Field(
         description=MESSAGE_BY_SUBCOMMAND["inspect"]
     )
+    daemon: CliSubCommand[DaemonParserModel] = Field(
+        description=MESSAGE_BY_SUBCOMMAND["daemon"]
+    )
 
     # Additional arguments for logging
     silent: bool | None = ArgumentEnum.SILENT.value.with_reduced_default()
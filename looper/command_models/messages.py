@@ -8,6 +8,7 @@ MESSAGE_BY_SUBCOMMAND = {
     "run": "Run or submit sample jobs.",
     "rerun": "Resubmit sample jobs with failed flags.",
     "runp": "Run or submit project jobs.",
+    "watch": "Keep submitting sample jobs as new samples and inputs appear.",
     "table": "Write summary stats table for project samples.",
     "report": "Create browsable HTML report of project results.",
     "destroy": "Remove output files of the project.",
@@ -17,4 +18,5 @@ MESSAGE_BY_SUBCOMMAND = {
     "init": "Initialize looper config file.",
     "init-piface": "Initialize generic pipeline interface.",
     "link": "Create directory of symlinks for reported results.",
+    "daemon": "Serve looper commands from a warm process over a local socket.",
 }
@@ -1,23 +1,25 @@
 """Pipeline job submission orchestration"""
 
+import hashlib
 import importlib
 import logging
 import os
+import re
 import shlex
 import signal
 import subprocess
 import sys
 import threading
 import time
-from json import loads
+from functools import cache
+from json import dumps, loads
 from math import ceil
 from subprocess import check_output
+from typing import TYPE_CHECKING
 
-import psutil
 import yaml
 from eido import get_input_files_size, read_schema
 from eido.const import INPUT_FILE_SIZE_KEY, MISSING_KEY
-from jinja2.exceptions import UndefinedError
 from peppy.const import CONFIG_KEY, SAMPLE_YAML_EXT
 from peppy.exceptions import RemoteYAMLError
 from pipestat import PipestatError
@@ -26,12 +28,18 @@ from yacman import YAMLConfigManager
 from yaml import dump
 
 from .const import (
+    DEFAULT_COMPUTE_RESOURCES_NAME,
+    DEPENDENCY_DELIMITER_KEY,
+    DEPENDENCY_TEMPLATE_KEY,
     EXTRA_PROJECT_CMD_TEMPLATE,
     EXTRA_SAMPLE_CMD_TEMPLATE,
+    JOB_ID_PATTERN_KEY,
     JOB_NAME_KEY,
     NOT_SUB_MSG,
     OUTDIR_KEY,
     OUTPUT_SCHEMA_KEY,
+    PRE_SUBMIT_BATCH_CMD_KEY,
+    PRE_SUBMIT_BATCH_PY_FUN_KEY,
     PRE_SUBMIT_CMD_KEY,
     PRE_SUBMIT_HOOK_KEY,
     PRE_SUBMIT_PY_FUN_KEY,
@@ -45,12 +53,19 @@ from .const import (
 )
 from .exceptions import JobSubmissionException
 from .processed_project import populate_sample_paths
+from .profiling import phase
 from .utils import (
+    acquire_claim,
     expand_nested_var_templates,
     fetch_sample_flags,
     jinja_render_template_strictly,
+    release_claim,
     render_inject_env_vars,
 )
+from .writer import background_writer
+
+if TYPE_CHECKING:
+    from .plan import ExecutionPlan
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -73,6 +88,9 @@ def _get_yaml_path(
         filename (str): A filename without folders. If not provided, a
             default name of sample_name.yaml will be used.
 
+    Without a template, the file goes to the submission folder, or to its
+    shard if the submission is sharded.
+
     Returns:
         str: Sample YAML file path.
     """
@@ -105,6 +123,8 @@ def _get_yaml_path(
             f"{SAMPLE_YAML_EXT[0]}"
         )
         default = os.path.join(namespaces["looper"][OUTDIR_KEY], "submission")
+        if namespaces["looper"].get("sharded_submission"):
+            default = os.path.join(default, submission_shard(os.path.splitext(f)[0]))
         final_path = os.path.join(default, f)
         if not os.path.exists(default):
             os.makedirs(default, exist_ok=True)
@@ -187,6 +207,10 @@ class SubmissionConductor(object):
         max_jobs: int | float | None = None,
         automatic: bool = True,
         collate: bool = False,
+        dependencies: list[str] | None = None,
+        claim_ttl: float | None = None,
+        sharded_submission: bool = False,
+        plan: "ExecutionPlan | None" = None,
     ) -> None:
         """Create a job submission manager.
 
@@ -225,6 +249,19 @@ class SubmissionConductor(object):
                 the pool reaches capacity.
             collate (bool): Whether a collate job is to be submitted (runs on
                 the project level, rather that on the sample level).
+            dependencies (list[str] | None): Scheduler job IDs that every job
+                submitted by this conductor should wait for. Rendered into the
+                submission command with the compute package's
+                'dependency_template'.
+            claim_ttl (float | None): If given, claim each sample before pooling
+                it, so that concurrent looper processes sharing the output
+                directory don't submit duplicate jobs. Claims older than this
+                many seconds are considered stale.
+            sharded_submission (bool): Whether to spread the submission
+                scripts, logs and claims over subfolders of the submission
+                folder, named by a hash prefix of the file name.
+            plan (ExecutionPlan | None): If given, record what would be
+                submitted in this plan rather than writing job scripts.
         """
         super(SubmissionConductor, self).__init__()
 
@@ -243,6 +280,12 @@ class SubmissionConductor(object):
             self.extra_pipe_args = extra_args_override
             self.override_extra = True
         self.ignore_flags = ignore_flags
+        self.dependencies = dependencies or []
+        self.claim_ttl = claim_ttl
+        self.sharded_submission = sharded_submission
+        self.plan = plan
+        # sample name -> input size and statuses, for the plan records
+        self._planned = {}
 
         self.dry_run = self.prj.dry_run
         self.delay = float(delay)
@@ -251,6 +294,9 @@ class SubmissionConductor(object):
         self._num_cmds_submitted = 0
         self._curr_size = 0
         self._failed_sample_names = []
+        self._job_ids = []
+        self._num_missing_job_ids = 0
+        self._pool_claims = []
         self._curr_skip_pool = []
         self.process_id = None  # this is used for currently submitted subprocess
 
@@ -294,6 +340,28 @@ class SubmissionConductor(object):
     def failed_samples(self) -> list[str]:
         return self._failed_sample_names
 
+    @property
+    def job_ids(self) -> list[str]:
+        """Return the scheduler job IDs of the jobs this conductor submitted.
+
+        IDs are only captured if the active compute package defines a
+        'job_id_pattern' to extract them from the submission command output.
+
+        Returns:
+            list[str]: Job IDs, in submission order.
+        """
+        return self._job_ids
+
+    @property
+    def num_missing_job_ids(self) -> int:
+        """Return the number of scheduler submissions whose job ID is unknown.
+
+        Returns:
+            int: Number of submissions (excluding direct, local execution)
+                for which no job ID could be captured.
+        """
+        return self._num_missing_job_ids
+
     @property
     def num_cmd_submissions(self) -> int:
         """Return the number of commands that this conductor has submitted.
@@ -330,6 +398,13 @@ class SubmissionConductor(object):
             status = psm.get_status()
             if not force and status is not None:
                 _LOGGER.info(f"> Skipping project. Determined status: {status}")
+                if self.plan is not None:
+                    self._emit_plan(
+                        None,
+                        "skip",
+                        status=[status],
+                        skip_reasons=[f"Determined status: {status}"],
+                    )
                 return False
         return True
 
@@ -415,6 +490,34 @@ class SubmissionConductor(object):
                     _LOGGER.warning(NOT_SUB_MSG.format(missing_reqs_msg))
                     use_this_sample and skip_reasons.append("Missing files")
 
+        if (
+            _use_sample(use_this_sample, skip_reasons)
+            and self.claim_ttl
+            and not self.dry_run
+        ):
+            claim = self._claim_path(sample)
+            if acquire_claim(claim, self.claim_ttl):
+                self._pool_claims.append(claim)
+            else:
+                _LOGGER.info(
+                    f"> Skipping sample. Already claimed for submission: {claim}"
+                )
+                use_this_sample = False
+
+        if self.plan is not None:
+            input_size = float(validation[INPUT_FILE_SIZE_KEY])
+            if _use_sample(use_this_sample, skip_reasons):
+                self._planned[sample.sample_name] = (input_size, sample_statuses)
+            else:
+                self._emit_plan(
+                    sample,
+                    "skip",
+                    input_size=input_size,
+                    status=sample_statuses,
+                    skip_reasons=skip_reasons or [msg.removeprefix("> ")],
+                )
+                return skip_reasons
+
         if _use_sample(use_this_sample, skip_reasons):
             self._pool.append(sample)
             self._curr_size += float(validation[INPUT_FILE_SIZE_KEY])
@@ -463,49 +566,99 @@ class SubmissionConductor(object):
                     for schema in schemas:
                         populate_sample_paths(s, read_schema(schema)[0])
 
-            script = self.write_script(self._pool, self._curr_size)
+            with phase("script.write"):
+                script = self.write_script(self._pool, self._curr_size)
             # Determine whether to actually do the submission.
             _LOGGER.info(
-                "Job script (n={0}; {1:.2f}Gb): {2}".format(
-                    len(self._pool), self._curr_size, script
+                "Job {0} (n={1}; {2:.2f}Gb): {3}".format(
+                    "planned" if self.plan is not None else "script",
+                    len(self._pool),
+                    self._curr_size,
+                    script or self._jobname(self._pool),
                 )
             )
             if self.dry_run:
                 _LOGGER.info("Dry run, not submitted")
             elif self._rendered_ok:
+                # the script, and the files its commands read, must be written
+                background_writer().wait(script)
                 sub_cmd = self.prj.dcc.compute["submission_command"]
 
                 # Detect shell metacharacters that require shell=True
                 shell_chars = set("|&;<>()$`\\\"' \t\n*?[#~")
                 needs_shell = any(c in sub_cmd for c in shell_chars) and sub_cmd != "."
 
+                job_id_pattern = None
+                if sub_cmd != ".":
+                    job_id_pattern = self.prj.dcc.compute.get(JOB_ID_PATTERN_KEY)
+                    if self.dependencies:
+                        dependency = _render_dependency(
+                            self.prj.dcc.compute, self.dependencies
+                        )
+                        if dependency:
+                            sub_cmd = f"{sub_cmd} {dependency}"
+                        else:
+                            _LOGGER.warning(
+                                f"Active compute package defines no "
+                                f"'{DEPENDENCY_TEMPLATE_KEY}'; submitting without "
+                                f"dependencies on jobs: {', '.join(self.dependencies)}"
+                            )
+                # Only capture output if there is a job ID to extract from it
+                popen_kwargs = (
+                    dict(stdout=subprocess.PIPE, text=True) if job_id_pattern else {}
+                )
+
                 # Capture submission command return value so that we can
                 # intercept and report basic submission failures; #167
-                if sub_cmd == ".":
-                    # Direct execution: run script through bash without a submission wrapper
-                    _LOGGER.debug("Direct execution via bash: %s", script)
-                    process = subprocess.Popen(["/bin/bash", script])
-                elif needs_shell:
-                    _LOGGER.debug(
-                        "Shell execution (detected shell syntax): %s %s",
-                        sub_cmd,
-                        script,
-                    )
-                    process = subprocess.Popen(
-                        f"{sub_cmd} {script}", shell=True, executable="/bin/bash"
-                    )
-                else:
-                    _LOGGER.debug("Direct execution: %s %s", sub_cmd, script)
-                    process = subprocess.Popen(shlex.split(sub_cmd) + [script])
-                self.process_id = process.pid
-                process.wait()
+                with phase("job.submit"):
+                    if sub_cmd == ".":
+                        # Direct execution: run script through bash without a submission wrapper
+                        _LOGGER.debug("Direct execution via bash: %s", script)
+                        process = subprocess.Popen(["/bin/bash", script])
+                    elif needs_shell:
+                        _LOGGER.debug(
+                            "Shell execution (detected shell syntax): %s %s",
+                            sub_cmd,
+                            script,
+                        )
+                        process = subprocess.Popen(
+                            f"{sub_cmd} {script}",
+                            shell=True,
+                            executable="/bin/bash",
+                            **popen_kwargs,
+                        )
+                    else:
+                        _LOGGER.debug("Direct execution: %s %s", sub_cmd, script)
+                        process = subprocess.Popen(
+                            shlex.split(sub_cmd) + [script], **popen_kwargs
+                        )
+                    self.process_id = process.pid
+                    output, _ = process.communicate()
+                if output:
+                    # Pass the scheduler's response through to the user
+                    print(output, end="")
                 if process.returncode != 0:
                     fails = (
                         "" if self.collate else [s.sample_name for s in self._samples]
                     )
                     self._failed_sample_names.extend(fails)
+                    # Let a later attempt pick these samples up again
+                    self._release_pool_claims()
                     self._reset_pool()
                     raise JobSubmissionException(sub_cmd, script)
+                if job_id_pattern:
+                    job_id = _parse_job_id(output, job_id_pattern)
+                    if job_id is None:
+                        _LOGGER.warning(
+                            f"Could not determine job ID from submission output "
+                            f"using pattern: {job_id_pattern}"
+                        )
+                        self._num_missing_job_ids += 1
+                    else:
+                        _LOGGER.debug(f"Captured job ID: {job_id}")
+                        self._job_ids.append(job_id)
+                elif sub_cmd != ".":
+                    self._num_missing_job_ids += 1
                 time.sleep(self.delay)
 
             # Update the job and command submission tallies.
@@ -513,6 +666,8 @@ class SubmissionConductor(object):
             if self._rendered_ok:
                 submitted = True
                 self._num_cmds_submitted += len(self._pool)
+            else:
+                self._release_pool_claims()
             self._reset_pool()
 
         else:
@@ -595,6 +750,7 @@ class SubmissionConductor(object):
 
     def _terminate_current_subprocess(self) -> None:
         """This terminates the current sub process associated with self.process_id"""
+        import psutil
 
         def pskill(proc_pid, sig=signal.SIGINT):
             parent_process = psutil.Process(proc_pid)
@@ -653,12 +809,28 @@ class SubmissionConductor(object):
         Returns:
             bool: True if process is still running; otherwise false.
         """
+        import psutil
+
         try:
             proc.wait(timeout=int(sleeptime))
         except psutil.TimeoutExpired:
             return True
         return False
 
+    def _claim_path(self, sample) -> str:
+        """Path to the file claiming the given sample for this pipeline."""
+        name = f"{self.pl_name}_{sample.sample_name}"
+        folder = expandpath(self._submission_folder(name))
+        if self.sharded_submission:
+            os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, name + ".claim")
+
+    def _submission_folder(self, name: str) -> str:
+        """Folder for the submission files of the given job or sample."""
+        if not self.sharded_submission:
+            return self.prj.submission_folder
+        return os.path.join(self.prj.submission_folder, submission_shard(name))
+
     def _jobname(self, pool: list) -> str:
         """Create the name for a job submission."""
         return "{}_{}".format(self.pl_iface.pipeline_name, self._sample_lump_name(pool))
@@ -691,8 +863,12 @@ class SubmissionConductor(object):
         settings[JOB_NAME_KEY] = self._jobname(pool)
         settings["total_input_size"] = size
         settings["log_file"] = (
-            os.path.join(self.prj.submission_folder, settings[JOB_NAME_KEY]) + ".log"
+            os.path.join(
+                self._submission_folder(settings[JOB_NAME_KEY]), settings[JOB_NAME_KEY]
+            )
+            + ".log"
         )
+        settings["sharded_submission"] = self.sharded_submission
         settings["piface_dir"] = os.path.dirname(self.pl_iface.pipe_iface_file)
         if hasattr(self.prj, "pipeline_config"):
             # Make sure it's a file (it could be provided as null.)
@@ -748,15 +924,18 @@ class SubmissionConductor(object):
             filtered_namespace = {k: v for k, v in full_namespace.items() if v}
             return YAMLConfigManager(filtered_namespace)
 
-    def write_script(self, pool: list, size: float) -> str:
+    def write_script(self, pool: list, size: float) -> str | None:
         """Create the script for job submission.
 
+        When making a plan, the commands are recorded in it instead.
+
         Args:
             pool (Iterable[peppy.Sample]): Collection of sample instances.
             size (float): Cumulative size of the given pool.
 
         Returns:
-            str: Path to the job submission script created.
+            str | None: Path to the job submission script created; None when
+                making a plan.
         """
         # looper settings determination
         if self.collate:
@@ -781,6 +960,8 @@ class SubmissionConductor(object):
                 else EXTRA_SAMPLE_CMD_TEMPLATE
             )
             templ += extras_template
+        batch_hooks = _has_batch_pre_submit(self.pl_iface)
+        pooled = []
         for sample in pool:
             # cascading compute settings determination:
             # divcfg < pipeline interface < config <  CLI
@@ -798,44 +979,59 @@ class SubmissionConductor(object):
                 # Pipestat isn't configured, simply place empty YAMLConfigManager object instead.
                 pipestat_namespace = YAMLConfigManager()
                 namespaces.update({"pipestat": pipestat_namespace})
-            res_pkg = self.pl_iface.choose_resource_package(
-                namespaces, size or 0
-            )  # config
+            with phase("script.resources"):
+                res_pkg = self.pl_iface.choose_resource_package(
+                    namespaces, size or 0
+                )  # config
             res_pkg.update(cli)
             self.prj.dcc.compute.update(res_pkg)  # divcfg
             namespaces["compute"].update(res_pkg)
             # Here we make a copy of this so that each iteration gets its own template values
             pl_iface = {}
             pl_iface.update(self.pl_iface)
-            pl_iface[VAR_TEMPL_KEY] = self.pl_iface.render_var_templates(
-                namespaces=namespaces
-            )
-            _LOGGER.debug(f"namespace pipelines: {pl_iface}")
+            with phase("script.var_templates"):
+                pl_iface[VAR_TEMPL_KEY] = self.pl_iface.render_var_templates(
+                    namespaces=namespaces
+                )
+                _LOGGER.debug(f"namespace pipelines: {pl_iface}")
 
-            namespaces["pipeline"]["var_templates"] = pl_iface[VAR_TEMPL_KEY] or {}
+                namespaces["pipeline"]["var_templates"] = pl_iface[VAR_TEMPL_KEY] or {}
 
-            namespaces["pipeline"]["var_templates"] = expand_nested_var_templates(
-                namespaces["pipeline"]["var_templates"], namespaces
-            )
+                namespaces["pipeline"]["var_templates"] = expand_nested_var_templates(
+                    namespaces["pipeline"]["var_templates"], namespaces
+                )
 
             # pre_submit hook namespace updates
-            namespaces = _exec_pre_submit(pl_iface, namespaces)
-            self._rendered_ok = False
-            try:
-                argstring = jinja_render_template_strictly(
-                    template=templ, namespaces=namespaces
+            with phase("script.pre_submit"):
+                namespaces = _exec_pre_submit(pl_iface, namespaces)
+            if batch_hooks:
+                # each sample gets its own copy of the namespaces a batch
+                # hook may update, and of the var_templates rendered into the
+                # pipeline namespace
+                pooled.append(
+                    (
+                        sample,
+                        dict(
+                            namespaces,
+                            pipeline=dict(namespaces["pipeline"]),
+                            compute=_copy_namespace(namespaces["compute"]),
+                            looper=_copy_namespace(namespaces["looper"]),
+                        ),
+                        res_pkg,
+                    )
                 )
-            except UndefinedError as jinja_exception:
-                _LOGGER.warning(NOT_SUB_MSG.format(str(jinja_exception)))
-            except KeyError as e:
-                exc = "pipeline interface is missing {} section".format(str(e))
-                _LOGGER.warning(NOT_SUB_MSG.format(exc))
             else:
-                commands.append("{} {}".format(argstring, self.extra_pipe_args))
-                self._rendered_ok = True
-                if sample not in self._curr_skip_pool:
-                    self._num_good_job_submissions += 1
-                    self._num_total_job_submissions += 1
+                problem = self._render_command(templ, sample, namespaces, commands)
+                if self.plan is not None:
+                    self._plan_command(sample, looper, res_pkg, commands, problem)
+
+        if batch_hooks:
+            with phase("script.pre_submit"):
+                _exec_batch_pre_submit(self.pl_iface, [ns for _, ns, _ in pooled])
+            for sample, namespaces, res_pkg in pooled:
+                problem = self._render_command(templ, sample, namespaces, commands)
+                if self.plan is not None:
+                    self._plan_command(sample, looper, res_pkg, commands, problem)
 
         # Render inject_env_vars and prepend export statements to command
         inject_env_vars = self.pl_iface.get("inject_env_vars", {})
@@ -863,16 +1059,119 @@ class SubmissionConductor(object):
         _LOGGER.debug("compute namespace:\n{}".format(self.prj.dcc.compute))
         _LOGGER.debug("looper namespace:\n{}".format(looper))
         _LOGGER.debug("pipestat namespace:\n{}".format(pipestat_namespace))
+        if self.plan is not None:
+            return None
         subm_base = os.path.join(
-            expandpath(self.prj.submission_folder), looper[JOB_NAME_KEY]
+            expandpath(self._submission_folder(looper[JOB_NAME_KEY])),
+            looper[JOB_NAME_KEY],
+        )
+        with phase("script.divvy_write"):
+            return self.prj.dcc.write_script(
+                output_path=subm_base + ".sub",
+                extra_vars=[{"looper": looper}],
+                background=True,
+            )
+
+    def _render_command(
+        self, templ: str, sample, namespaces: dict, commands: list[str]
+    ) -> str | None:
+        """Render the command of a sample and add it to the commands of the job.
+
+        Args:
+            templ (str): Command template.
+            sample (peppy.Sample | None): Sample to render the command for;
+                None for a project pipeline.
+            namespaces (dict[dict]): Namespaces to render the command with.
+            commands (list[str]): Rendered commands to add the command to.
+
+        Returns:
+            str | None: Why the command could not be rendered; None if it was.
+        """
+        from jinja2.exceptions import UndefinedError
+
+        self._rendered_ok = False
+        try:
+            with phase("script.render"):
+                argstring = jinja_render_template_strictly(
+                    template=templ, namespaces=namespaces
+                )
+        except UndefinedError as jinja_exception:
+            _LOGGER.warning(NOT_SUB_MSG.format(str(jinja_exception)))
+            return str(jinja_exception)
+        except KeyError as e:
+            exc = "pipeline interface is missing {} section".format(str(e))
+            _LOGGER.warning(NOT_SUB_MSG.format(exc))
+            return exc
+        else:
+            commands.append("{} {}".format(argstring, self.extra_pipe_args))
+            self._rendered_ok = True
+            if sample not in self._curr_skip_pool:
+                self._num_good_job_submissions += 1
+                self._num_total_job_submissions += 1
+        return None
+
+    def _plan_command(
+        self,
+        sample,
+        looper: YAMLConfigManager,
+        resources: dict,
+        commands: list[str],
+        problem: str | None,
+    ) -> None:
+        """Record the job of a sample in the plan.
+
+        Args:
+            sample (peppy.Sample | None): Sample of the command; None for a
+                project pipeline.
+            looper (yacman.YAMLConfigManager): Looper namespace of the job.
+            resources (dict): Resources selected for the command.
+            commands (list[str]): Rendered commands, the sample's last.
+            problem (str | None): Why the command could not be rendered.
+        """
+        name = sample.sample_name if sample else None
+        input_size, status = self._planned.pop(name, (looper["total_input_size"], []))
+        if problem is not None:
+            self._emit_plan(
+                sample,
+                "skip",
+                input_size=input_size,
+                status=status,
+                skip_reasons=[problem],
+            )
+            return
+        self._emit_plan(
+            sample,
+            "submit",
+            job_name=looper[JOB_NAME_KEY],
+            command=commands[-1],
+            compute_package=self.prj.selected_compute_package
+            or DEFAULT_COMPUTE_RESOURCES_NAME,
+            resources=dict(resources),
+            input_size=input_size,
+            status=status,
         )
-        return self.prj.dcc.write_script(
-            output_path=subm_base + ".sub", extra_vars=[{"looper": looper}]
+
+    def _emit_plan(self, sample, action: str, **fields) -> None:
+        """Write a record for a sample of this pipeline to the plan."""
+        self.plan.emit(
+            {
+                "pipeline": self.pl_name,
+                "sample": sample.sample_name if sample else None,
+                "action": action,
+                **fields,
+            }
         )
 
+    def _release_pool_claims(self) -> None:
+        """Release the claims on the pooled samples, e.g. if they weren't submitted"""
+        for claim in self._pool_claims:
+            release_claim(claim)
+        self._pool_claims = []
+
     def _reset_pool(self) -> None:
         """Reset the state of the pool of samples"""
         self._pool = []
+        self._pool_claims = []
         self._curr_size = 0
 
     def _reset_curr_skips(self) -> None:
@@ -880,81 +1179,231 @@ class SubmissionConductor(object):
         self._curr_skip_size = 0
 
 
+def submission_shard(name: str) -> str:
+    """Name of the subfolder of a sharded submission folder holding a file.
+
+    Args:
+        name (str): Name of the job or claim, without extension.
+
+    Returns:
+        str: Two hexadecimal digits of a hash of the name, so that the
+            files are spread evenly over 256 subfolders.
+    """
+    return hashlib.md5(name.encode()).hexdigest()[:2]
+
+
 def _use_sample(flag: bool, skips: list) -> bool:
     return flag and not skips
 
 
-def _exec_pre_submit(piface, namespaces: dict) -> dict:
-    """Execute pre submission hooks defined in the pipeline interface.
+def _parse_job_id(output: str | None, pattern: str) -> str | None:
+    """Extract a scheduler job ID from the output of a submission command.
 
     Args:
-        piface (PipelineInterface): Piface, a source of pre_submit hooks to execute.
-        namespaces (dict[dict]): Namespaces mapping.
+        output (str | None): Text printed by the submission command.
+        pattern (str): Regular expression matching the job ID. If it defines
+            a group, the first group is used, otherwise the whole match.
 
     Returns:
-        dict[dict]: Updated namespaces mapping.
+        str | None: Job ID, or None if the pattern does not match.
     """
+    match = re.search(pattern, output or "")
+    if match is None:
+        return None
+    return match.group(1) if match.groups() else match.group(0)
 
-    def _update_namespaces(x, y, cmd=False):
-        """Update namespaces mapping with new values.
 
-        Update namespaces mapping with a dictionary of the same structure,
-        that includes just the values that need to be updated.
+def _render_dependency(compute, job_ids: list[str]) -> str | None:
+    """Render the submission command option that makes a job wait for others.
 
-        Args:
-            x (dict[dict]): Namespaces mapping.
-            y (dict[dict]): Mapping to update namespaces with.
-            cmd (bool): Whether the mapping to update with comes from the
-                command template, used for messaging.
-        """
-        if not y:
-            return
-        if not isinstance(y, dict):
-            if cmd:
-                raise TypeError(
-                    f"Object returned by {PRE_SUBMIT_HOOK_KEY}."
-                    f"{PRE_SUBMIT_CMD_KEY} must return a dictionary when "
-                    f"processed with json.loads(), not {y.__class__.__name__}"
-                )
+    Args:
+        compute (Mapping): Active compute package settings.
+        job_ids (list[str]): IDs of the jobs to depend on.
+
+    Returns:
+        str | None: Rendered option, e.g. '--dependency=afterok:1:2', or None
+            if the compute package defines no 'dependency_template' or there
+            are no jobs to depend on.
+    """
+    template = compute.get(DEPENDENCY_TEMPLATE_KEY)
+    if not template or not job_ids:
+        return None
+    delimiter = compute.get(DEPENDENCY_DELIMITER_KEY) or ":"
+    return template.replace("{JOB_IDS}", delimiter.join(job_ids))
+
+
+def _copy_namespace(namespace):
+    """Copy a namespace, so that updating the copy leaves the original alone.
+
+    Copying a YAMLConfigManager shares its data, so a new one is made.
+    """
+    if isinstance(namespace, YAMLConfigManager):
+        return YAMLConfigManager.from_obj(dict(namespace))
+    return dict(namespace)
+
+
+def _update_namespaces(x: dict, y: dict | None, cmd: bool = False) -> None:
+    """Update namespaces mapping with new values.
+
+    Update namespaces mapping with a dictionary of the same structure,
+    that includes just the values that need to be updated.
+
+    Args:
+        x (dict[dict]): Namespaces mapping.
+        y (dict[dict]): Mapping to update namespaces with.
+        cmd (bool): Whether the mapping to update with comes from the
+            command template, used for messaging.
+    """
+    if not y:
+        return
+    if not isinstance(y, dict):
+        if cmd:
             raise TypeError(
                 f"Object returned by {PRE_SUBMIT_HOOK_KEY}."
-                f"{PRE_SUBMIT_PY_FUN_KEY} must return a dictionary,"
-                f" not {y.__class__.__name__}"
+                f"{PRE_SUBMIT_CMD_KEY} must return a dictionary when "
+                f"processed with json.loads(), not {y.__class__.__name__}"
             )
-        _LOGGER.debug("Updating namespaces with:\n{}".format(y))
-        for namespace, mapping in y.items():
-            for key, val in mapping.items():
-                x[namespace][key] = val
+        raise TypeError(
+            f"Object returned by {PRE_SUBMIT_HOOK_KEY}."
+            f"{PRE_SUBMIT_PY_FUN_KEY} must return a dictionary,"
+            f" not {y.__class__.__name__}"
+        )
+    _LOGGER.debug("Updating namespaces with:\n{}".format(y))
+    for namespace, mapping in y.items():
+        for key, val in mapping.items():
+            x[namespace][key] = val
+
+
+@cache
+def _load_pre_submit_function(py_fun: str):
+    """Import a pre-submit function, once per run.
+
+    Args:
+        py_fun (str): Function specified as <package>.<function>.
+
+    Returns:
+        Callable: The function.
+    """
+    pkgstr, funcstr = os.path.splitext(py_fun)
+    pkg = importlib.import_module(pkgstr)
+    return getattr(pkg, funcstr[1:])
+
+
+def _run_pre_submit_command(
+    cmd_template: str, namespaces: dict, stdin: str | None = None
+) -> str:
+    """Render a pre-submit command template and run it.
+
+    Args:
+        cmd_template (str): Command template to render.
+        namespaces (dict[dict]): Namespaces to render the template with.
+        stdin (str | None): Text to pass to the command on its stdin.
 
+    Returns:
+        str: The output of the command.
+    """
+    _LOGGER.debug("Rendering pre-submit command template: {}".format(cmd_template))
+    cmd = None
+    try:
+        cmd = jinja_render_template_strictly(
+            template=cmd_template, namespaces=namespaces
+        )
+        _LOGGER.info("Executing pre-submit command: {}".format(cmd))
+        return check_output(cmd, shell=True, input=stdin, text=True)
+    except Exception as e:
+        if hasattr(e, "output"):
+            print(e.output)
+        _LOGGER.error("Could not retrieve JSON via command: '{}'".format(cmd))
+        raise
+
+
+def _has_batch_pre_submit(piface) -> bool:
+    """Check whether the pipeline interface defines batch pre-submit hooks."""
+    pre_submit = piface.get(PRE_SUBMIT_HOOK_KEY) or {}
+    return bool(
+        pre_submit.get(PRE_SUBMIT_BATCH_PY_FUN_KEY)
+        or pre_submit.get(PRE_SUBMIT_BATCH_CMD_KEY)
+    )
+
+
+def _exec_pre_submit(piface, namespaces: dict) -> dict:
+    """Execute pre submission hooks defined in the pipeline interface.
+
+    Args:
+        piface (PipelineInterface): Piface, a source of pre_submit hooks to execute.
+        namespaces (dict[dict]): Namespaces mapping.
+
+    Returns:
+        dict[dict]: Updated namespaces mapping.
+    """
     if PRE_SUBMIT_HOOK_KEY in piface:
         pre_submit = piface[PRE_SUBMIT_HOOK_KEY]
         if PRE_SUBMIT_PY_FUN_KEY in pre_submit:
             for py_fun in pre_submit[PRE_SUBMIT_PY_FUN_KEY]:
-                pkgstr, funcstr = os.path.splitext(py_fun)
-                pkg = importlib.import_module(pkgstr)
-                func = getattr(pkg, funcstr[1:])
-                _LOGGER.info(
-                    "Calling pre-submit function: {}.{}".format(pkgstr, func.__name__)
-                )
+                func = _load_pre_submit_function(py_fun)
+                _LOGGER.info("Calling pre-submit function: {}".format(py_fun))
                 _update_namespaces(namespaces, func(namespaces))
         if PRE_SUBMIT_CMD_KEY in pre_submit:
+            # the commands may read the files the plugins queued for writing
+            background_writer().flush()
             for cmd_template in pre_submit[PRE_SUBMIT_CMD_KEY]:
-                _LOGGER.debug(
-                    "Rendering pre-submit command template: {}".format(cmd_template)
-                )
-                try:
-                    cmd = jinja_render_template_strictly(
-                        template=cmd_template, namespaces=namespaces
-                    )
-                    _LOGGER.info("Executing pre-submit command: {}".format(cmd))
-                    json = loads(check_output(cmd, shell=True))
-                except Exception as e:
-                    if hasattr(e, "output"):
-                        print(e.output)
-                    _LOGGER.error(
-                        "Could not retrieve JSON via command: '{}'".format(cmd)
-                    )
-                    raise
-                else:
-                    _update_namespaces(namespaces, json, cmd=True)
+                json = loads(_run_pre_submit_command(cmd_template, namespaces))
+                _update_namespaces(namespaces, json, cmd=True)
     return namespaces
+
+
+def _exec_batch_pre_submit(piface, pooled: list[dict]) -> None:
+    """Execute the batch pre submission hooks on all samples of a job at once.
+
+    A batch Python function is called with the list of the namespaces of the
+    pooled samples and returns a list with an update for each of them. A
+    batch command template is rendered with the namespaces of the first
+    sample and run once; it gets a JSON object with the attributes of each
+    sample on a line of its stdin and prints an update for each sample on a
+    line of its stdout, in the same order.
+
+    Args:
+        piface (PipelineInterface): Piface, a source of pre_submit hooks to execute.
+        pooled (list[dict[dict]]): Namespaces mapping of each pooled sample,
+            updated in place.
+    """
+    pre_submit = piface[PRE_SUBMIT_HOOK_KEY]
+    for py_fun in pre_submit.get(PRE_SUBMIT_BATCH_PY_FUN_KEY) or []:
+        func = _load_pre_submit_function(py_fun)
+        _LOGGER.info(
+            "Calling batch pre-submit function on {} samples: {}".format(
+                len(pooled), py_fun
+            )
+        )
+        updates = func(pooled)
+        _check_batch_updates(updates, pooled, py_fun)
+        for namespaces, update in zip(pooled, updates):
+            _update_namespaces(namespaces, update)
+    cmd_templates = pre_submit.get(PRE_SUBMIT_BATCH_CMD_KEY) or []
+    if cmd_templates:
+        # the commands may read the files the plugins queued for writing
+        background_writer().flush()
+    for cmd_template in cmd_templates:
+        stdin = "".join(
+            dumps(ns["sample"].to_dict() if ns.get("sample") else {}, default=str)
+            + "\n"
+            for ns in pooled
+        )
+        output = _run_pre_submit_command(cmd_template, pooled[0], stdin=stdin)
+        updates = [loads(line) for line in output.splitlines() if line.strip()]
+        _check_batch_updates(updates, pooled, cmd_template)
+        for namespaces, update in zip(pooled, updates):
+            _update_namespaces(namespaces, update, cmd=True)
+
+
+def _check_batch_updates(updates, pooled: list[dict], hook: str) -> None:
+    if not isinstance(updates, list) or len(updates) != len(pooled):
+        raise TypeError(
+            f"Batch pre-submit hook '{hook}' must return one update per "
+            f"sample: expected {len(pooled)}, got "
+            + (
+                str(len(updates))
+                if isinstance(updates, list)
+                else updates.__class__.__name__
+            )
+        )
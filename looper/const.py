@@ -57,10 +57,17 @@ __all__ = [
     "PRE_SUBMIT_HOOK_KEY",
     "PRE_SUBMIT_PY_FUN_KEY",
     "PRE_SUBMIT_CMD_KEY",
+    "PRE_SUBMIT_BATCH_PY_FUN_KEY",
+    "PRE_SUBMIT_BATCH_CMD_KEY",
+    "JOB_ID_PATTERN_KEY",
+    "DEPENDENCY_TEMPLATE_KEY",
+    "DEPENDENCY_DELIMITER_KEY",
     "SUBMISSION_YAML_PATH_KEY",
     "SAMPLE_YAML_PRJ_PATH_KEY",
     "OBJECT_TYPES",
+    "TABLE_FORMATS",
     "SAMPLE_CWL_YAML_PATH_KEY",
+    "SAMPLE_JSONL_PATH_KEY",
     "PIPESTAT_KEY",
     "NAMESPACE_ATTR_KEY",
     "DEFAULT_PIPESTAT_CONFIG_ATTR",
@@ -146,6 +153,11 @@ DEFAULT_CONFIG_SCHEMA = os.path.join(
 PRE_SUBMIT_HOOK_KEY = "pre_submit"
 PRE_SUBMIT_PY_FUN_KEY = "python_functions"
 PRE_SUBMIT_CMD_KEY = "command_templates"
+PRE_SUBMIT_BATCH_PY_FUN_KEY = "batch_python_functions"
+PRE_SUBMIT_BATCH_CMD_KEY = "batch_command_templates"
+JOB_ID_PATTERN_KEY = "job_id_pattern"
+DEPENDENCY_TEMPLATE_KEY = "dependency_template"
+DEPENDENCY_DELIMITER_KEY = "dependency_delimiter"
 
 LOGGING_LEVEL = "INFO"
 CFG_ENV_VARS = ["LOOPER"]
@@ -172,10 +184,13 @@ DOTFILE_CFG_PTH_KEY = "config_file_path"
 INPUT_SCHEMA_KEY = "input_schema"
 OUTPUT_SCHEMA_KEY = "output_schema"
 OBJECT_TYPES = ["object", "file", "image", "array"]
+# formats `looper table --format` exports results in
+TABLE_FORMATS = ["tsv", "parquet", "arrow"]
 SAMPLE_YAML_PATH_KEY = "sample_yaml_path"
 SAMPLE_YAML_PRJ_PATH_KEY = "sample_yaml_prj_path"
 SUBMISSION_YAML_PATH_KEY = "submission_yaml_path"
 SAMPLE_CWL_YAML_PATH_KEY = "sample_cwl_yaml_path"
+SAMPLE_JSONL_PATH_KEY = "sample_jsonl_path"
 SAMPLE_TOGGLE_ATTR = "toggle"
 OUTKEY = "outputs"
 JOB_NAME_KEY = "job_name"
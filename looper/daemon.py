@@ -0,0 +1,470 @@
+"""Long-lived looper process serving CLI invocations over a Unix socket.
+
+`looper daemon` pays the import and project loading cost once and keeps
+loaded projects (with their pipeline interfaces and pipestat managers) in
+memory. When `LOOPER_DAEMON_SOCKET` points at a running daemon, the `looper`
+entry point forwards supported commands to it and streams the output back.
+
+The protocol is one JSON object per line. The client sends a single request
+(`argv`, `cwd`, `env`); the daemon answers with any number of `stdout` or
+`stderr` messages followed by a final `exit` message, or with a `fallback`
+message telling the client to run the command itself.
+
+Requests are served one at a time, so the daemon doesn't run pipelines:
+`run`, `rerun` and `runp` fall back to the client when the active compute
+package executes jobs locally instead of submitting them to a scheduler.
+Both ends check that the other one belongs to the same user.
+
+Only the standard library is imported at module level so that the client
+side stays cheap.
+"""
+
+import codecs
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import tempfile
+import threading
+import traceback
+from contextlib import contextmanager
+
+__all__ = [
+    "DAEMON_SOCKET_VARNAME",
+    "FORWARDED_COMMANDS",
+    "LOCAL_SUBMISSION_COMMANDS",
+    "ProjectCache",
+    "RunLocally",
+    "default_socket_path",
+    "forward",
+    "serve",
+]
+
+DAEMON_SOCKET_VARNAME = "LOOPER_DAEMON_SOCKET"
+
+# Commands that don't need the terminal (no prompts) and finish on their own
+FORWARDED_COMMANDS = {
+    "run",
+    "rerun",
+    "runp",
+    "check",
+    "table",
+    "report",
+    "link",
+    "inspect",
+}
+
+# Submission commands that run the job in the foreground, on this machine
+LOCAL_SUBMISSION_COMMANDS = {".", "sh", "bash"}
+
+# Top-level options that take a value, which precede the subcommand
+_VALUE_OPTIONS = {"--verbosity"}
+
+
+class RunLocally(Exception):
+    """Raised in the daemon for a command that the client should run itself."""
+
+
+def default_socket_path() -> str:
+    """Get the socket path used when none is given explicitly.
+
+    Returns:
+        str: `$LOOPER_DAEMON_SOCKET` if set, otherwise `looper.sock` in
+            `$XDG_RUNTIME_DIR`, otherwise a socket in a per-user directory
+            in the temporary directory.
+    """
+    path = os.environ.get(DAEMON_SOCKET_VARNAME)
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "looper.sock")
+    return os.path.join(tempfile.gettempdir(), f"looper-{os.getuid()}", "daemon.sock")
+
+
+def _private_dir_problem(path: str) -> str | None:
+    """Check that only the current user can create files in a directory.
+
+    Returns:
+        str | None: What is wrong with the directory, or None if it's private.
+    """
+    st = os.stat(path)
+    if st.st_uid != os.getuid():
+        return f"'{path}' belongs to another user"
+    if st.st_mode & 0o022:
+        return f"'{path}' is writable by other users"
+    return None
+
+
+def _peer_uid(sock: socket.socket) -> int | None:
+    """Get the user ID of the process at the other end of a Unix socket.
+
+    Returns:
+        int | None: The user ID, or None if the platform doesn't tell.
+    """
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = sock.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+    )
+    return struct.unpack("3i", creds)[1]
+
+
+def _command_name(argv: list[str]) -> str | None:
+    """Get the subcommand from raw CLI arguments, i.e. the first positional."""
+    args = iter(argv)
+    for arg in args:
+        if arg in _VALUE_OPTIONS:
+            next(args, None)
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+def forward(argv: list[str], socket_path: str) -> int | None:
+    """Run a looper invocation in the daemon listening at the given socket.
+
+    Args:
+        argv (list[str]): CLI arguments, without the program name.
+        socket_path (str): Path to the daemon's socket.
+
+    Returns:
+        int | None: Exit code of the invocation, or None if the command is not
+            forwarded, no daemon of the current user is listening or the
+            daemon declines the command, in which case the caller should run
+            it in-process.
+    """
+    if _command_name(argv) not in FORWARDED_COMMANDS:
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        owner = _peer_uid(sock)
+        if owner is None:
+            owner = os.stat(socket_path).st_uid
+    except OSError:
+        sock.close()
+        return None
+    if owner != os.getuid():
+        print(
+            f"Not forwarding to {socket_path}: the daemon belongs to another user",
+            file=sys.stderr,
+        )
+        sock.close()
+        return None
+    request = {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}
+    with sock, sock.makefile("rwb") as stream:
+        stream.write(json.dumps(request).encode() + b"\n")
+        stream.flush()
+        for line in stream:
+            message = json.loads(line)
+            if "exit" in message:
+                return message["exit"]
+            if message.get("fallback"):
+                return None
+            out = sys.stderr if "stderr" in message else sys.stdout
+            out.write(message.get("stdout", message.get("stderr", "")))
+            out.flush()
+    print("Lost connection to looper daemon", file=sys.stderr)
+    return 1
+
+
+class ProjectCache:
+    """Loaded projects, reused for as long as none of their source files change."""
+
+    def __init__(self):
+        self._entries = {}
+
+    @staticmethod
+    def _stamp(paths) -> tuple:
+        stamp = []
+        for path in paths:
+            try:
+                stamp.append((path, os.path.getmtime(path)))
+            except OSError:
+                stamp.append((path, None))
+        return tuple(stamp)
+
+    def get(self, key: str):
+        """Get the project stored under the key, if its sources are unchanged.
+
+        Args:
+            key (str): Cache key, see `put`.
+
+        Returns:
+            looper.Project | None: The cached project, or None.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        prj, stamp = entry
+        if self._stamp([path for path, _ in stamp]) != stamp:
+            del self._entries[key]
+            return None
+        return prj
+
+    def put(self, key: str, prj, sources) -> None:
+        """Store a project, along with the files it was loaded from.
+
+        Args:
+            key (str): Cache key that captures everything the project was
+                constructed with.
+            prj (looper.Project): Project to store.
+            sources (Iterable[str]): Paths of the files the project was
+                loaded from; a change to any of them invalidates the entry.
+        """
+        self._entries[key] = (prj, self._stamp(sources))
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _StreamSwitch(io.TextIOBase):
+    """Stand-in for sys.stdout/sys.stderr that writes to the current client.
+
+    Log handlers keep a reference to the stream they were created with, so
+    `run_looper` creates them on sys.stderr, i.e. on this switch.
+    """
+
+    def __init__(self, default):
+        self._default = default
+        self.target = None
+
+    @property
+    def _stream(self):
+        return self.target or self._default
+
+    @property
+    def encoding(self):
+        return getattr(self._default, "encoding", "utf-8")
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        return self._stream.write(s)
+
+    def flush(self):
+        self._stream.flush()
+
+    def isatty(self):
+        return self.target is None and self._default.isatty()
+
+    def fileno(self):
+        # Subprocesses inherit the daemon's own descriptors
+        return self._default.fileno()
+
+
+class _Channel:
+    """Connection to a client, shared by the threads that send it output."""
+
+    def __init__(self, wfile):
+        self._wfile = wfile
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def send(self, **message) -> None:
+        data = json.dumps(message).encode() + b"\n"
+        with self._lock:
+            if not self.closed:
+                self._wfile.write(data)
+                self._wfile.flush()
+
+
+class _ClientStream(io.TextIOBase):
+    """Writable text stream that sends everything to a client as messages."""
+
+    def __init__(self, channel: _Channel, name: str):
+        self._channel = channel
+        self._name = name
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        if s:
+            self._channel.send(**{self._name: s})
+        return len(s)
+
+
+def _pump(fd: int, channel: _Channel, name: str) -> None:
+    """Send everything written to a pipe to a client, until the pipe closes."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with os.fdopen(fd, "rb") as pipe:
+        for chunk in iter(lambda: pipe.read1(65536), b""):
+            text = decoder.decode(chunk)
+            if text:
+                try:
+                    channel.send(**{name: text})
+                except OSError:
+                    pass  # client went away; keep draining the pipe
+
+
+def _flush_std_streams() -> None:
+    for stream in (sys.__stdout__, sys.__stderr__):
+        if stream is not None:
+            stream.flush()
+
+
+@contextmanager
+def _redirect_fds(channel: _Channel):
+    """Send what subprocesses write to the daemon's stdout/stderr to a client.
+
+    Submission commands inherit the daemon's file descriptors 1 and 2; for
+    the duration of a request those are pipes read by threads that forward
+    the output to the client.
+    """
+    _flush_std_streams()
+    saved, pumps = [], []
+    for fd, name in ((1, "stdout"), (2, "stderr")):
+        read_end, write_end = os.pipe()
+        saved.append((fd, os.dup(fd)))
+        os.dup2(write_end, fd)
+        os.close(write_end)
+        pump = threading.Thread(
+            target=_pump, args=(read_end, channel, name), daemon=True
+        )
+        pump.start()
+        pumps.append(pump)
+    try:
+        yield
+    finally:
+        _flush_std_streams()
+        for fd, orig in saved:
+            os.dup2(orig, fd)
+            os.close(orig)
+        # Jobs started in the background may hold the pipes open for longer
+        for pump in pumps:
+            pump.join(timeout=1)
+
+
+@contextmanager
+def _client_context(cwd: str, env: dict):
+    """Temporarily adopt the working directory and environment of a client."""
+    orig_cwd = os.getcwd()
+    orig_env = dict(os.environ)
+    os.environ.clear()
+    os.environ.update(env)
+    try:
+        os.chdir(cwd)
+        yield
+    finally:
+        os.chdir(orig_cwd)
+        os.environ.clear()
+        os.environ.update(orig_env)
+
+
+def _invoke(argv: list[str], project_cache: ProjectCache) -> int | None:
+    """Run one looper invocation.
+
+    Returns:
+        int | None: Exit code of the invocation, or None if the client
+            should run it itself.
+    """
+    from .cli_pydantic import flatten_args, run_looper
+    from .command_models.commands import TopLevelParser
+
+    # submission conductors install their own Ctrl+C handler; don't keep it
+    sigint_handler = signal.getsignal(signal.SIGINT)
+    try:
+        args = flatten_args(TopLevelParser(_cli_parse_args=argv))
+        run_looper(args, project_cache=project_cache)
+    except RunLocally:
+        return None
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    finally:
+        signal.signal(signal.SIGINT, sigint_handler)
+    return 0
+
+
+def serve(socket_path: str) -> int:
+    """Serve looper invocations on a Unix socket until interrupted.
+
+    Requests are handled one at a time, in the daemon's main thread. The
+    socket's directory is created if needed and must not be writable by
+    other users; connections from other users are refused.
+
+    Args:
+        socket_path (str): Path of the socket to listen on.
+
+    Returns:
+        int: Exit code for the daemon process.
+    """
+    socket_dir = os.path.dirname(os.path.abspath(socket_path))
+    os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+    problem = _private_dir_problem(socket_dir)
+    if problem:
+        print(f"Not listening on {socket_path}: {problem}", file=sys.stderr)
+        return 1
+    if os.path.exists(socket_path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            os.remove(socket_path)  # left behind by a daemon that died
+        else:
+            print(f"A looper daemon is already listening on {socket_path}")
+            return 1
+        finally:
+            probe.close()
+
+    stdout, stderr = _StreamSwitch(sys.stdout), _StreamSwitch(sys.stderr)
+    sys.stdout, sys.stderr = stdout, stderr
+    project_cache = ProjectCache()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                return  # connection probe
+            peer = _peer_uid(self.request)
+            if peer is not None and peer != os.getuid():
+                return
+            request = json.loads(line)
+            channel = _Channel(self.wfile)
+            stdout.target = _ClientStream(channel, "stdout")
+            stderr.target = _ClientStream(channel, "stderr")
+            try:
+                with (
+                    _redirect_fds(channel),
+                    _client_context(request["cwd"], request["env"]),
+                ):
+                    code = _invoke(request["argv"], project_cache)
+                if code is None:
+                    channel.send(fallback=True)
+                else:
+                    channel.send(exit=code)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client went away
+            finally:
+                channel.closed = True
+                stdout.target = stderr.target = None
+
+    umask = os.umask(0o077)  # no window in which others may connect
+    try:
+        server = socketserver.UnixStreamServer(socket_path, Handler)
+    finally:
+        os.umask(umask)
+    print(f"Looper daemon listening on {socket_path}")
+    print(f"Forward commands to it with: export {DAEMON_SOCKET_VARNAME}={socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        sys.stdout, sys.stderr = stdout._default, stderr._default
+    return 0
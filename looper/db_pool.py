@@ -0,0 +1,117 @@
+"""Database engines shared by the pipestat managers of a looper process.
+
+Pipestat gives each database backend an engine, and so a connection pool,
+of its own. With many pipelines reporting to the same database, looper
+hands the backends one pooled engine per database URL instead, so that the
+status checks and updates of all pipelines reuse the same connections.
+
+The pool is configured in the `database` section of the pipestat
+configuration, next to the connection settings, e.g.::
+
+    pipestat:
+      database:
+        dialect: postgresql
+        ...
+        pool_size: 10
+        pool_recycle: 900
+"""
+
+import logging
+import threading
+
+__all__ = ["POOL_OPTIONS", "dispose_engines", "share_engine", "shared_engine"]
+
+_LOGGER = logging.getLogger(__name__)
+
+# Options of the `database` section passed on to the pool, with their types:
+# connections kept open, extra connections allowed under load, seconds to
+# wait for a connection, seconds after which an idle connection is replaced,
+# and whether to test connections before use
+POOL_OPTIONS = {
+    "pool_size": int,
+    "max_overflow": int,
+    "pool_timeout": float,
+    "pool_recycle": int,
+    "pool_pre_ping": bool,
+}
+
+# database URL -> engine
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def shared_engine(db_url: str, pool_options: dict | None = None, echo: bool = False):
+    """Get the engine of a database, created on first use.
+
+    Args:
+        db_url (str): URL of the database.
+        pool_options (dict | None): Options of the engine's pool, see
+            POOL_OPTIONS; only used when the engine is created.
+        echo (bool): Whether to log the statements run.
+
+    Returns:
+        sqlalchemy.engine.Engine: Engine of the database.
+    """
+    with _engines_lock:
+        engine = _engines.get(db_url)
+        if engine is None:
+            from sqlalchemy import create_engine
+
+            options = pool_options or {}
+            engine = create_engine(db_url, echo=echo, **options)
+            _LOGGER.debug(
+                f"Created engine of {engine.url!r} with pool options: {options}"
+            )
+            _engines[db_url] = engine
+        return engine
+
+
+def share_engine(psm) -> bool:
+    """Make a pipestat manager use the shared engine of its database.
+
+    The engine pipestat made for the backend is disposed of, closing its
+    connections.
+
+    Args:
+        psm (pipestat.PipestatManager): Manager to share the engine with.
+
+    Returns:
+        bool: Whether the manager is backed by a database.
+    """
+    backend = psm.backend
+    db_url = getattr(backend, "db_url", None)
+    if not db_url:
+        return False
+    engine = shared_engine(
+        db_url,
+        pool_options=_pool_options(psm),
+        echo=getattr(backend, "show_db_logs", False),
+    )
+    own = vars(backend).get("db_engine_key")
+    if own is not engine:
+        backend.db_engine_key = engine
+        if own is not None:
+            own.dispose()
+    return True
+
+
+def dispose_engines() -> None:
+    """Close the connections of all shared engines and forget them."""
+    with _engines_lock:
+        engines = list(_engines.values())
+        _engines.clear()
+    for engine in engines:
+        engine.dispose()
+
+
+def _pool_options(psm) -> dict:
+    """Pool options in the `database` section of a manager's configuration."""
+    dbconf = psm.cfg["_config"].get("database") or {}
+    options = {}
+    for key, value in dbconf.items():
+        if key in POOL_OPTIONS:
+            try:
+                options[key] = POOL_OPTIONS[key](value)
+            except (TypeError, ValueError):
+                _LOGGER.warning(f"Ignoring invalid database option {key}: {value!r}")
+    return options
@@ -275,7 +275,12 @@ class ComputingConfiguration(YAMLConfigManager):
             _LOGGER.info(submission_command)
             os.system(submission_command)
 
-    def write_script(self, output_path: str, extra_vars: list | None = None) -> str:
+    def write_script(
+        self,
+        output_path: str,
+        extra_vars: list | None = None,
+        background: bool = False,
+    ) -> str:
         """Given currently active settings, populate the active template to write a submission script.
 
         Additionally use the current adapters to adjust the select of the
@@ -286,6 +291,8 @@ class ComputingConfiguration(YAMLConfigManager):
             extra_vars (Iterable[Mapping]): A list of Dict objects with
                 key-value pairs with which to populate template fields. These will
                 override any values in the currently active compute package.
+            background (bool): Whether to queue the write to the background
+                writer rather than wait for it; see `looper.writer`.
 
         Returns:
             str: Path to the submission script file.
@@ -348,7 +355,9 @@ class ComputingConfiguration(YAMLConfigManager):
         if output_path:
             _LOGGER.info("Writing script to {}".format(os.path.abspath(output_path)))
 
-        return write_submit_script(output_path, self.template(), variables)
+        return write_submit_script(
+            output_path, self.template(), variables, background=background
+        )
 
     def _handle_missing_env_attrs(self, config_file: str, when_missing) -> None:
         """Default environment settings aren't required; warn, though."""
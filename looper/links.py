@@ -0,0 +1,160 @@
+"""Incremental linking of reported results, for `looper link`.
+
+Like `PipestatManager.link`, results are linked as
+`<link dir>/<result>/<record>_<key>_<file name>`. A manifest in the link
+directory records the links made and the results file they were made from,
+so that later runs skip pipelines whose results file didn't change and
+create or remove only the links that differ.
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from ubiquerg import expandpath
+
+from .utils import write_if_changed
+
+__all__ = ["LINK_MANIFEST", "link_results"]
+
+_LOGGER = logging.getLogger(__name__)
+
+LINK_MANIFEST = ".looper_links.json"
+# Linking is bound by file system metadata operations
+LINK_THREADS = 16
+
+
+def link_results(psms: list, link_dir: str) -> str:
+    """Link the file and image results of pipelines into a directory.
+
+    Args:
+        psms (list[pipestat.PipestatManager]): Managers of the results of
+            the pipelines, one per pipeline.
+        link_dir (str): Directory to make the links in.
+
+    Returns:
+        str: Absolute path to the link directory.
+    """
+    link_dir = os.path.abspath(expandpath(link_dir))
+    os.makedirs(link_dir, exist_ok=True)
+    manifest_path = os.path.join(link_dir, LINK_MANIFEST)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    for psm in psms:
+        name = psm.pipeline_name
+        manifest[name] = _update_links(psm, link_dir, manifest.get(name))
+    write_if_changed(manifest_path, json.dumps(manifest, indent=1, sort_keys=True))
+    return link_dir
+
+
+def _update_links(psm, link_dir: str, previous: dict | None) -> dict:
+    """Bring the links of a pipeline up to date with its results.
+
+    Args:
+        psm (pipestat.PipestatManager): Manager of the pipeline's results.
+        link_dir (str): Absolute path to the link directory.
+        previous (dict | None): Manifest entry of the pipeline's last linking.
+
+    Returns:
+        dict: Manifest entry of this linking.
+    """
+    psm.check_multi_results()
+    source = _results_stamp(psm)
+    if previous and source is not None and previous["source"] == source:
+        _LOGGER.info(f"Results of '{psm.pipeline_name}' unchanged; links up to date")
+        return previous
+    links = _result_links(psm, link_dir)
+    old = previous["links"] if previous else {}
+    stale = [link for link in old if link not in links]
+    # links whose target changed are replaced
+    new = [(link, target) for link, target in links.items() if old.get(link) != target]
+    for folder in {os.path.dirname(link) for link, _ in new}:
+        os.makedirs(os.path.join(link_dir, folder), exist_ok=True)
+    with ThreadPoolExecutor(
+        max_workers=LINK_THREADS, thread_name_prefix="looper-link"
+    ) as executor:
+        list(executor.map(_unlink, (os.path.join(link_dir, link) for link in stale)))
+        list(
+            executor.map(
+                _symlink,
+                (target for _, target in new),
+                (os.path.join(link_dir, link) for link, _ in new),
+            )
+        )
+    _LOGGER.info(
+        f"Linked results of '{psm.pipeline_name}': {len(new)} created, "
+        f"{len(stale)} removed, "
+        f"{len(links) - len(new)} unchanged"
+    )
+    return {"source": source, "links": links}
+
+
+def _results_stamp(psm) -> list | None:
+    """Path, modification time and size of a pipeline's results file.
+
+    Returns:
+        list | None: The stamp; None if the results aren't kept in a single
+            file, e.g. in a database or in a file per record.
+    """
+    path = getattr(psm, "file", None)
+    if not path or psm.cfg.get("multi_result_files"):
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [os.path.abspath(path), st.st_mtime_ns, st.st_size]
+
+
+def _result_links(psm, link_dir: str) -> dict[str, str]:
+    """Links to the file and image results of a pipeline.
+
+    Returns:
+        dict[str, str]: Link targets, relative to the links, by path of the
+            link relative to the link directory.
+    """
+    links = {}
+    for record in psm.backend.select_records(limit=None)["records"]:
+        for result_id, value in record.items():
+            if not isinstance(value, dict):
+                continue
+            for key, path in _nested_paths(result_id, value):
+                link = os.path.join(
+                    result_id,
+                    f"{record['record_identifier']}_{key}_{os.path.basename(path)}",
+                )
+                links[link] = os.path.relpath(
+                    os.path.abspath(path),
+                    os.path.dirname(os.path.join(link_dir, link)),
+                )
+    return links
+
+
+def _nested_paths(parent_key: str, value: dict) -> list[tuple[str, str]]:
+    """Paths of a complex result, by the key of the object holding each."""
+    paths = []
+    for k, v in value.items():
+        if isinstance(v, dict):
+            paths.extend(_nested_paths(k, v))
+        elif k == "path":
+            paths.append((parent_key, v))
+    return paths
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _symlink(target: str, path: str) -> None:
+    try:
+        os.symlink(target, path)
+    except FileExistsError:
+        os.remove(path)
+        os.symlink(target, path)
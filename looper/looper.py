@@ -5,39 +5,36 @@ Looper: a pipeline submission engine. https://github.com/pepkit/looper
 
 import abc
 import argparse
-import glob
+import json
 import logging
 import os
+import shlex
 import subprocess
+import time
 
-# Need specific sequence of actions for colorama imports?
-from colorama import init
-
-from .const import PipelineLevel
-
-init()
 # from collections.abc import Mapping
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import md5
 from shutil import rmtree
 
-from colorama import Fore, Style
-from eido import validate_config, validate_sample
+from colorama import Fore, Style, init
+from eido import get_input_files_size, read_schema, validate_config, validate_sample
+from eido.const import MISSING_KEY
 from eido.exceptions import EidoValidationError
 from peppy.exceptions import RemoteYAMLError
 from pipestat.exceptions import PipestatSummarizeError
-from pipestat.reports import get_file_for_table
-from rich.color import Color
-from rich.console import Console
-from rich.table import Table
+from ubiquerg import expandpath
 from ubiquerg.cli_tools import query_yes_no
 
-from .conductor import SubmissionConductor
+from .conductor import SubmissionConductor, submission_shard
 from .const import (
     DEBUG_COMMANDS,
     DEBUG_EIDO_VALIDATION,
     DEBUG_JOBS,
     NOT_SUB_MSG,
     SUBMISSION_FAILURE_MESSAGE,
+    PipelineLevel,
 )
 from .exceptions import (
     JobSubmissionException,
@@ -45,16 +42,37 @@ from .exceptions import (
     MisconfigurationException,
     SampleFailedException,
 )
-from .project import Project
+from .plan import execution_plan
+from .profiling import phase
+from .project import Project, ProjectContext
 from .utils import (
+    ProgressReport,
     desired_samples_range_limited,
     desired_samples_range_skipped,
+    find_cleanup_scripts,
+    parse_shard,
     sample_folder,
+    sample_in_shard,
 )
+from .writer import background_writer
 
 _PKGNAME = "looper"
 _LOGGER = logging.getLogger(_PKGNAME)
 
+# Removal is bound by file system latency, so threads overlap it well
+REMOVE_THREADS = 16
+
+
+_colors_initialized = False
+
+
+def _init_colors() -> None:
+    """Set up colored terminal output, once, when a command first runs."""
+    global _colors_initialized
+    if not _colors_initialized:
+        init()
+        _colors_initialized = True
+
 
 class Executor(object):
     """Base class that ensures the program's Sample counter starts.
@@ -74,6 +92,7 @@ class Executor(object):
             prj (Project): Project with which to work/operate on.
         """
         super(Executor, self).__init__()
+        _init_colors()
         self.prj = prj
         self.counter = LooperCounter(len(prj.samples))
 
@@ -113,8 +132,10 @@ class Checker(Executor):
                     )
 
         else:
-            for sample in self.prj.samples:
-                for piface in sample.project.pipeline_interfaces:
+            # every sample lists its own interfaces; query each pipeline once
+            pifaces = list({id(pi): pi for pi in self.prj.pipeline_interfaces}.values())
+            for sample in select_samples(prj=self.prj, args=args):
+                for piface in pifaces:
                     if piface.psm.pipeline_type == PipelineLevel.SAMPLE.value:
                         psms[piface.psm.pipeline_name] = piface.psm
                         s = piface.psm.get_status(record_identifier=sample.sample_name)
@@ -124,6 +145,10 @@ class Checker(Executor):
                             f"{sample.sample_name} ({piface.psm.pipeline_name}): {s}"
                         )
 
+        from rich.color import Color
+        from rich.console import Console
+        from rich.table import Table
+
         console = Console()
 
         for pipeline_name, pipeline_status in status.items():
@@ -199,14 +224,18 @@ class Cleaner(Executor):
         Args:
             args (argparse.Namespace): Command-line options and arguments.
             preview_flag (bool): Whether to halt before actually removing files.
+
+        Returns:
+            int: 0 if cleaning went fine, 1 if it was aborted or a cleanup
+                script or job submission failed.
         """
         self.counter.show(name=self.prj.name, type="project")
-        for sample in self.prj.samples:
+        samples = self.prj.samples
+        found = find_cleanup_scripts(self.prj.results_folder) if samples else {}
+        cleanup_scripts = {}
+        for sample in samples:
             _LOGGER.info(self.counter.show(sample.sample_name))
-            sample_output_folder = sample_folder(self.prj, sample)
-            cleanup_files = glob.glob(
-                os.path.join(sample_output_folder, "*_cleanup.sh")
-            )
+            cleanup_files = found.get(sample_folder(self.prj, sample))
             if not cleanup_files:
                 _LOGGER.info("Nothing to clean.")
                 continue
@@ -214,12 +243,22 @@ class Cleaner(Executor):
                 # Preview: Don't actually clean, just show what will be cleaned.
                 _LOGGER.info("Files to clean: %s", ", ".join(cleanup_files))
             else:
-                for f in cleanup_files:
-                    _LOGGER.info(f)
-                    subprocess.call(["sh", f])
+                cleanup_scripts[sample.sample_name] = cleanup_files
         if not preview_flag:
+            jobs = getattr(args, "jobs", None) or 1
+            if getattr(args, "submit", False):
+                failed = self._submit(
+                    cleanup_scripts,
+                    jobs,
+                    sharded=getattr(args, "sharded_submission", False),
+                )
+            else:
+                scripts = [f for files in cleanup_scripts.values() for f in files]
+                failed = run_commands(
+                    [["sh", f] for f in scripts], jobs, "cleanup scripts"
+                )
             _LOGGER.info("Clean complete.")
-            return 0
+            return int(bool(failed))
         if getattr(args, "dry_run", None):
             _LOGGER.info("Dry run. No files cleaned.")
             return 0
@@ -232,12 +271,105 @@ class Cleaner(Executor):
         self.counter.reset()
         return self(args, preview_flag=False)
 
+    def _submit(
+        self, cleanup_scripts: dict[str, list[str]], jobs: int, sharded: bool = False
+    ) -> list:
+        """Submit a job per sample that runs its cleanup scripts.
+
+        The job scripts are made from the template of the active compute
+        package, like those of the pipelines.
+
+        Args:
+            cleanup_scripts (dict[str, list[str]]): Cleanup scripts by sample.
+            jobs (int): Number of jobs to submit at a time.
+            sharded (bool): Whether to spread the job scripts and logs over
+                the shards of the submission folder, like those of `run`.
+
+        Returns:
+            list[tuple[list[str], int, float]]: Failed submission commands,
+                with their exit codes and durations.
+        """
+        submission_folder = expandpath(self.prj.submission_folder)
+        sub_cmd = self.prj.dcc.compute["submission_command"]
+        commands = []
+        for sample_name, files in cleanup_scripts.items():
+            job_name = f"{sample_name}_cleanup"
+            folder = submission_folder
+            if sharded:
+                folder = os.path.join(folder, submission_shard(job_name))
+            os.makedirs(folder, exist_ok=True)
+            looper = {
+                "command": "\n".join(f"sh {shlex.quote(f)}" for f in files),
+                "job_name": job_name,
+                "log_file": os.path.join(folder, job_name + ".log"),
+            }
+            script = self.prj.dcc.write_script(
+                os.path.join(folder, job_name + ".sub"), extra_vars=[{"looper": looper}]
+            )
+            if sub_cmd == ".":
+                commands.append(["/bin/bash", script])
+            else:
+                commands.append(shlex.split(sub_cmd) + [script])
+        return run_commands(commands, jobs, "cleanup job submissions")
+
+
+def run_commands(commands: list[list[str]], jobs: int, what: str) -> list:
+    """Run commands through a pool of threads and summarize how they went.
+
+    Args:
+        commands (list[list[str]]): Commands to run, as argument lists.
+        jobs (int): Number of commands to run at a time.
+        what (str): What the commands are, to report.
+
+    Returns:
+        list[tuple[list[str], int, float]]: Failed commands, with their exit
+            codes and durations in seconds.
+    """
+    if not commands:
+        return []
+    progress = ProgressReport(len(commands), "Ran", what)
+    results = []
+    with ThreadPoolExecutor(
+        max_workers=jobs, thread_name_prefix="looper-run"
+    ) as executor:
+        for result in executor.map(_run_timed, commands):
+            results.append(result)
+            progress.update()
+    progress.finish()
+    durations = sorted(duration for _, _, duration in results)
+    failed = [r for r in results if r[1] != 0]
+    _LOGGER.info(
+        f"{len(results) - len(failed)} of {len(results)} {what} succeeded; "
+        f"duration median {durations[len(durations) // 2]:.2f} s, "
+        f"max {durations[-1]:.2f} s"
+    )
+    for command, code, duration in failed:
+        _LOGGER.warning(
+            f"Failed with exit code {code} after {duration:.2f} s: "
+            f"{shlex.join(command)}"
+        )
+    return failed
+
+
+def _run_timed(command: list[str]) -> tuple[list[str], int, float]:
+    """Run a command; return it with its exit code and duration."""
+    _LOGGER.info(shlex.join(command))
+    start = time.perf_counter()
+    code = subprocess.call(command)
+    return command, code, time.perf_counter() - start
+
 
 # NOTE: Adding type hint -> Iterable[Any] gives me  TypeError: 'ABCMeta' object is not subscriptable
 def select_samples(prj: Project, args: argparse.Namespace):
-    """Use CLI limit/skip arguments to select subset of project's samples."""
+    """Use CLI limit/skip/shard arguments to select subset of project's samples."""
     # TODO: get proper element type for signature.
-    num_samples = len(prj.samples)
+    if isinstance(prj, ProjectContext):
+        all_samples = prj.prj.samples
+        positions = prj.sample_positions
+    else:
+        all_samples = prj.samples
+        positions = range(len(all_samples))
+    num_samples = len(positions)
     if args.limit is None and args.skip is None:
         index = range(1, num_samples + 1)
     elif args.skip is not None:
@@ -248,7 +380,16 @@ def select_samples(prj: Project, args: argparse.Namespace):
         raise argparse.ArgumentError(
             "Both --limit and --skip are in use, but they should be mutually exclusive."
         )
-    return (prj.samples[i - 1] for i in index)
+    samples = (all_samples[positions[i - 1]] for i in index)
+    if getattr(args, "shard", None):
+        shard, num_shards = parse_shard(args.shard)
+        _LOGGER.debug(f"Selecting samples in shard {shard} of {num_shards}")
+        samples = (
+            s
+            for s in samples
+            if sample_in_shard(s[prj.sample_table_index], shard, num_shards)
+        )
+    return samples
 
 
 class Destroyer(Executor):
@@ -279,24 +420,29 @@ class Destroyer(Executor):
             )
 
         _LOGGER.info("Removing results:")
-        psms = {}
-        for sample in select_samples(prj=self.prj, args=args):
-            _LOGGER.info(self.counter.show(sample.sample_name))
-            sample_output_folder = sample_folder(self.prj, sample)
-            if preview_flag:
+        samples = select_samples(prj=self.prj, args=args)
+        if preview_flag:
+            for sample in samples:
+                _LOGGER.info(self.counter.show(sample.sample_name))
                 # Preview: Don't actually delete, just show files.
-                _LOGGER.info(str(sample_output_folder))
-            else:
-                if use_pipestat:
-                    for piface in sample.project.pipeline_interfaces:
-                        if piface.psm.pipeline_type == PipelineLevel.SAMPLE.value:
-                            psms[piface.psm.pipeline_name] = piface.psm
-                    for pipeline_name, psm in psms.items():
-                        psm.backend.remove_record(
-                            record_identifier=sample.sample_name, rm_record=True
-                        )
-                else:
-                    _remove_or_dry_run(sample_output_folder, args.dry_run)
+                _LOGGER.info(str(sample_folder(self.prj, sample)))
+        elif use_pipestat:
+            record_ids = [sample.sample_name for sample in samples]
+            psms = {
+                piface.psm.pipeline_name: piface.psm
+                for piface in self.prj.pipeline_interfaces
+                if piface.psm.pipeline_type == PipelineLevel.SAMPLE.value
+            }
+            for psm in psms.values():
+                remove_pipestat_records(psm, record_ids)
+        elif args.dry_run:
+            for sample in samples:
+                _remove_or_dry_run(sample_folder(self.prj, sample), dry_run=True)
+        else:
+            remove_in_parallel(
+                [sample_folder(self.prj, sample) for sample in samples],
+                max_workers=getattr(args, "jobs", None) or REMOVE_THREADS,
+            )
 
         if not preview_flag:
             _LOGGER.info("Destroy complete.")
@@ -331,11 +477,18 @@ class Collator(Executor):
         super(Executor, self).__init__()
         self.prj = prj
 
-    def __call__(self, args: argparse.Namespace, **compute_kwargs) -> dict:
+    def __call__(
+        self,
+        args: argparse.Namespace,
+        dependencies: list[str] | None = None,
+        **compute_kwargs,
+    ) -> dict:
         """Matches collators by protocols, creates submission scripts and submits them.
 
         Args:
             args (argparse.Namespace): Parsed command-line options and arguments, recognized by looper.
+            dependencies (list[str] | None): Scheduler job IDs, e.g. of the
+                sample-level jobs, that the project-level jobs should wait for.
         """
         jobs = 0
         self.debug = {}
@@ -348,30 +501,35 @@ class Collator(Executor):
                 "http://looper.databio.org/en/latest/defining-a-project"
             )
         self.counter = LooperCounter(len(project_pifaces))
-        for project_piface in project_pifaces:
-            _LOGGER.info(
-                self.counter.show(
-                    name=self.prj.name,
-                    type="project",
-                    pipeline_name=project_piface.pipeline_name,
+        with execution_plan(getattr(args, "plan", None)) as plan:
+            for project_piface in project_pifaces:
+                _LOGGER.info(
+                    self.counter.show(
+                        name=self.prj.name,
+                        type="project",
+                        pipeline_name=project_piface.pipeline_name,
+                    )
                 )
-            )
-            conductor = SubmissionConductor(
-                pipeline_interface=project_piface,
-                prj=self.prj,
-                compute_variables=compute_kwargs,
-                delay=getattr(args, "time_delay", None),
-                extra_args=getattr(args, "command_extra", None),
-                extra_args_override=getattr(args, "command_extra_override", None),
-                ignore_flags=getattr(args, "ignore_flags", None),
-                collate=True,
-            )
-            if conductor.is_project_submittable(
-                force=getattr(args, "ignore_flags", None)
-            ):
-                conductor._pool = [None]
-                conductor.submit()
-                jobs += conductor.num_job_submissions
+                conductor = SubmissionConductor(
+                    pipeline_interface=project_piface,
+                    prj=self.prj,
+                    compute_variables=compute_kwargs,
+                    delay=getattr(args, "time_delay", None),
+                    extra_args=getattr(args, "command_extra", None),
+                    extra_args_override=getattr(args, "command_extra_override", None),
+                    ignore_flags=getattr(args, "ignore_flags", None),
+                    collate=True,
+                    dependencies=dependencies,
+                    sharded_submission=getattr(args, "sharded_submission", False),
+                    plan=plan,
+                )
+                if conductor.is_project_submittable(
+                    force=getattr(args, "ignore_flags", None)
+                ):
+                    conductor._pool = [None]
+                    conductor.submit()
+                    jobs += conductor.num_job_submissions
+        background_writer().flush()
         _LOGGER.info("\nLooper finished")
         _LOGGER.info("Jobs submitted: {}".format(jobs))
         self.debug[DEBUG_JOBS] = jobs
@@ -381,6 +539,9 @@ class Collator(Executor):
 class Runner(Executor):
     """The true submitter of pipelines"""
 
+    # execution plan being made by the current call, if any
+    plan = None
+
     def __call__(
         self,
         args: argparse.Namespace,
@@ -395,103 +556,65 @@ class Runner(Executor):
             remaining_args (list): Command-line options and arguments not recognized by looper, germane to samples/pipelines.
             rerun (bool): Whether the given sample is being rerun rather than run for the first time.
         """
+        with execution_plan(getattr(args, "plan", None)) as self.plan:
+            return self._run(args, rerun=rerun, **compute_kwargs)
+
+    def _run(
+        self, args: argparse.Namespace, rerun: bool = False, **compute_kwargs
+    ) -> dict:
+        """Do the Sample submission, or plan it if a plan is open."""
         self.debug = {}  # initialize empty dict for return values
-        max_cmds = sum(list(map(len, self.prj._samples_by_interface.values())))
-        self.counter.total = max_cmds
+        self.job_ids = []  # scheduler job IDs, if the compute package reports them
+        self.num_missing_job_ids = 0
+        max_cmds = 0
         failures = defaultdict(list)  # Collect problems by sample.
-        processed_samples = set()  # Enforce one-time processing.
+        self.processed_samples = set()  # Enforce one-time processing.
+        self.failed_submission_scripts = []
         comp_vars = compute_kwargs or {}
-
-        # Determine number of samples eligible for processing.
-        num_samples = len(self.prj.samples)
-
-        num_commands_possible = 0
-        failed_submission_scripts = []
-
-        # config validation (samples excluded) against all schemas defined
-        # for every pipeline matched for this project
-        for schema_file in self.prj.get_schemas(self.prj.pipeline_interfaces):
-            try:
-                validate_config(self.prj, schema_file)
-            except RemoteYAMLError:
-                _LOGGER.warning(
-                    "Could not read remote schema, skipping config validation."
-                )
-
+        # Number of samples eligible for processing.
+        num_samples = 0
         submission_conductors = {}
 
-        for piface in self.prj.pipeline_interfaces:
-            conductor = SubmissionConductor(
-                pipeline_interface=piface,
-                prj=self.prj,
-                compute_variables=comp_vars,
-                delay=getattr(args, "time_delay", None),
-                extra_args=getattr(args, "command_extra", None),
-                extra_args_override=getattr(args, "command_extra_override", None),
-                ignore_flags=getattr(args, "ignore_flags", None),
-                max_cmds=getattr(args, "lump_n", None),
-                max_size=getattr(args, "lump", None),
-                max_jobs=getattr(args, "lump_j", None),
-            )
-            submission_conductors[piface.pipe_iface_file] = conductor
+        chunk_size = getattr(args, "chunk_size", None)
+        if chunk_size is None:
+            chunks = [self.prj.samples]
+        else:
+            _LOGGER.info(f"Processing samples in chunks of {chunk_size}")
+            chunks = (self.prj.samples for _ in self.prj.iter_sample_chunks(chunk_size))
 
         _LOGGER.debug(f"Pipestat compatible: {self.prj.pipestat_configured}")
         self.debug["Pipestat compatible"] = self.prj.pipestat_configured
 
-        for sample in select_samples(prj=self.prj, args=args):
-            pl_fails = []
-            skip_reasons = []
-            sample_pifaces = self.prj.get_sample_piface(
-                sample[self.prj.sample_table_index]
-            )
-            if not sample_pifaces:
-                skip_reasons.append("No pipeline interfaces defined")
-
-            if skip_reasons:
-                _LOGGER.warning(NOT_SUB_MSG.format(", ".join(skip_reasons)))
-                failures[sample.sample_name] = skip_reasons
-                continue
+        for samples in chunks:
+            max_cmds += sum(map(len, self.prj._samples_by_interface.values()))
+            self.counter.total = max_cmds
+            num_samples += len(samples)
+
+            new_pifaces = {
+                piface.pipe_iface_file: piface
+                for piface in self.prj.pipeline_interfaces
+                if piface.pipe_iface_file not in submission_conductors
+            }
+            self._validate_config(list(new_pifaces.values()))
+            for piface_file, piface in new_pifaces.items():
+                if chunk_size is not None and self.prj.pipestat_configured:
+                    # the interfaces of streamed samples appear as they're read
+                    self.prj._configure_piface_pipestat(
+                        piface, PipelineLevel.SAMPLE.value
+                    )
+                submission_conductors[piface_file] = self._create_conductor(
+                    piface, args, comp_vars
+                )
 
-            # single sample validation against a single schema
-            # (from sample's piface)
-            for schema_file in self.prj.get_schemas(sample_pifaces):
+            for sample in select_samples(prj=self.prj, args=args):
                 try:
-                    validate_sample(self.prj, sample.sample_name, schema_file)
-                except EidoValidationError as e:
-                    _LOGGER.error(
-                        f"Short-circuiting due to validation error!\nSchema file: "
-                        f"{schema_file}\nError: {e}\n{list(e.errors_by_type.keys())}"
-                    )
-                    self.debug[DEBUG_EIDO_VALIDATION] = (
-                        f"Short-circuiting due to validation error!\nSchema file: "
-                        f"{schema_file}\nError: {e}\n{list(e.errors_by_type.keys())}"
+                    sample_fails = self._add_sample(
+                        sample, submission_conductors, rerun=rerun
                     )
+                except EidoValidationError:
                     return False
-                except RemoteYAMLError:
-                    _LOGGER.warning(
-                        f"Could not read remote schema, skipping '{sample.sample_name}' "
-                        f"sample validation against {schema_file}"
-                    )
-
-            processed_samples.add(sample[self.prj.sample_table_index])
-
-            for sample_piface in sample_pifaces:
-                _LOGGER.info(
-                    self.counter.show(
-                        name=sample.sample_name,
-                        pipeline_name=sample_piface.pipeline_name,
-                    )
-                )
-                num_commands_possible += 1
-                cndtr = submission_conductors[sample_piface.pipe_iface_file]
-                try:
-                    curr_pl_fails = cndtr.add_sample(sample, rerun=rerun)
-                except JobSubmissionException as e:
-                    failed_submission_scripts.append(e.script)
-                else:
-                    pl_fails.extend(curr_pl_fails)
-            if pl_fails:
-                failures[sample.sample_name].extend(pl_fails)
+                if sample_fails:
+                    failures[sample.sample_name].extend(sample_fails)
 
         job_sub_total = 0
         cmd_sub_total = 0
@@ -500,12 +623,16 @@ class Runner(Executor):
             conductor.submit(force=True)
             job_sub_total += conductor.num_job_submissions
             cmd_sub_total += conductor.num_cmd_submissions
+            self.job_ids.extend(conductor.job_ids)
+            self.num_missing_job_ids += conductor.num_missing_job_ids
+        # e.g. the scripts of a dry run, which nothing waited for
+        background_writer().flush()
 
         # Report what went down.
         _LOGGER.info("\nLooper finished")
         _LOGGER.info(
             "Samples valid for job generation: {} of {}".format(
-                len(processed_samples), num_samples
+                len(self.processed_samples), num_samples
             )
         )
         _LOGGER.debug("Commands submitted: {} of {}".format(cmd_sub_total, max_cmds))
@@ -563,11 +690,336 @@ class Runner(Executor):
 
         return self.debug
 
+    def _validate_config(self, pifaces: list | None = None) -> None:
+        """Validate the project config (samples excluded) against all schemas
+        defined for every pipeline matched for this project.
+
+        Args:
+            pifaces (list[PipelineInterface] | None): Pipelines to validate
+                against; all of the project's by default.
+        """
+        if pifaces is None:
+            pifaces = self.prj.pipeline_interfaces
+        for schema_file in self.prj.get_schemas(pifaces):
+            try:
+                with phase("validate.config"):
+                    validate_config(self.prj, schema_file)
+            except RemoteYAMLError:
+                _LOGGER.warning(
+                    "Could not read remote schema, skipping config validation."
+                )
+
+    def _create_conductor(
+        self, piface, args: argparse.Namespace, compute_kwargs: dict
+    ) -> SubmissionConductor:
+        """Create a submission conductor for a sample pipeline interface.
+
+        Args:
+            piface (PipelineInterface): Sample pipeline interface.
+            args (argparse.Namespace): Parsed command-line options and arguments.
+            compute_kwargs (dict): Compute variables specified on the command line.
+
+        Returns:
+            SubmissionConductor: Conductor for the given pipeline.
+        """
+        return SubmissionConductor(
+            pipeline_interface=piface,
+            prj=self.prj,
+            compute_variables=compute_kwargs,
+            delay=getattr(args, "time_delay", None),
+            extra_args=getattr(args, "command_extra", None),
+            extra_args_override=getattr(args, "command_extra_override", None),
+            ignore_flags=getattr(args, "ignore_flags", None),
+            max_cmds=getattr(args, "lump_n", None),
+            max_size=getattr(args, "lump", None),
+            max_jobs=getattr(args, "lump_j", None),
+            claim_ttl=getattr(args, "claim_ttl", None),
+            sharded_submission=getattr(args, "sharded_submission", False),
+            plan=self.plan,
+        )
+
+    def _add_sample(
+        self,
+        sample,
+        submission_conductors: dict,
+        rerun: bool = False,
+        pifaces: list | None = None,
+    ) -> list[str]:
+        """Validate a sample and add it to the conductors of its pipelines.
+
+        Args:
+            sample (peppy.Sample): Sample to submit.
+            submission_conductors (dict[str, SubmissionConductor]): Conductors
+                keyed by pipeline interface file.
+            rerun (bool): Whether the given sample is being rerun rather than run for the first time.
+            pifaces (list[PipelineInterface] | None): Pipeline interfaces of the
+                sample to submit it for; all of them by default.
+
+        Returns:
+            list[str]: Reasons why the sample was not added to (some of) the
+                conductors; empty if it was added to all of them.
+
+        Raises:
+            EidoValidationError: If the sample does not validate against the
+                input schema of one of its pipelines.
+        """
+        skip_reasons = []
+        sample_pifaces = pifaces or self.prj.get_sample_piface(
+            sample[self.prj.sample_table_index]
+        )
+        if not sample_pifaces:
+            skip_reasons.append("No pipeline interfaces defined")
+
+        if skip_reasons:
+            _LOGGER.warning(NOT_SUB_MSG.format(", ".join(skip_reasons)))
+            return skip_reasons
+
+        # single sample validation against a single schema
+        # (from sample's piface)
+        for schema_file in self.prj.get_schemas(sample_pifaces):
+            try:
+                with phase("validate.sample"):
+                    validate_sample(self.prj, sample.sample_name, schema_file)
+            except EidoValidationError as e:
+                _LOGGER.error(
+                    f"Short-circuiting due to validation error!\nSchema file: "
+                    f"{schema_file}\nError: {e}\n{list(e.errors_by_type.keys())}"
+                )
+                self.debug[DEBUG_EIDO_VALIDATION] = (
+                    f"Short-circuiting due to validation error!\nSchema file: "
+                    f"{schema_file}\nError: {e}\n{list(e.errors_by_type.keys())}"
+                )
+                raise
+            except RemoteYAMLError:
+                _LOGGER.warning(
+                    f"Could not read remote schema, skipping '{sample.sample_name}' "
+                    f"sample validation against {schema_file}"
+                )
+
+        self.processed_samples.add(sample[self.prj.sample_table_index])
+
+        pl_fails = []
+        for sample_piface in sample_pifaces:
+            _LOGGER.info(
+                self.counter.show(
+                    name=sample.sample_name,
+                    pipeline_name=sample_piface.pipeline_name,
+                )
+            )
+            cndtr = submission_conductors[sample_piface.pipe_iface_file]
+            try:
+                with phase("conductor.add_sample"):
+                    curr_pl_fails = cndtr.add_sample(sample, rerun=rerun)
+            except JobSubmissionException as e:
+                self.failed_submission_scripts.append(e.script)
+            else:
+                pl_fails.extend(curr_pl_fails)
+        return pl_fails
+
+
+class Watcher(Runner):
+    """Long-running submitter that picks up new work as it appears"""
+
+    def __call__(self, args: argparse.Namespace, **compute_kwargs) -> dict:
+        """Poll the project and submit jobs for new or changed samples.
+
+        The Project, pipeline interfaces and submission conductors stay
+        loaded between polls. The sample table is reloaded only when its
+        files change, and only samples that are new or whose attributes
+        changed are considered for submission. Samples skipped because of
+        missing input files are retried once all of those files exist.
+
+        Args:
+            args (argparse.Namespace): Parsed command-line options and arguments, recognized by looper.
+        """
+        self.debug = {}
+        self.job_ids = []
+        self.processed_samples = set()
+        self.failed_submission_scripts = []
+        comp_vars = compute_kwargs or {}
+        poll_interval = max(getattr(args, "poll_interval", None) or 0, 0)
+        max_polls = getattr(args, "max_polls", None)
+        digest_interval = getattr(args, "digest_interval", None) or 0
+
+        self._validate_config()
+        submission_conductors = {}
+        # (sample name, pipeline interface file) -> fingerprint of the sample
+        # when it was handled for that pipeline
+        handled = {}
+        # (sample name, pipeline interface file) -> input files it is waiting for
+        pending = {}
+        fingerprints = self._sample_fingerprints()
+        table_mtimes = self._sample_table_mtimes()
+        polls = 0
+        last_digest = time.time()
+        try:
+            while True:
+                polls += 1
+                mtimes = self._sample_table_mtimes()
+                if mtimes != table_mtimes:
+                    _LOGGER.info("Sample table changed, reloading samples")
+                    try:
+                        self.prj.reload_samples()
+                    except Exception as e:
+                        # e.g. a table caught halfway through being written
+                        _LOGGER.warning(f"Could not reload samples, will retry: {e}")
+                    else:
+                        table_mtimes = mtimes
+                        fingerprints = self._sample_fingerprints()
+                for piface in self.prj.pipeline_interfaces:
+                    if piface.pipe_iface_file not in submission_conductors:
+                        submission_conductors[piface.pipe_iface_file] = (
+                            self._create_conductor(piface, args, comp_vars)
+                        )
+                submitted = self._poll(
+                    args, submission_conductors, fingerprints, handled, pending
+                )
+                if submitted or (
+                    digest_interval and time.time() - last_digest >= digest_interval
+                ):
+                    _LOGGER.info(self._digest(submission_conductors, handled, pending))
+                    last_digest = time.time()
+                if max_polls and polls >= max_polls:
+                    break
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            _LOGGER.info("Watch interrupted")
+        background_writer().flush()
+
+        _LOGGER.info(self._digest(submission_conductors, handled, pending))
+        self.job_ids = [j for c in submission_conductors.values() for j in c.job_ids]
+        self.debug[DEBUG_JOBS] = sum(
+            c.num_job_submissions for c in submission_conductors.values()
+        )
+        self.debug[DEBUG_COMMANDS] = sum(
+            c.num_cmd_submissions for c in submission_conductors.values()
+        )
+        return self.debug
+
+    def _poll(
+        self,
+        args: argparse.Namespace,
+        submission_conductors: dict,
+        fingerprints: dict,
+        handled: dict,
+        pending: dict,
+    ) -> int:
+        """Submit the samples with outstanding work.
+
+        Returns:
+            int: Number of commands submitted in this poll.
+        """
+        candidates = []
+        for sample in select_samples(prj=self.prj, args=args):
+            name = sample[self.prj.sample_table_index]
+            pifaces = []
+            for piface in self.prj.get_sample_piface(name) or []:
+                key = (name, piface.pipe_iface_file)
+                if handled.get(key) == fingerprints.get(name):
+                    continue
+                waiting_for = pending.get(key)
+                if waiting_for and not all(os.path.exists(f) for f in waiting_for):
+                    continue
+                pifaces.append(piface)
+            if pifaces:
+                candidates.append((sample, pifaces))
+        if not candidates:
+            return 0
+
+        cmds_before = sum(c.num_cmd_submissions for c in submission_conductors.values())
+        fails_before = {
+            key: len(c.failed_samples) for key, c in submission_conductors.items()
+        }
+        self.counter = LooperCounter(sum(len(p) for _, p in candidates))
+        staged = []
+        for sample, pifaces in candidates:
+            name = sample[self.prj.sample_table_index]
+            for piface in pifaces:
+                key = (name, piface.pipe_iface_file)
+                pending.pop(key, None)
+                try:
+                    sample_fails = self._add_sample(
+                        sample, submission_conductors, pifaces=[piface]
+                    )
+                except EidoValidationError:
+                    sample_fails = []
+                if "Missing files" in sample_fails:
+                    pending[key] = self._missing_inputs(sample, piface)
+                else:
+                    staged.append(key)
+
+        for conductor in submission_conductors.values():
+            try:
+                conductor.submit(force=True)
+            except JobSubmissionException as e:
+                self.failed_submission_scripts.append(e.script)
+        # Samples whose submission failed stay unhandled, to be retried
+        failed = {
+            (name, key)
+            for key, c in submission_conductors.items()
+            for name in c.failed_samples[fails_before[key] :]
+        }
+        if failed:
+            _LOGGER.warning(
+                f"Submission failed for {len(failed)} sample job(s), will retry"
+            )
+        for name, key in staged:
+            if (name, key) not in failed:
+                handled[(name, key)] = fingerprints.get(name)
+        return (
+            sum(c.num_cmd_submissions for c in submission_conductors.values())
+            - cmds_before
+        )
+
+    def _missing_inputs(self, sample, piface) -> list[str]:
+        """List the input files a pipeline requires of a sample that do not exist."""
+        missing = []
+        for schema_file in self.prj.get_schemas([piface]):
+            try:
+                validation = get_input_files_size(sample, read_schema(schema_file))
+            except RemoteYAMLError:
+                continue
+            missing.extend(validation[MISSING_KEY])
+        return missing
+
+    def _sample_fingerprints(self) -> dict[str, str]:
+        """Fingerprint the attributes of every sample, as currently loaded."""
+        return {
+            s[self.prj.sample_table_index]: md5(
+                json.dumps(s.to_dict(), sort_keys=True, default=str).encode()
+            ).hexdigest()
+            for s in self.prj.samples
+        }
+
+    def _sample_table_mtimes(self) -> dict[str, float | None]:
+        """Modification times of the sample and subsample table files."""
+        mtimes = {}
+        for path in self.prj.sample_table_sources:
+            try:
+                mtimes[path] = os.path.getmtime(path)
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def _digest(self, submission_conductors: dict, handled: dict, pending: dict) -> str:
+        """Summarize the work done so far."""
+        jobs = sum(c.num_job_submissions for c in submission_conductors.values())
+        cmds = sum(c.num_cmd_submissions for c in submission_conductors.values())
+        num_handled = len({name for name, _ in handled})
+        num_pending = len({name for name, _ in pending})
+        return (
+            f"Watch status: {num_handled} of {len(self.prj.samples)} samples "
+            f"handled, {num_pending} waiting for input files; "
+            f"{cmds} commands in {jobs} jobs submitted"
+        )
+
 
 class Reporter(Executor):
     """Combine project outputs into a browsable HTML report"""
 
     def __call__(self, args: argparse.Namespace) -> dict:
+        from .report import build_report
+
         # initialize the report builder
         self.debug = {}
         project_level = getattr(args, "project", None)
@@ -585,10 +1037,12 @@ class Reporter(Executor):
                         psms[piface.psm.pipeline_name] = piface.psm
             for pl_name, psm in psms.items():
                 try:
-                    report_directory = psm.summarize(
+                    report_directory = build_report(
+                        psm,
                         looper_samples=self.prj.samples,
                         portable=portable,
                         output_dir=report_dir,
+                        jobs=getattr(args, "jobs", None),
                     )
                 except PipestatSummarizeError as e:
                     raise LooperReportError(
@@ -604,10 +1058,12 @@ class Reporter(Executor):
                         psms[piface.psm.pipeline_name] = piface.psm
             for pl_name, psm in psms.items():
                 try:
-                    report_directory = psm.summarize(
+                    report_directory = build_report(
+                        psm,
                         looper_samples=self.prj.samples,
                         portable=portable,
                         output_dir=report_dir,
+                        jobs=getattr(args, "jobs", None),
                     )
                 except PipestatSummarizeError as e:
                     raise LooperReportError(
@@ -622,6 +1078,8 @@ class Linker(Executor):
     """Create symlinks for reported results. Requires pipestat to be configured."""
 
     def __call__(self, args: argparse.Namespace) -> None:
+        from .links import link_results
+
         project_level = getattr(args, "project", None)
         link_dir = getattr(args, "output_dir", None)
 
@@ -631,14 +1089,13 @@ class Linker(Executor):
             for piface in self.prj.project_pipeline_interfaces:
                 if piface.psm.pipeline_type == PipelineLevel.PROJECT.value:
                     psms[piface.psm.pipeline_name] = piface.psm
-                    linked_results_path = piface.psm.link(link_dir=link_dir)
-                    print(f"Linked directory: {linked_results_path}")
         else:
             for piface in self.prj.pipeline_interfaces:
                 if piface.psm.pipeline_type == PipelineLevel.SAMPLE.value:
                     psms[piface.psm.pipeline_name] = piface.psm
-                    linked_results_path = piface.psm.link(link_dir=link_dir)
-                    print(f"Linked directory: {linked_results_path}")
+        # each pipeline once, however many interfaces it has
+        linked_results_path = link_results(list(psms.values()), link_dir)
+        print(f"Linked directory: {linked_results_path}")
 
 
 class Tabulator(Executor):
@@ -652,6 +1109,7 @@ class Tabulator(Executor):
         # p = self.prj
         project_level = getattr(args, "project", None)
         report_dir = getattr(args, "report_dir", None)
+        table_format = getattr(args, "format", None)
         results = []
         psms = {}
         if project_level:
@@ -660,17 +1118,25 @@ class Tabulator(Executor):
                     if piface.psm.pipeline_name not in psms:
                         psms[piface.psm.pipeline_name] = piface.psm
             for pl_name, psm in psms.items():
-                results = psm.table(output_dir=report_dir)
+                results = self._table(psm, table_format, report_dir)
         else:
             for piface in self.prj.pipeline_interfaces:
                 if piface.psm.pipeline_type == PipelineLevel.SAMPLE.value:
                     if piface.psm.pipeline_name not in psms:
                         psms[piface.psm.pipeline_name] = piface.psm
             for pl_name, psm in psms.items():
-                results = psm.table(output_dir=report_dir)
+                results = self._table(psm, table_format, report_dir)
         # Results contains paths to stats and object summaries.
         return results
 
+    @staticmethod
+    def _table(psm, table_format: str | None, report_dir: str | None) -> list:
+        if table_format is None:
+            return psm.table(output_dir=report_dir)
+        from .table import export_table
+
+        return [export_table(psm, table_format, output_dir=report_dir)]
+
 
 def _create_failure_message(reason: str, samples: set[str]) -> str:
     """Explain lack of submission for a single reason, 1 or more samples."""
@@ -699,6 +1165,86 @@ def _remove_or_dry_run(paths: list | str, dry_run: bool = False) -> None:
             _LOGGER.info(path + " does not exist.")
 
 
+def _remove_path(path: str) -> bool:
+    """Remove a file or directory, if it exists; True if it did."""
+    if os.path.isdir(path) and not os.path.islink(path):
+        rmtree(path, ignore_errors=True)
+    elif os.path.lexists(path):
+        os.remove(path)
+    else:
+        return False
+    _LOGGER.debug("Removed: " + path)
+    return True
+
+
+def remove_in_parallel(paths: list[str], max_workers: int = REMOVE_THREADS) -> int:
+    """Remove files and directories through a pool of threads.
+
+    Removal is bound by file system metadata operations, which network
+    file systems serve with high latency, so many go on at once.
+
+    Args:
+        paths (list[str]): Paths to the files and directories to remove.
+        max_workers (int): Number of paths to remove at a time.
+
+    Returns:
+        int: Number of the paths that existed and were removed.
+    """
+    progress = ProgressReport(len(paths), "Removed", "paths")
+    removed = 0
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="looper-remove"
+    ) as executor:
+        for existed in executor.map(_remove_path, paths):
+            removed += existed
+            progress.update()
+    progress.finish()
+    _LOGGER.info(f"{removed} of {len(paths)} paths existed")
+    return removed
+
+
+def remove_pipestat_records(psm, record_ids: list[str]) -> int:
+    """Remove the records of samples from the results of a pipeline.
+
+    A results file is written once for all the records, rather than once
+    per record; other backends remove the records one by one.
+
+    Args:
+        psm (pipestat.PipestatManager): Manager of the pipeline's results.
+        record_ids (list[str]): Identifiers of the records to remove.
+
+    Returns:
+        int: Number of the records that existed and were removed.
+    """
+    from pipestat.backends.file_backend.filebackend import FileBackend
+    from yacman import write_lock
+
+    backend = psm.backend
+    progress = ProgressReport(
+        len(record_ids), "Removed", f"'{psm.pipeline_name}' records"
+    )
+    if isinstance(backend, FileBackend) and backend._data is not None:
+        records = backend._data[backend.pipeline_name][backend.pipeline_type]
+        removed = 0
+        for record_id in record_ids:
+            if record_id in records:
+                del records[record_id]
+                removed += 1
+        if removed:
+            with write_lock(backend._data) as data:
+                data.write()
+        progress.update(len(record_ids))
+    else:
+        removed = 0
+        for record_id in record_ids:
+            if backend.check_record_exists(record_identifier=record_id):
+                backend.remove_record(record_identifier=record_id, rm_record=True)
+                removed += 1
+            progress.update()
+    progress.finish()
+    return removed
+
+
 def destroy_summary(
     prj: Project, dry_run: bool = False, project_level: bool = False
 ) -> None:
@@ -706,6 +1252,7 @@ def destroy_summary(
     Delete the summary files if not in dry run mode
     This function is for use with pipestat configured projects.
     """
+    from pipestat.reports import get_file_for_table
 
     psms = {}
     if project_level:
@@ -4,8 +4,6 @@ import os
 from collections.abc import Mapping
 from logging import getLogger
 
-import jsonschema
-import pandas as pd
 from eido import read_schema
 from peppy import utils as peputil
 from ubiquerg import expandpath, is_url
@@ -269,6 +267,8 @@ class PipelineInterface(YAMLConfigManager):
             """
             df = None
             if COMPUTE_KEY in piface and SIZE_DEP_VARS_KEY in piface[COMPUTE_KEY]:
+                import pandas as pd
+
                 resources_tsv_path = piface[COMPUTE_KEY][SIZE_DEP_VARS_KEY]
                 if not os.path.isabs(resources_tsv_path):
                     resources_tsv_path = os.path.join(
@@ -423,6 +423,8 @@ class PipelineInterface(YAMLConfigManager):
                 Useful when used with large projects.
             flavor (str): Type of the pipeline schema to use.
         """
+        import jsonschema
+
         schema_source = schema_src.format(flavor)
         for schema in read_schema(schema_source):
             try:
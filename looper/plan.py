@@ -0,0 +1,63 @@
+"""Execution plans, written by `looper run --plan` instead of job scripts.
+
+A plan has one JSON object per line for every sample and pipeline: whether
+the sample would be submitted or skipped and why, the command and resources
+of its job, and the job it would be lumped into. Nothing else is written,
+so plans are cheap to make and easy to diff between runs.
+"""
+
+import json
+import logging
+import sys
+from contextlib import contextmanager
+from typing import TextIO
+
+__all__ = ["ExecutionPlan", "execution_plan"]
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ExecutionPlan:
+    """Stream of plan records, written as JSON Lines.
+
+    Args:
+        stream (TextIO): Text stream to write the records to.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self._stream = stream
+        self.num_records = 0
+
+    def emit(self, record: dict) -> None:
+        """Write a record of the plan.
+
+        Args:
+            record (dict): Record to write; values that aren't JSON types are
+                written as strings.
+        """
+        self._stream.write(json.dumps(record, default=str) + "\n")
+        self.num_records += 1
+
+
+@contextmanager
+def execution_plan(path: str | None):
+    """Open an execution plan for the duration of the block.
+
+    Args:
+        path (str | None): File to write the plan to; '-' for stdout.
+
+    Yields:
+        ExecutionPlan | None: The plan, or None if no path is given.
+    """
+    if not path:
+        yield None
+        return
+    if path == "-":
+        plan = ExecutionPlan(sys.stdout)
+        yield plan
+        sys.stdout.flush()
+    else:
+        with open(path, "w") as f:
+            plan = ExecutionPlan(f)
+            yield plan
+    _LOGGER.info(f"Execution plan ({plan.num_records} records): {path}")
@@ -1,15 +1,30 @@
+import json
 import logging
 import os
+from collections.abc import Iterator
+
+import yaml
+from ubiquerg import expandpath
 
 from .conductor import _get_yaml_path
 from .const import (
+    JOB_NAME_KEY,
     SAMPLE_CWL_YAML_PATH_KEY,
+    SAMPLE_JSONL_PATH_KEY,
     SAMPLE_YAML_PATH_KEY,
     SAMPLE_YAML_PRJ_PATH_KEY,
+    VAR_TEMPL_KEY,
 )
+from .utils import jinja_render_template_strictly, write_if_changed
+from .writer import background_writer
 
 _LOGGER = logging.getLogger(__name__)
 
+# libyaml's emitter, if PyYAML was built with it
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+# Compiled custom templates by path, with the mtime and size they were read at
+_TEMPLATE_CACHE = {}
+
 
 def write_sample_yaml_prj(namespaces: dict) -> dict:
     """Plugin: saves sample representation with project reference to YAML.
@@ -38,14 +53,58 @@ def write_custom_template(namespaces: dict) -> dict | None:
     Plugin: Populates a user-provided jinja template
 
     Parameterize by providing pipeline.var_templates.custom_template
+
+    The template is compiled once and reused until its file changes. The
+    output is replaced atomically and left untouched if its content is
+    the same.
+    """
+    tpl = _custom_template(namespaces)
+    if tpl is None:
+        return None
+    for pth, content in _rendered(tpl, [namespaces]):
+        background_writer().submit(pth, write_if_changed, pth, content)
+    return {"sample": namespaces["sample"]}
+
+
+def write_custom_template_batch(pooled: list[dict]) -> list[dict] | None:
+    """Batch plugin: populates a user-provided jinja template for every pooled sample.
+
+    Batch counterpart of `write_custom_template`, rendering the whole pool
+    in one pass.
+
+    Args:
+        pooled (list[dict]): Variable namespaces dict of each pooled sample.
+
+    Returns:
+        list[dict] | None: Sample namespace dict of each pooled sample.
     """
+    tpl = _custom_template(pooled[0]) if pooled else None
+    if tpl is None:
+        return None
+    writer = background_writer()
+    for pth, content in _rendered(tpl, pooled):
+        writer.submit(pth, write_if_changed, pth, content)
+    return [{"sample": namespaces["sample"]} for namespaces in pooled]
 
-    def load_template(pipeline):
-        with open(namespaces["pipeline"]["var_templates"]["custom_template"], "r") as f:
-            x = f.read()
-        t = jinja2.Template(x)
-        return t
 
+def _rendered(tpl, pooled: list[dict]) -> Iterator[tuple[str, str]]:
+    """Render the template for each sample; yields the path and content."""
+    for namespaces in pooled:
+        pth = _get_yaml_path(namespaces, "custom_template_output", "config")
+        namespaces["sample"]["custom_template_output"] = pth
+        yield pth, tpl.render(namespaces)
+
+
+def _custom_template(namespaces: dict):
+    """Get the compiled custom template of the pipeline.
+
+    Args:
+        namespaces (dict): Variable namespaces dict.
+
+    Returns:
+        jinja2.Template | None: The template, or None if the pipeline
+            doesn't define one.
+    """
     err_msg = (
         "Custom template plugin requires a template in var_templates.custom_template"
     )
@@ -57,17 +116,32 @@ def write_custom_template(namespaces: dict) -> dict | None:
         _LOGGER.error(err_msg)
         return None
 
-    import jinja2
+    return _load_template(namespaces["pipeline"]["var_templates"]["custom_template"])
 
-    tpl = load_template(namespaces["pipeline"])
-    content = tpl.render(namespaces)
-    pth = _get_yaml_path(namespaces, "custom_template_output", "config")
-    namespaces["sample"]["custom_template_output"] = pth
-    with open(pth, "wb") as fh:
-        # print(content)
-        fh.write(content.encode())
 
-    return {"sample": namespaces["sample"]}
+def _load_template(path: str):
+    """Compile a jinja template file, or get it from the cache.
+
+    A cached template is used as long as the modification time and size of
+    its file are unchanged.
+
+    Args:
+        path (str): Path to the template file.
+
+    Returns:
+        jinja2.Template: The compiled template.
+    """
+    import jinja2
+
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _TEMPLATE_CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with open(path, "r") as f:
+        tpl = jinja2.Template(f.read())
+    _TEMPLATE_CACHE[path] = (key, tpl)
+    return tpl
 
 
 def write_sample_yaml_cwl(namespaces: dict) -> dict:
@@ -87,65 +161,78 @@ def write_sample_yaml_cwl(namespaces: dict) -> dict:
     Returns:
         dict: Updated variable namespaces dict.
     """
+    sample = _to_cwl(namespaces, _cwl_attributes(namespaces))
+    _LOGGER.info("Writing sample yaml to {}".format(sample.sample_yaml_cwl))
+    sample.to_yaml(sample.sample_yaml_cwl)
+    return {"sample": sample}
+
+
+def _cwl_attributes(namespaces: dict) -> tuple[list, list] | None:
+    """Get the file and directory attributes of the samples from the input schema.
+
+    Args:
+        namespaces (dict): Variable namespaces dict.
+
+    Returns:
+        tuple[list, list] | None: Names of the file and of the directory
+            attributes, or None if the pipeline defines no input schema.
+    """
     from eido import read_schema
     from ubiquerg import is_url
 
-    def _get_schema_source(
-        schema_source, piface_dir=namespaces["looper"]["piface_dir"]
-    ):
-        # Stolen from piface object; should be a better way to do this...
-        if is_url(schema_source):
-            return schema_source
-        elif not os.path.isabs(schema_source):
-            schema_source = os.path.join(piface_dir, schema_source)
-        return schema_source
+    if "input_schema" not in namespaces["pipeline"]:
+        return None
+    # Stolen from piface object; should be a better way to do this...
+    schema_path = namespaces["pipeline"]["input_schema"]
+    if not is_url(schema_path) and not os.path.isabs(schema_path):
+        schema_path = os.path.join(namespaces["looper"]["piface_dir"], schema_path)
+    file_list = []
+    directory_list = []
+    for ischema in read_schema(schema_path):
+        items = ischema["properties"]["samples"]["items"]
+        file_list.extend(items.get("files", []))
+        directory_list.extend(items.get("directories", []))
+    return file_list, directory_list
+
+
+def _to_cwl(namespaces: dict, attributes: tuple[list, list] | None):
+    """Convert the file and directory attributes of the sample to CWL objects.
+
+    Args:
+        namespaces (dict): Variable namespaces dict.
+        attributes (tuple[list, list] | None): Names of the file and of the
+            directory attributes, as returned by `_cwl_attributes`.
 
+    Returns:
+        peppy.Sample: The sample, with its 'sample_yaml_cwl' path set.
+    """
     # To be compatible as a CWL job input, we need to handle the
     # File and Directory object types directly.
     sample = namespaces["sample"]
     sample.sample_yaml_cwl = _get_yaml_path(
         namespaces, SAMPLE_CWL_YAML_PATH_KEY, "_sample_cwl"
     )
-
-    if "input_schema" in namespaces["pipeline"]:
-        schema_path = _get_schema_source(namespaces["pipeline"]["input_schema"])
-        file_list = []
-        for ischema in read_schema(schema_path):
-            if "files" in ischema["properties"]["samples"]["items"]:
-                file_list.extend(ischema["properties"]["samples"]["items"]["files"])
-
-        for file_attr in file_list:
-            _LOGGER.debug("CWL-ing file attribute: {}".format(file_attr))
-            file_attr_value = sample[file_attr]
-            # file paths are assumed relative to the sample table;
-            # but CWL assumes they are relative to the yaml output file,
-            # so we convert here.
-            file_attr_rel = os.path.relpath(
-                file_attr_value, os.path.dirname(sample.sample_yaml_cwl)
-            )
-            sample[file_attr] = {"class": "File", "path": file_attr_rel}
-
-        directory_list = []
-        for ischema in read_schema(schema_path):
-            if "directories" in ischema["properties"]["samples"]["items"]:
-                directory_list.extend(
-                    ischema["properties"]["samples"]["items"]["directories"]
-                )
-
-        for dir_attr in directory_list:
-            _LOGGER.debug("CWL-ing directory attribute: {}".format(dir_attr))
-            dir_attr_value = sample[dir_attr]
-            # file paths are assumed relative to the sample table;
-            # but CWL assumes they are relative to the yaml output file,
-            # so we convert here.
-            sample[dir_attr] = {"class": "Directory", "location": dir_attr_value}
-    else:
+    if attributes is None:
         _LOGGER.warning(
             "No 'input_schema' defined, producing a regular sample YAML representation"
         )
-    _LOGGER.info("Writing sample yaml to {}".format(sample.sample_yaml_cwl))
-    sample.to_yaml(sample.sample_yaml_cwl)
-    return {"sample": sample}
+        return sample
+    file_list, directory_list = attributes
+    for file_attr in file_list:
+        _LOGGER.debug("CWL-ing file attribute: {}".format(file_attr))
+        file_attr_value = sample[file_attr]
+        # file paths are assumed relative to the sample table;
+        # but CWL assumes they are relative to the yaml output file,
+        # so we convert here.
+        file_attr_rel = os.path.relpath(
+            file_attr_value, os.path.dirname(sample.sample_yaml_cwl)
+        )
+        sample[file_attr] = {"class": "File", "path": file_attr_rel}
+    for dir_attr in directory_list:
+        _LOGGER.debug("CWL-ing directory attribute: {}".format(dir_attr))
+        dir_attr_value = sample[dir_attr]
+        sample[dir_attr] = {"class": "Directory", "location": dir_attr_value}
+    return sample
 
 
 def write_sample_yaml(namespaces: dict) -> dict:
@@ -168,3 +255,160 @@ def write_sample_yaml(namespaces: dict) -> dict:
     )
     sample.to_yaml(sample["sample_yaml_path"], add_prj_ref=False)
     return {"sample": sample}
+
+
+def write_sample_yaml_batch(pooled: list[dict]) -> list[dict]:
+    """Batch plugin: saves the representation of every pooled sample to YAML.
+
+    Batch counterpart of `write_sample_yaml`, to be listed under
+    'pre_submit.batch_python_functions'.
+
+    Args:
+        pooled (list[dict]): Variable namespaces dict of each pooled sample.
+
+    Returns:
+        list[dict]: Sample namespace dict of each pooled sample.
+    """
+    jobs = []
+    for namespaces in pooled:
+        sample = namespaces["sample"]
+        sample["sample_yaml_path"] = _get_yaml_path(
+            namespaces, SAMPLE_YAML_PATH_KEY, "_sample"
+        )
+        jobs.append((sample.to_dict(add_prj_ref=False), sample["sample_yaml_path"]))
+    _write_yamls(jobs)
+    return [{"sample": namespaces["sample"]} for namespaces in pooled]
+
+
+def write_sample_yaml_prj_batch(pooled: list[dict]) -> list[dict]:
+    """Batch plugin: saves every pooled sample with a project reference to YAML.
+
+    Batch counterpart of `write_sample_yaml_prj`; the project reference is
+    serialized once for the whole pool.
+
+    Args:
+        pooled (list[dict]): Variable namespaces dict of each pooled sample.
+
+    Returns:
+        list[dict]: Sample namespace dict of each pooled sample.
+    """
+    from peppy.utils import grab_project_data
+
+    prj_data = None
+    jobs = []
+    for namespaces in pooled:
+        sample = namespaces["sample"]
+        if prj_data is None:
+            prj_data = grab_project_data(sample["_project"])
+        serial = sample.to_dict(add_prj_ref=False)
+        serial["prj"] = prj_data
+        path = _get_yaml_path(namespaces, SAMPLE_YAML_PRJ_PATH_KEY, "_sample_prj")
+        jobs.append((serial, path))
+    _write_yamls(jobs)
+    return [{"sample": namespaces["sample"]} for namespaces in pooled]
+
+
+def write_sample_yaml_cwl_batch(pooled: list[dict]) -> list[dict]:
+    """Batch plugin: produces a cwl-compatible yaml of every pooled sample.
+
+    Batch counterpart of `write_sample_yaml_cwl`; the input schema is read
+    once for the whole pool.
+
+    Args:
+        pooled (list[dict]): Variable namespaces dict of each pooled sample.
+
+    Returns:
+        list[dict]: Sample namespace dict of each pooled sample.
+    """
+    attributes = _cwl_attributes(pooled[0]) if pooled else None
+    jobs = []
+    for namespaces in pooled:
+        sample = _to_cwl(namespaces, attributes)
+        jobs.append((sample.to_dict(), sample.sample_yaml_cwl))
+    _write_yamls(jobs)
+    return [{"sample": namespaces["sample"]} for namespaces in pooled]
+
+
+def write_sample_jsonl(pooled: list[dict]) -> list[dict]:
+    """Batch plugin: saves all pooled samples to a single JSON Lines file.
+
+    One file per job replaces a file per sample. Next to it an index,
+    '<file>.idx', maps each sample name to the offset and length of its line,
+    so that `read_sample_jsonl` reads a single sample without parsing the
+    others. Each sample gets the 'sample_jsonl_path' and
+    'sample_jsonl_offset' attributes.
+
+    This plugin can be parametrized by providing the path value/template in
+    'pipeline.var_templates.sample_jsonl_path'; by default the file is
+    written to the submission folder, named after the job.
+
+    Args:
+        pooled (list[dict]): Variable namespaces dict of each pooled sample.
+
+    Returns:
+        list[dict]: Sample namespace dict of each pooled sample.
+    """
+    if not pooled:
+        return []
+    first = pooled[0]
+    templates = first["pipeline"].get(VAR_TEMPL_KEY) or {}
+    if SAMPLE_JSONL_PATH_KEY in templates:
+        path = expandpath(
+            jinja_render_template_strictly(templates[SAMPLE_JSONL_PATH_KEY], first)
+        )
+    else:
+        # next to the job's log, which follows the submission folder layout
+        path = os.path.join(
+            os.path.dirname(first["looper"]["log_file"]),
+            f"{first['looper'][JOB_NAME_KEY]}_samples.jsonl",
+        )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    index = {}
+    lines = []
+    offset = 0
+    for namespaces in pooled:
+        sample = namespaces["sample"]
+        line = json.dumps(sample.to_dict(), default=str) + "\n"
+        index[sample.sample_name] = [offset, len(line.encode())]
+        sample[SAMPLE_JSONL_PATH_KEY] = path
+        sample["sample_jsonl_offset"] = offset
+        lines.append(line)
+        offset += index[sample.sample_name][1]
+    writer = background_writer()
+    writer.submit(path, write_if_changed, path, "".join(lines))
+    writer.submit(path + ".idx", write_if_changed, path + ".idx", json.dumps(index))
+    _LOGGER.info(f"Writing {len(lines)} samples to {path}")
+    return [{"sample": namespaces["sample"]} for namespaces in pooled]
+
+
+def read_sample_jsonl(path: str, sample_name: str) -> dict:
+    """Read one sample from a file written by `write_sample_jsonl`.
+
+    Args:
+        path (str): Path to the JSON Lines file.
+        sample_name (str): Name of the sample to read.
+
+    Returns:
+        dict: Attributes of the sample.
+
+    Raises:
+        KeyError: If the file holds no such sample.
+    """
+    with open(path + ".idx") as f:
+        offset, length = json.load(f)[sample_name]
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return json.loads(f.read(length))
+
+
+def _write_yamls(jobs: list[tuple[dict, str]]) -> None:
+    """Serialize data to YAML and queue the writes to the background writer.
+
+    Args:
+        jobs (list[tuple[dict, str]]): Data to write and path to write it to.
+    """
+    writer = background_writer()
+    for data, path in jobs:
+        # serialized right away, while the data can't change under the writer
+        content = yaml.dump(data, Dumper=_YAML_DUMPER, default_flow_style=False)
+        writer.submit(path, write_if_changed, path, content)
@@ -0,0 +1,176 @@
+"""Timing of the phases of looper's work, reported with `--profile`.
+
+Code marks a phase with `with phase("name"):`. Unless a profiling session is
+active, `phase` returns a shared no-op context manager, so the marks can stay
+in hot paths.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from math import ceil
+
+__all__ = ["Profiler", "phase", "profiling"]
+
+_LOGGER = logging.getLogger(__name__)
+
+_NO_PHASE = nullcontext()
+
+# The profiler of the active session, if any
+_profiler = None
+
+
+class _Phase:
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler, name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter_ns()
+
+    def __exit__(self, *exc) -> bool:
+        self._profiler.events.append(
+            (
+                self._name,
+                self._start,
+                time.perf_counter_ns() - self._start,
+                threading.get_ident(),
+            )
+        )
+        return False
+
+
+def phase(name: str):
+    """Time a phase of looper's work, if profiling is on.
+
+    Args:
+        name (str): Name of the phase; time is totalled by name.
+
+    Returns:
+        A context manager that times its block.
+    """
+    if _profiler is None:
+        return _NO_PHASE
+    return _Phase(_profiler, name)
+
+
+class Profiler:
+    """Collection of timed phases.
+
+    Every phase is recorded as a `(name, start, duration, thread id)` tuple,
+    with times in nanoseconds of `time.perf_counter_ns`.
+    """
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter_ns()
+        self.end = None
+        self.events = []
+
+    @property
+    def wall_time(self) -> int:
+        """Nanoseconds from the start of the session until its end, or now."""
+        return (self.end or time.perf_counter_ns()) - self.start
+
+    def summary(self) -> list[dict]:
+        """Statistics of the phases, the phase with most time first.
+
+        Returns:
+            list[dict]: Name, count and total, mean, median, 95th percentile
+                and maximum duration in seconds of each phase.
+        """
+        durations = {}
+        for name, _, duration, _ in self.events:
+            durations.setdefault(name, []).append(duration)
+        rows = []
+        for name, values in durations.items():
+            values.sort()
+            total = sum(values)
+            rows.append(
+                {
+                    "phase": name,
+                    "count": len(values),
+                    "total": total / 1e9,
+                    "mean": total / len(values) / 1e9,
+                    "p50": _percentile(values, 0.5) / 1e9,
+                    "p95": _percentile(values, 0.95) / 1e9,
+                    "max": values[-1] / 1e9,
+                }
+            )
+        return sorted(rows, key=lambda r: r["total"], reverse=True)
+
+    def format_summary(self) -> str:
+        """Render the summary as a text table."""
+        wall = self.wall_time / 1e9
+        lines = [
+            f"Profile, {wall:.3f} s wall time:",
+            f"{'phase':<24}{'count':>8}{'total s':>10}{'mean ms':>10}"
+            f"{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'% wall':>8}",
+        ]
+        for r in self.summary():
+            lines.append(
+                f"{r['phase']:<24}{r['count']:>8}{r['total']:>10.3f}"
+                f"{r['mean'] * 1e3:>10.2f}{r['p50'] * 1e3:>10.2f}"
+                f"{r['p95'] * 1e3:>10.2f}{r['max'] * 1e3:>10.2f}"
+                f"{100 * r['total'] / wall if wall else 0:>8.1f}"
+            )
+        return "\n".join(lines)
+
+    def write_trace(self, path: str) -> None:
+        """Write the phases as a Chrome trace event file.
+
+        The file can be opened in chrome://tracing or https://ui.perfetto.dev.
+
+        Args:
+            path (str): Path to the JSON file to write.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self.start) / 1e3,
+                "dur": duration / 1e3,
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, start, duration, tid in self.events
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def _percentile(values: list[int], q: float) -> int:
+    """Nearest-rank percentile of sorted values."""
+    return values[max(ceil(q * len(values)) - 1, 0)]
+
+
+@contextmanager
+def profiling(trace_path: str | None = None):
+    """Profile the phases run within the block and report them at its end.
+
+    Args:
+        trace_path (str | None): Path to write a Chrome trace event file to.
+
+    Yields:
+        Profiler: The profiler of this session.
+    """
+    global _profiler
+    profiler = _profiler = Profiler()
+    try:
+        yield profiler
+    finally:
+        _profiler = None
+        profiler.end = time.perf_counter_ns()
+        _LOGGER.info(profiler.format_summary())
+        if trace_path:
+            try:
+                profiler.write_trace(trace_path)
+            except OSError as e:
+                _LOGGER.warning(f"Could not write profile trace to {trace_path}: {e}")
+            else:
+                _LOGGER.info(f"Profile trace written: {trace_path}")
@@ -1,6 +1,9 @@
 """Looper version of NGS project model."""
 
+import math
 import os
+import weakref
+from collections.abc import Iterator, Sequence
 from typing import NoReturn
 
 from yaml import safe_load
@@ -11,11 +14,19 @@ except ImportError:
     # cached_property was introduced in python 3.8
     cached_property = property
 
+import numpy as np
+import pandas as pd
 from eido import read_schema
 from jsonschema import ValidationError
 from pandas.core.common import flatten
 from peppy import Project as peppyProject
-from peppy.const import CONFIG_KEY
+from peppy import Sample
+from peppy.const import (
+    CFG_SAMPLE_TABLE_KEY,
+    CFG_SUBSAMPLE_TABLE_KEY,
+    CONFIG_KEY,
+    SAMPLE_DF_KEY,
+)
 from peppy.utils import make_abs_via_cfg
 from pipestat import PipestatManager
 
@@ -39,10 +50,12 @@ from .const import (
     SUBMISSION_SUBDIR_KEY,
     PipelineLevel,
 )
+from .db_pool import share_engine
 from .divvy import ComputingConfiguration
 from .exceptions import MisconfigurationException, PipelineInterfaceConfigError
 from .pipeline_interface import PipelineInterface
 from .processed_project import populate_project_paths, populate_sample_paths
+from .profiling import phase
 from .utils import (
     expandpath,
     fetch_sample_flags,
@@ -67,6 +80,7 @@ class ProjectContext(object):
         selector_exclude: list | str | None = None,
         selector_flag: list | str | None = None,
         exclusion_flag: list | str | None = None,
+        selector_expression: str | None = None,
     ) -> None:
         """Project and what to include/exclude defines the context."""
         if not isinstance(selector_attribute, str):
@@ -81,6 +95,7 @@ class ProjectContext(object):
         self.attribute = selector_attribute
         self.selector_flag = selector_flag
         self.exclusion_flag = exclusion_flag
+        self.expression = selector_expression
 
     def __getattr__(self, item):
         """Samples are context-specific; other requests are handled
@@ -93,6 +108,17 @@ class ProjectContext(object):
                 selector_exclude=self.exclude,
                 selector_flag=self.selector_flag,
                 exclusion_flag=self.exclusion_flag,
+                selector_expression=self.expression,
+            )
+        if item == "sample_positions":
+            return fetch_sample_positions(
+                prj=self.prj,
+                selector_attribute=self.attribute,
+                selector_include=self.include,
+                selector_exclude=self.exclude,
+                selector_flag=self.selector_flag,
+                exclusion_flag=self.exclusion_flag,
+                selector_expression=self.expression,
             )
         if item in ["prj", "include", "exclude"]:
             # Attributes requests that this context/wrapper handles
@@ -130,6 +156,8 @@ class Project(peppyProject):
         amendments (Iterable[str]): Name indicating amendment to use, optional.
         divcfg_path (str): Path to an environment configuration YAML file
             specifying compute settings.
+        defer_samples (bool): Whether to leave the samples out, to be created
+            a chunk at a time with `iter_sample_chunks`.
     """
 
     def __init__(
@@ -137,9 +165,13 @@ class Project(peppyProject):
         cfg: str | None = None,
         amendments=None,
         divcfg_path: str | None = None,
+        defer_samples: bool = False,
         **kwargs,
     ) -> None:
-        super(Project, self).__init__(cfg=cfg, amendments=amendments)
+        super(Project, self).__init__(
+            cfg=cfg, amendments=amendments, defer_samples_creation=defer_samples
+        )
+        self._sample_pifaces_by_source = {}
         prj_dict = kwargs.get("project_dict")
         pep_config = kwargs.get("pep_config", None)
         if pep_config:
@@ -169,7 +201,10 @@ class Project(peppyProject):
                 # setattr(self[EXTRA_KEY], attr_name, kwargs[attr_name])
         self._samples_by_interface = self._samples_by_piface(self.piface_key)
         self._interfaces_by_sample = self._piface_by_samples()
-        self.linked_sample_interfaces = self._get_linked_pifaces()
+        # links can only be checked against the samples of the whole project
+        self.linked_sample_interfaces = (
+            {} if defer_samples else self._get_linked_pifaces()
+        )
         if FILE_CHECKS_KEY in self[EXTRA_KEY]:
             setattr(self, "file_checks", not self[EXTRA_KEY][FILE_CHECKS_KEY])
         if DRY_RUN_KEY in self[EXTRA_KEY]:
@@ -335,10 +370,11 @@ class Project(peppyProject):
         Returns:
             list[looper.PipelineInterface]: List of pipeline interfaces.
         """
-        return [
-            PipelineInterface(pi, pipeline_type=PipelineLevel.PROJECT.value)
-            for pi in self.project_pipeline_interface_sources
-        ]
+        with phase("piface.parse"):
+            return [
+                PipelineInterface(pi, pipeline_type=PipelineLevel.PROJECT.value)
+                for pi in self.project_pipeline_interface_sources
+            ]
 
     @cached_property
     def pipeline_interfaces(self) -> list:
@@ -448,31 +484,11 @@ class Project(peppyProject):
 
         if pipeline_type == PipelineLevel.SAMPLE.value:
             for piface in self.pipeline_interfaces:
-                pipestat_config_path = self._check_for_existing_pipestat_config(piface)
-
-                if not pipestat_config_path:
-                    self._create_pipestat_config(piface, pipeline_type)
-                else:
-                    piface.psm = PipestatManager.from_config(
-                        config=pipestat_config_path,
-                        multi_pipelines=True,
-                        pipeline_type="sample",
-                    )
+                self._configure_piface_pipestat(piface, pipeline_type)
 
         elif pipeline_type == PipelineLevel.PROJECT.value:
             for prj_piface in self.project_pipeline_interfaces:
-                pipestat_config_path = self._check_for_existing_pipestat_config(
-                    prj_piface
-                )
-
-                if not pipestat_config_path:
-                    self._create_pipestat_config(prj_piface, pipeline_type)
-                else:
-                    prj_piface.psm = PipestatManager.from_config(
-                        config=pipestat_config_path,
-                        multi_pipelines=True,
-                        pipeline_type="project",
-                    )
+                self._configure_piface_pipestat(prj_piface, pipeline_type)
         else:
             _LOGGER.error(
                 msg="No pipeline type specified during pipestat configuration"
@@ -480,6 +496,27 @@ class Project(peppyProject):
 
         return True
 
+    def _configure_piface_pipestat(self, piface, pipeline_type: str) -> None:
+        """Set up the pipestat manager of a pipeline interface.
+
+        Args:
+            piface (looper.PipelineInterface): Pipeline interface to configure.
+            pipeline_type (str): Type of the pipeline, sample or project.
+        """
+        with phase("pipestat.setup"):
+            pipestat_config_path = self._check_for_existing_pipestat_config(piface)
+
+            if not pipestat_config_path:
+                self._create_pipestat_config(piface, pipeline_type)
+            else:
+                piface.psm = PipestatManager.from_config(
+                    config=pipestat_config_path,
+                    multi_pipelines=True,
+                    pipeline_type=pipeline_type,
+                )
+            # pipelines reporting to the same database share its connections
+            share_engine(piface.psm)
+
     def _check_for_existing_pipestat_config(self, piface) -> str | None:
         """
 
@@ -672,6 +709,118 @@ class Project(peppyProject):
             )
         return linked_pifaces
 
+    @property
+    def sample_table_sources(self) -> list[str]:
+        """Paths to the sample and subsample table files of this project.
+
+        Returns:
+            list[str]: Absolute paths to the table files; empty if the
+                project was not created from table files.
+        """
+        if CONFIG_KEY not in self:
+            return []
+        sources = []
+        for key in [CFG_SAMPLE_TABLE_KEY, CFG_SUBSAMPLE_TABLE_KEY]:
+            paths = self[CONFIG_KEY].get(key) or []
+            sources.extend([paths] if isinstance(paths, str) else paths)
+        return sources
+
+    def compact_samples(self) -> None:
+        """Keep the samples as a table, creating Sample objects only on access.
+
+        Meant for commands that read just a few attributes of the samples.
+        A Sample is created when it's accessed and freed once it is no longer
+        referenced; modifications to it are not kept after that.
+        """
+        if not isinstance(self._samples, CompactSamples) and self._samples:
+            self._samples = CompactSamples(self, self.sample_table)
+
+    def reload_samples(self) -> None:
+        """Re-read the sample table(s) and refresh sample-related state.
+
+        Sample modifiers are applied again and the mappings between samples
+        and pipeline interfaces are rebuilt. Pipeline interfaces already
+        loaded by this Project are reused.
+
+        Raises:
+            MisconfigurationException: If the project was not created from
+                a file-based sample table.
+        """
+        if not self.config_file or not self.sample_table_sources:
+            raise MisconfigurationException(
+                "Samples can only be reloaded for projects with a sample table file"
+            )
+        self._read_sample_data()
+        self.create_samples(modify=True)
+        self._sample_table = self._get_table_from_samples(
+            index=self.st_index, initial=True
+        )
+        self._samples_by_interface = self._samples_by_piface(self.piface_key)
+        self._interfaces_by_sample = self._piface_by_samples()
+        for cached in ["pipeline_interfaces", "pipeline_interface_sources"]:
+            self.__dict__.pop(cached, None)
+
+    def iter_sample_chunks(self, chunk_size: int) -> Iterator[list]:
+        """Create the samples a chunk at a time, replacing the previous chunk.
+
+        Meant for projects created with `defer_samples`. The sample table is
+        read as a whole, but Sample objects are only created, modified and
+        mapped to pipeline interfaces for one chunk at a time. While a chunk
+        is current, the project behaves as if its samples were just the ones
+        in the chunk. Rows sharing a sample name are kept in the same chunk,
+        so that they're merged as usual.
+
+        Args:
+            chunk_size (int): Number of samples per chunk.
+
+        Yields:
+            list[peppy.Sample]: Samples of the current chunk.
+
+        Raises:
+            MisconfigurationException: If the project was not created from
+                a file-based sample table.
+        """
+        if not self.config_file or not self.sample_table_sources:
+            raise MisconfigurationException(
+                "Samples can only be streamed for projects with a sample table file"
+            )
+        self._read_sample_data()
+        table = self[SAMPLE_DF_KEY]
+        try:
+            for rows in _chunk_rows(table, self.st_index, chunk_size):
+                self[SAMPLE_DF_KEY] = table.iloc[rows]
+                self._samples = [
+                    Sample(r, prj=self) for _, r in self[SAMPLE_DF_KEY].iterrows()
+                ]
+                self.modify_samples()
+                self._sample_table = self._get_table_from_samples(
+                    index=self.st_index, initial=True
+                )
+                self._samples_by_interface = self._samples_by_piface(self.piface_key)
+                self._interfaces_by_sample = self._piface_by_samples()
+                for cached in ["pipeline_interfaces", "pipeline_interface_sources"]:
+                    self.__dict__.pop(cached, None)
+                yield self.samples
+        finally:
+            self[SAMPLE_DF_KEY] = table
+
+    def _get_sample_piface(self, source: str) -> PipelineInterface:
+        """Get a sample pipeline interface object, creating it on first use.
+
+        Args:
+            source (str): Absolute path to the pipeline interface file.
+
+        Returns:
+            looper.PipelineInterface: Pipeline interface object.
+        """
+        try:
+            return self._sample_pifaces_by_source[source]
+        except KeyError:
+            with phase("piface.parse"):
+                pi = PipelineInterface(source, pipeline_type=PipelineLevel.SAMPLE.value)
+            self._sample_pifaces_by_source[source] = pi
+            return pi
+
     def _piface_by_samples(self) -> dict:
         """Create a mapping of all defined interfaces in this Project by samples.
 
@@ -682,7 +831,7 @@ class Project(peppyProject):
         pifaces_by_sample = {}
         for source, sample_names in self._samples_by_interface.items():
             try:
-                pi = PipelineInterface(source, pipeline_type=PipelineLevel.SAMPLE.value)
+                pi = self._get_sample_piface(source)
             except PipelineInterfaceConfigError as e:
                 _LOGGER.debug(f"Skipping pipeline interface creation: {e}")
             else:
@@ -735,9 +884,7 @@ class Project(peppyProject):
                 for source in piface_srcs:
                     source = self._resolve_path_with_cfg(source)
                     try:
-                        PipelineInterface(
-                            source, pipeline_type=PipelineLevel.SAMPLE.value
-                        )
+                        self._get_sample_piface(source)
                     except (
                         ValidationError,
                         IOError,
@@ -771,6 +918,68 @@ class Project(peppyProject):
         self.modify_samples()
 
 
+class CompactSamples(Sequence):
+    """Read-only sequence of a project's samples, backed by the sample table.
+
+    Sample objects are created on access, from the processed attributes in
+    the table, and shared for as long as they are referenced elsewhere.
+
+    Args:
+        prj (Project): Project the samples belong to.
+        table (pandas.DataFrame): Attributes of the samples, one row per
+            sample, in order.
+    """
+
+    def __init__(self, prj, table: pd.DataFrame) -> None:
+        self.prj = prj
+        self.table = table.reset_index(drop=True)
+        self._columns = list(self.table.columns)
+        self._rows = self.table.to_numpy(dtype=object)
+        self._live = weakref.WeakValueDictionary()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(f"Sample index out of range: {i}")
+        sample = self._live.get(i)
+        if sample is None:
+            sample = Sample(
+                {
+                    k: v
+                    for k, v in zip(self._columns, self._rows[i])
+                    if not _is_missing(v)
+                },
+                prj=self.prj,
+            )
+            self._live[i] = sample
+        return sample
+
+
+def _chunk_rows(table: pd.DataFrame, index, chunk_size: int) -> list[np.ndarray]:
+    """Split the rows of a sample table into chunks of whole samples.
+
+    Chunks hold `chunk_size` distinct values of the index column each, in
+    order of their first appearance; without that column, `chunk_size` rows.
+    """
+    if isinstance(index, str) and index in table.columns:
+        chunk_of_row = pd.factorize(table[index])[0] // chunk_size
+    else:
+        chunk_of_row = np.arange(len(table)) // chunk_size
+    order = np.argsort(chunk_of_row, kind="stable")
+    bounds = np.flatnonzero(np.diff(chunk_of_row[order])) + 1
+    return np.split(order, bounds) if len(order) else []
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
 def fetch_samples(
     prj,
     selector_attribute: str | None = None,
@@ -778,6 +987,7 @@ def fetch_samples(
     selector_exclude: list | str | None = None,
     selector_flag: list | str | None = None,
     exclusion_flag: list | str | None = None,
+    selector_expression: str | None = None,
 ) -> list:
     """Collect samples of particular protocol(s).
 
@@ -799,6 +1009,9 @@ def fetch_samples(
             COMPLETED.
         exclusion_flag (Iterable[str] | str): Flag to exclude on, e.g. FAILED,
             COMPLETED.
+        selector_expression (str): Boolean expression over sample attributes
+            that a Sample must satisfy, e.g.
+            "protocol in ['ATAC', 'RNA'] and read_length > 50".
 
     Returns:
         list[Sample]: Collection of this Project's samples with protocol that
@@ -810,27 +1023,42 @@ def fetch_samples(
             specified; TypeError since it's basically providing two arguments
             when only one is accepted, so remain consistent with vanilla Python2;
             also possible if name of attribute for selection isn't a string.
+        MisconfigurationException: If the selector expression can't be
+            evaluated.
     """
+    samples = prj.samples
+    return [
+        samples[i]
+        for i in fetch_sample_positions(
+            prj,
+            selector_attribute=selector_attribute,
+            selector_include=selector_include,
+            selector_exclude=selector_exclude,
+            selector_flag=selector_flag,
+            exclusion_flag=exclusion_flag,
+            selector_expression=selector_expression,
+        )
+    ]
 
-    kept_samples = prj.samples
 
-    if not selector_include and not selector_exclude:
-        # Default case where user does not use selector_include or selector exclude.
-        # Assume that user wants to exclude samples if toggle = 0.
-        # if any([hasattr(s, "toggle") for s in prj.samples]):
-        # if any("toggle" in s for s in prj.samples):
-        if "toggle" in prj.samples[0]:  # assume the samples have the same schema
-            selector_exclude = [0]
+def fetch_sample_positions(
+    prj,
+    selector_attribute: str | None = None,
+    selector_include: list | str | None = None,
+    selector_exclude: list | str | None = None,
+    selector_flag: list | str | None = None,
+    exclusion_flag: list | str | None = None,
+    selector_expression: str | None = None,
+) -> list[int]:
+    """Select samples like `fetch_samples`, by position in the project.
 
-            def keep(s):
-                return (
-                    not hasattr(s, selector_attribute)
-                    or getattr(s, selector_attribute) not in selector_exclude
-                )
+    Attribute selection is evaluated on the project's sample table as a
+    whole rather than sample by sample.
 
-            kept_samples = list(filter(keep, prj.samples))
-        else:
-            kept_samples = prj.samples
+    Returns:
+        list[int]: Positions of the selected samples in `prj.samples`.
+    """
+    samples = prj.samples
 
     # Intersection between selector_include and selector_exclude is
     # nonsense user error.
@@ -846,97 +1074,146 @@ def fetch_samples(
             "({})".format(selector_attribute, type(selector_attribute))
         )
 
-    # At least one of the samples has to have the specified attribute
-    if prj.samples and not any([hasattr(s, selector_attribute) for s in prj.samples]):
-        if selector_attribute == "toggle":
-            # this is the default, so silently pass.
-            pass
-        else:
-            raise AttributeError(
-                "The Project samples do not have the attribute '{attr}'".format(
-                    attr=selector_attribute
-                )
-            )
+    if not samples:
+        return []
 
-    if prj.samples:
-        # Use the attr check here rather than exception block in case the
-        # hypothetical AttributeError would occur; we want such
-        # an exception to arise, not to catch it as if the Sample lacks
-        # "protocol"
-        if not selector_include:
-            # Loose; keep all samples not in the selector_exclude.
-            def keep(s):
-                return not hasattr(s, selector_attribute) or getattr(
-                    s, selector_attribute
-                ) not in make_set(selector_exclude)
+    table = _sample_attribute_table(prj, samples)
+    if selector_attribute in table.columns:
+        column = table[selector_attribute]
+    elif selector_attribute == "toggle":
+        # this is the default, so silently pass.
+        column = None
+    else:
+        # At least one of the samples has to have the specified attribute
+        raise AttributeError(
+            "The Project samples do not have the attribute '{attr}'".format(
+                attr=selector_attribute
+            )
+        )
 
-        else:
+    excluded = None if selector_exclude is None else make_set(selector_exclude)
+    if not selector_include and not selector_exclude and "toggle" in samples[0]:
+        # Default case where user does not use selector_include or selector
+        # exclude. Assume that user wants to exclude samples if toggle = 0.
+        # Assume the samples have the same schema.
+        selector_attribute, column = "toggle", table.get("toggle")
+        excluded = [0, "0"]
+
+    keep = np.ones(len(samples), dtype=bool)
+    if column is not None:
+        if selector_include:
             # Strict; keep only samples in the selector_include.
-            def keep(s):
-                return hasattr(s, selector_attribute) and getattr(
-                    s, selector_attribute
-                ) in make_set(selector_include)
-
-        kept_samples = list(filter(keep, kept_samples))
-
-        if selector_flag and exclusion_flag:
-            raise TypeError("Specify only selector_flag or exclusion_flag not both.")
-
-        flags = selector_flag or exclusion_flag or None
-        if flags:
-            # Collect uppercase flags or error if not str
-            if not isinstance(flags, list):
-                flags = [str(flags)]
-            for flag in flags:
-                if not isinstance(flag, str):
-                    raise TypeError(
-                        f"Supplied flags must be a string! Flag:{flag} {type(flag)}"
-                    )
-                flags.remove(flag)
-                flags.insert(0, flag.upper())
-            # Look for flags
-            # Is pipestat configured? Then, the user may have set the flag folder
-            if prj.pipestat_configured:
-                try:
-                    flag_dir = expandpath(prj[EXTRA_KEY][PIPESTAT_KEY]["flag_file_dir"])
-                    if not os.path.isabs(flag_dir):
-                        flag_dir = os.path.join(
-                            os.path.dirname(prj.output_dir), flag_dir
-                        )
-                except KeyError:
-                    _LOGGER.warning(
-                        "Pipestat is configured but no flag_file_dir supplied, defaulting to output_dir"
-                    )
-                    flag_dir = prj.output_dir
-            else:
-                # if pipestat not configured, check the looper output dir
+            keep &= _isin(column, make_set(selector_include))
+        elif excluded is not None:
+            # Loose; keep all samples not in the selector_exclude. Samples
+            # lacking the attribute have no value in the table, so stay.
+            keep &= ~_isin(column, excluded)
+    elif selector_include:
+        keep[:] = False
+
+    if selector_expression:
+        keep &= _evaluate_selector_expression(table, selector_expression)
+
+    positions = np.flatnonzero(keep).tolist()
+
+    if selector_flag and exclusion_flag:
+        raise TypeError("Specify only selector_flag or exclusion_flag not both.")
+
+    flags = selector_flag or exclusion_flag or None
+    if flags:
+        # Collect uppercase flags or error if not str
+        if not isinstance(flags, list):
+            flags = [str(flags)]
+        for flag in flags:
+            if not isinstance(flag, str):
+                raise TypeError(
+                    f"Supplied flags must be a string! Flag:{flag} {type(flag)}"
+                )
+            flags.remove(flag)
+            flags.insert(0, flag.upper())
+        # Look for flags
+        # Is pipestat configured? Then, the user may have set the flag folder
+        if prj.pipestat_configured:
+            try:
+                flag_dir = expandpath(prj[EXTRA_KEY][PIPESTAT_KEY]["flag_file_dir"])
+                if not os.path.isabs(flag_dir):
+                    flag_dir = os.path.join(os.path.dirname(prj.output_dir), flag_dir)
+            except KeyError:
+                _LOGGER.warning(
+                    "Pipestat is configured but no flag_file_dir supplied, defaulting to output_dir"
+                )
                 flag_dir = prj.output_dir
+        else:
+            # if pipestat not configured, check the looper output dir
+            flag_dir = prj.output_dir
+
+        # Using flag_dir, search for flags. Statuses are kept by position:
+        # compacted samples may be recreated, without them, on next access.
+        statuses = {}
+        for i in positions:
+            sample = samples[i]
+            sample_pifaces = prj.get_sample_piface(sample[prj.sample_table_index])
+            pl_name = sample_pifaces[0].pipeline_name
+            flag_files = fetch_sample_flags(prj, sample, pl_name, flag_dir)
+            status = get_sample_status(sample.sample_name, flag_files)
+            sample.update({"status": status})
+            statuses[i] = status
+
+        flags = make_set(flags)
+        if not selector_flag:
+            # Loose; keep all samples not in the exclusion_flag.
+            positions = [i for i in positions if statuses[i] not in flags]
+        else:
+            # Strict; keep only samples in the selector_flag
+            positions = [i for i in positions if statuses[i] in flags]
 
-            # Using flag_dir, search for flags:
-            for sample in kept_samples:
-                sample_pifaces = prj.get_sample_piface(sample[prj.sample_table_index])
-                pl_name = sample_pifaces[0].pipeline_name
-                flag_files = fetch_sample_flags(prj, sample, pl_name, flag_dir)
-                status = get_sample_status(sample.sample_name, flag_files)
-                sample.update({"status": status})
-
-            if not selector_flag:
-                # Loose; keep all samples not in the exclusion_flag.
-                def keep(s):
-                    return not hasattr(s, "status") or getattr(
-                        s, "status"
-                    ) not in make_set(flags)
+    return positions
 
-            else:
-                # Strict; keep only samples in the selector_flag
-                def keep(s):
-                    return hasattr(s, "status") and getattr(s, "status") in make_set(
-                        flags
-                    )
 
-            kept_samples = list(filter(keep, kept_samples))
+def _sample_attribute_table(prj, samples) -> pd.DataFrame:
+    """Attributes of the samples as a table, one row per sample, in order."""
+    if isinstance(samples, CompactSamples):
+        return samples.table
+    table = getattr(prj, "sample_table", None)
+    if table is None or len(table) != len(samples):
+        table = pd.DataFrame.from_records([s.to_dict() for s in samples])
+    return table.reset_index(drop=True)
+
 
-    return kept_samples
+def _isin(column: pd.Series, values: list) -> np.ndarray:
+    """Whether each value of a column is one of the given values."""
+    try:
+        return column.isin(values).to_numpy()
+    except TypeError:
+        # unhashable cell values, e.g. lists
+        return np.array([v in values for v in column], dtype=bool)
+
+
+def _evaluate_selector_expression(table: pd.DataFrame, expression: str) -> np.ndarray:
+    """Evaluate a boolean expression over the sample attribute table.
+
+    Columns that hold numbers, as read from the sample table, are compared as
+    numbers. Samples that lack an attribute the expression uses are not
+    selected by comparisons on it.
+    """
+    typed = table.copy()
+    for name in typed.columns:
+        try:
+            typed[name] = pd.to_numeric(typed[name])
+        except (TypeError, ValueError):
+            pass
+    try:
+        result = typed.eval(expression, engine="python")
+    except Exception as e:
+        raise MisconfigurationException(
+            f"Invalid sample selection expression '{expression}': {e}"
+        ) from e
+    if not isinstance(result, pd.Series) or len(result) != len(table):
+        raise MisconfigurationException(
+            f"Sample selection expression '{expression}' does not yield a "
+            f"value per sample"
+        )
+    return result.fillna(False).astype(bool).to_numpy()
 
 
 def make_set(items) -> list:
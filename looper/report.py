@@ -0,0 +1,222 @@
+"""Incremental HTML reports, for `looper report`.
+
+The report of a pipeline is built by pipestat's `HTMLReportBuilder`. A
+manifest in the report directory records a digest of each record's results,
+status and sample attributes at the last build, so that later builds skip
+pipelines whose records didn't change and render only the sample pages that
+differ, in a pool of processes. The index, status and object pages and the
+summary tables are rebuilt whenever any record changed.
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from pipestat.backends.file_backend.filebackend import FileBackend
+from pipestat.exceptions import PipestatSummarizeError
+from pipestat.reports import HTMLReportBuilder
+
+from .utils import write_if_changed
+
+__all__ = ["REPORT_MANIFEST", "build_report"]
+
+_LOGGER = logging.getLogger(__name__)
+
+REPORT_MANIFEST = ".looper_report.json"
+# Bump to rebuild the reports made by earlier versions in full
+REPORT_MANIFEST_VERSION = 1
+
+# Builder the worker processes render sample pages with, inherited on fork
+_worker_builder = None
+
+
+def build_report(
+    psm,
+    looper_samples: list | None = None,
+    portable: bool = False,
+    output_dir: str | None = None,
+    jobs: int | None = None,
+) -> str:
+    """Build the HTML report of a pipeline, reusing unchanged pages.
+
+    Portable reports and results kept in a file per record are built in full
+    by `PipestatManager.summarize`.
+
+    Args:
+        psm (pipestat.PipestatManager): Manager of the pipeline's results.
+        looper_samples (list[peppy.Sample] | None): Samples whose attributes
+            to show along with the results.
+        portable (bool): Whether to build a self-contained report archive.
+        output_dir (str | None): Directory to build the report in.
+        jobs (int | None): Number of processes rendering sample pages;
+            defaults to the number of CPUs.
+
+    Returns:
+        str: Path to the index page of the report.
+
+    Raises:
+        PipestatSummarizeError: If there are no results to report.
+    """
+    if portable or psm.cfg.get("multi_result_files") or psm.cfg.get("pephub_path"):
+        return psm.summarize(
+            looper_samples=looper_samples, portable=portable, output_dir=output_dir
+        )
+    if output_dir:
+        psm.cfg["output_dir"] = output_dir
+    psm.check_multi_results()
+    records = psm.backend.select_records(limit=None)["records"]
+    if not records:
+        raise PipestatSummarizeError("No results found at specified backend")
+
+    builder = IncrementalReportBuilder(psm, jobs=jobs)
+    pipeline_name = psm.pipeline_name
+    pipeline_reports = os.path.join(builder.reports_dir, pipeline_name)
+    index_html = os.path.join(pipeline_reports, "index.html")
+    manifest_path = os.path.join(pipeline_reports, REPORT_MANIFEST)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    context = _digest(
+        REPORT_MANIFEST_VERSION,
+        psm.result_schemas,
+        # the columns of the sample attributes are those of the first sample
+        looper_samples[0]._mapped_attr["_attributes"] if looper_samples else None,
+    )
+    attributes = _sample_attributes(looper_samples)
+    digests = {
+        r["record_identifier"]: _digest(
+            r,
+            psm.get_status(record_identifier=r["record_identifier"]),
+            attributes.get(r["record_identifier"]),
+        )
+        for r in records
+    }
+    if (
+        manifest.get("context") == context
+        and manifest.get("records") == digests
+        and os.path.exists(index_html)
+    ):
+        _LOGGER.info(f"Records of '{pipeline_name}' unchanged; report up to date")
+        return index_html
+
+    builder.record_digests = digests
+    builder.previous_pages = (
+        manifest.get("pages", {}) if manifest.get("context") == context else {}
+    )
+    report_path = builder(pipeline_name=pipeline_name, looper_samples=looper_samples)
+    write_if_changed(
+        manifest_path,
+        json.dumps(
+            {"context": context, "records": digests, "pages": builder.pages},
+            indent=1,
+            sort_keys=True,
+        ),
+    )
+    return report_path
+
+
+class IncrementalReportBuilder(HTMLReportBuilder):
+    """Report builder that renders only the sample pages that changed.
+
+    Pages are rendered after all of them are known, in a pool of processes
+    if the results are kept in a file; database connections don't survive
+    a fork, so other backends render them one by one.
+
+    Args:
+        prj (pipestat.PipestatManager): Manager of the pipeline's results.
+        jobs (int | None): Number of processes rendering sample pages;
+            defaults to the number of CPUs.
+    """
+
+    def __init__(self, prj, jobs: int | None = None) -> None:
+        super().__init__(prj)
+        self.jobs = jobs or os.cpu_count() or 1
+        # record -> digest of its results, status and sample attributes
+        self.record_digests = {}
+        # record -> digest of its page, at the last build and at this one
+        self.previous_pages = {}
+        self.pages = {}
+        self._pending = []
+
+    def create_sample_html(self, sample_stats, navbar, footer, sample_name):
+        """Queue the page of a sample, unless it's up to date.
+
+        Returns:
+            str: Path to the page, written by `create_index_html`.
+        """
+        html_page = os.path.join(
+            self.pipeline_reports, f"{sample_name}.html".replace(" ", "_").lower()
+        )
+        page = _digest(
+            navbar, footer, sample_stats, self.record_digests.get(sample_name)
+        )
+        self.pages[sample_name] = page
+        if self.previous_pages.get(sample_name) != page or not os.path.exists(
+            html_page
+        ):
+            self._pending.append((sample_stats, navbar, footer, sample_name))
+        return html_page
+
+    def create_index_html(self, navbar, footer):
+        """Build the index and summary pages, then the queued sample pages."""
+        super().create_index_html(navbar, footer)
+        pending, self._pending = self._pending, []
+        _LOGGER.info(
+            f" * Rendering {len(pending)} of {len(self.pages)} sample pages; "
+            f"{len(self.pages) - len(pending)} unchanged"
+        )
+        self._render(pending)
+
+    def _render(self, pending: list) -> None:
+        global _worker_builder
+
+        jobs = min(self.jobs, len(pending))
+        if (
+            jobs < 2
+            or not isinstance(self.prj.backend, FileBackend)
+            or "fork" not in multiprocessing.get_all_start_methods()
+        ):
+            for args in pending:
+                HTMLReportBuilder.create_sample_html(self, *args)
+            return
+        _worker_builder = self
+        try:
+            with ProcessPoolExecutor(
+                max_workers=jobs, mp_context=multiprocessing.get_context("fork")
+            ) as executor:
+                list(
+                    executor.map(
+                        _render_sample_page,
+                        pending,
+                        chunksize=max(1, len(pending) // (jobs * 4)),
+                    )
+                )
+        finally:
+            _worker_builder = None
+
+
+def _render_sample_page(args: tuple) -> str:
+    return HTMLReportBuilder.create_sample_html(_worker_builder, *args)
+
+
+def _sample_attributes(looper_samples: list | None) -> dict[str, dict]:
+    """Attributes of the samples shown in the report, by sample name."""
+    attributes = {}
+    for sample in looper_samples or []:
+        mapped = sample._mapped_attr
+        attributes[mapped["sample_name"]] = {
+            a: mapped[a] for a in mapped["_attributes"]
+        }
+    return attributes
+
+
+def _digest(*values) -> str:
+    return hashlib.sha1(
+        json.dumps(values, sort_keys=True, default=str).encode()
+    ).hexdigest()
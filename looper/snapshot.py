@@ -0,0 +1,178 @@
+"""Snapshots of fully processed projects, reused across looper invocations.
+
+Building a `looper.Project` parses the PEP and its tables, applies the sample
+modifiers and resolves the pipeline interfaces of every sample, which takes
+long for large sample tables. A snapshot stores the result in the output
+directory; a later invocation with the same arguments loads it instead, as
+long as the content of every file the project was built from is unchanged.
+
+A snapshot file holds two pickles: a header with the content hashes of the
+source files, checked first, and the project itself. Unpickling can run
+arbitrary code and output directories are often shared, so snapshots are
+only loaded if they and their directory belong to the current user and no
+one else can write to them.
+"""
+
+import copyreg
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+
+from peppy import Sample
+
+from . import __version__
+from .pipeline_interface import PipelineInterface
+from .project import Project
+from .utils import getLogger
+
+__all__ = ["SNAPSHOT_DIRNAME", "load_snapshot", "save_snapshot", "snapshot_path"]
+
+_LOGGER = getLogger(__name__)
+
+SNAPSHOT_DIRNAME = ".looper_cache"
+
+# State that is either rebuilt for every command or can't be pickled
+_TRANSIENT_STATE = {
+    Project: {
+        "dcc",
+        "pipeline_interface_sources",
+        "pipestat_configured",
+        "pipestat_configured_project",
+    },
+    Sample: set(),
+    PipelineInterface: {"psm"},
+}
+
+
+def _set_state(obj, state: dict) -> None:
+    obj.__dict__.update(state)
+
+
+def _reduce_by_state(obj):
+    # peppy reduces projects and samples to their plain data, which loses
+    # everything looper derives from it; keep the instance attributes instead.
+    # The state setter also avoids a `__setstate__` lookup, which these
+    # classes would route through their `__getattr__` on a bare instance.
+    skip = _TRANSIENT_STATE[type(obj)]
+    state = {k: v for k, v in obj.__dict__.items() if k not in skip}
+    return copyreg.__newobj__, (type(obj),), state, None, None, _set_state
+
+
+def _file_hash(path: str) -> str | None:
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _unsafe_owner_problem(path: str, st: os.stat_result) -> str | None:
+    """Check that a file belongs to the current user and only they can write it.
+
+    Returns:
+        str | None: What is wrong with the file, or None if it's safe to trust.
+    """
+    if st.st_uid != os.getuid():
+        return f"'{path}' belongs to another user"
+    if st.st_mode & 0o022:
+        return f"'{path}' is writable by other users"
+    return None
+
+
+def snapshot_path(output_dir: str, **construction) -> str:
+    """Get the path of the snapshot of a project built with given arguments.
+
+    Args:
+        output_dir (str): Output directory of the project.
+        construction: Everything the project is constructed with.
+
+    Returns:
+        str: Path to the snapshot file, which may not exist.
+    """
+    from peppy import __version__ as peppy_version
+
+    key = json.dumps(
+        [__version__, peppy_version, sys.version, os.getcwd(), construction],
+        sort_keys=True,
+        default=str,
+    )
+    name = f"project-{hashlib.sha256(key.encode()).hexdigest()[:20]}.pickle"
+    return os.path.join(output_dir, SNAPSHOT_DIRNAME, name)
+
+
+def save_snapshot(prj: Project, path: str, sources) -> None:
+    """Store a snapshot of a project.
+
+    Failing to write the snapshot is not an error; it's only logged.
+
+    Args:
+        prj (looper.Project): Project to store.
+        path (str): Path to the snapshot file, see `snapshot_path`.
+        sources (Iterable[str]): Paths of the files the project was built
+            from; a change to the content of any of them invalidates the
+            snapshot.
+    """
+    header = {src: _file_hash(src) for src in sources}
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickler = pickle.Pickler(f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickler.dispatch_table = copyreg.dispatch_table.copy()
+                for cls in _TRANSIENT_STATE:
+                    pickler.dispatch_table[cls] = _reduce_by_state
+                pickler.dump(header)
+                pickler.clear_memo()  # the header is loaded on its own
+                pickler.dump(prj)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+    except Exception as e:
+        _LOGGER.warning(f"Could not save project snapshot to {path}: {e}")
+        return
+    _LOGGER.debug(f"Saved project snapshot: {path}")
+
+
+def load_snapshot(path: str) -> Project | None:
+    """Load a snapshot of a project, if it's still valid.
+
+    Args:
+        path (str): Path to the snapshot file, see `snapshot_path`.
+
+    Returns:
+        looper.Project | None: The project, or None if there's no snapshot,
+            it can't be read or trusted, or any of the project's source files
+            changed. The computing configuration is not part of a snapshot.
+    """
+    directory = os.path.dirname(path)
+    try:
+        with open(path, "rb") as f:
+            problem = _unsafe_owner_problem(
+                directory, os.stat(directory)
+            ) or _unsafe_owner_problem(path, os.fstat(f.fileno()))
+            if problem:
+                _LOGGER.warning(f"Ignoring untrusted project snapshot: {problem}")
+                return None
+            header = pickle.load(f)
+            changed = [src for src, h in header.items() if _file_hash(src) != h]
+            if changed:
+                _LOGGER.debug(f"Project snapshot is stale, changed: {changed}")
+                return None
+            prj = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        _LOGGER.warning(f"Ignoring unreadable project snapshot {path}: {e}")
+        return None
+    prj.dcc = None
+    _LOGGER.debug(f"Loaded project snapshot: {path}")
+    return prj
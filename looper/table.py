@@ -0,0 +1,186 @@
+"""Streaming export of reported results, for `looper table --format`.
+
+Records are read from the pipestat backend a chunk at a time and appended
+to the output file, one column per result of the output schema. Scalar
+results get columns of their type; files, images, objects and arrays are
+written as JSON strings. Parquet and Arrow files require pyarrow.
+"""
+
+import csv
+import json
+import logging
+import os
+
+from pipestat.backends.file_backend.filebackend import FileBackend
+from pipestat.reports import get_file_for_table
+
+from .const import TABLE_FORMATS
+from .exceptions import LooperError
+
+__all__ = ["export_table", "iter_record_chunks"]
+
+_LOGGER = logging.getLogger(__name__)
+
+# Records read from the backend, and written, at a time
+TABLE_CHUNK_SIZE = 1000
+# Arrow type names and converters of the scalar result types of pipestat
+SCALAR_TYPES = {
+    "integer": ("int64", int),
+    "number": ("float64", float),
+    "boolean": ("bool_", bool),
+    "string": ("string", str),
+}
+RECORD_ID_COLUMN = "record_identifier"
+
+
+def export_table(
+    psm,
+    table_format: str,
+    output_dir: str | None = None,
+    chunk_size: int = TABLE_CHUNK_SIZE,
+) -> str:
+    """Write the results of a pipeline to a table file, a chunk at a time.
+
+    Args:
+        psm (pipestat.PipestatManager): Manager of the pipeline's results.
+        table_format (str): One of TABLE_FORMATS.
+        output_dir (str | None): Directory to write the table to.
+        chunk_size (int): Number of records to read and write at a time.
+
+    Returns:
+        str: Path to the table file.
+
+    Raises:
+        LooperError: If pyarrow is needed but not installed.
+    """
+    if table_format not in TABLE_FORMATS:
+        raise ValueError(f"Unknown table format: {table_format}")
+    if output_dir:
+        psm.cfg["output_dir"] = output_dir
+    psm.check_multi_results()
+    path = get_file_for_table(psm, psm.pipeline_name, f"results.{table_format}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    columns = {
+        result_id: spec.get("type", "string")
+        for result_id, spec in psm.result_schemas.items()
+    }
+    writer_cls = _TsvWriter if table_format == "tsv" else _ArrowWriter
+    num_records = 0
+    with writer_cls(path, table_format, columns) as writer:
+        for chunk in iter_record_chunks(psm, chunk_size):
+            writer.write([_typed_row(record, columns) for record in chunk])
+            num_records += len(chunk)
+    _LOGGER.info(f"Wrote {num_records} records of '{psm.pipeline_name}': {path}")
+    return path
+
+
+def iter_record_chunks(psm, chunk_size: int = TABLE_CHUNK_SIZE):
+    """Iterate over the records of a pipeline's results, a chunk at a time.
+
+    Database backends are paged through with a cursor, so only a chunk of
+    records is in memory at a time. A results file is read whole by pipestat
+    anyway, so its records are just sliced.
+
+    Args:
+        psm (pipestat.PipestatManager): Manager of the pipeline's results.
+        chunk_size (int): Number of records per chunk.
+
+    Yields:
+        list[dict]: Records of the chunk.
+    """
+    if isinstance(psm.backend, FileBackend):
+        records = psm.backend.select_records(limit=None)["records"]
+        for start in range(0, len(records), chunk_size):
+            yield records[start : start + chunk_size]
+        return
+    cursor = None
+    while True:
+        page = psm.backend.select_records(limit=chunk_size, cursor=cursor)
+        records = page["records"]
+        if records:
+            yield records
+        next_cursor = page.get("next_page_token")
+        if len(records) < chunk_size or next_cursor in (None, cursor):
+            return
+        cursor = next_cursor
+
+
+def _typed_row(record: dict, columns: dict[str, str]) -> dict:
+    """Values of a record, cast to the types of their columns."""
+    row = {RECORD_ID_COLUMN: record[RECORD_ID_COLUMN]}
+    for result_id, result_type in columns.items():
+        value = record.get(result_id)
+        if value is None:
+            row[result_id] = None
+        elif result_type in SCALAR_TYPES:
+            try:
+                row[result_id] = SCALAR_TYPES[result_type][1](value)
+            except (TypeError, ValueError):
+                _LOGGER.warning(
+                    f"Result '{result_id}' of '{record[RECORD_ID_COLUMN]}' isn't "
+                    f"of type {result_type}: {value!r}"
+                )
+                row[result_id] = None
+        else:
+            row[result_id] = json.dumps(value, default=str)
+    return row
+
+
+class _TsvWriter:
+    """Writer of rows to a TSV file; missing values are left empty."""
+
+    def __init__(self, path: str, table_format: str, columns: dict[str, str]):
+        self._file = open(path, "w", newline="")
+        self._writer = csv.DictWriter(
+            self._file, fieldnames=[RECORD_ID_COLUMN, *columns], delimiter="\t"
+        )
+        self._writer.writeheader()
+
+    def write(self, rows: list[dict]) -> None:
+        self._writer.writerows(rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._file.close()
+
+
+class _ArrowWriter:
+    """Writer of rows to a Parquet or Arrow IPC file, a record batch each."""
+
+    def __init__(self, path: str, table_format: str, columns: dict[str, str]):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise LooperError(
+                f"Writing {table_format} tables requires pyarrow: pip install pyarrow"
+            )
+        self._pa = pa
+        self.schema = pa.schema(
+            [(RECORD_ID_COLUMN, pa.string())]
+            + [
+                (
+                    result_id,
+                    getattr(pa, SCALAR_TYPES.get(result_type, ("string",))[0])(),
+                )
+                for result_id, result_type in columns.items()
+            ]
+        )
+        if table_format == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(path, self.schema)
+        else:
+            self._writer = pa.ipc.new_file(path, self.schema)
+
+    def write(self, rows: list[dict]) -> None:
+        self._writer.write_batch(
+            self._pa.RecordBatch.from_pylist(rows, schema=self.schema)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._writer.close()
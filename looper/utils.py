@@ -2,21 +2,23 @@
 
 import argparse
 import glob
+import hashlib
 import itertools
+import json
 import os
 import re
+import socket
+import tempfile
+import threading
+import time
+import uuid
 from collections import defaultdict
 from collections.abc import Iterable
 from logging import getLogger
 
-import jinja2
 import yaml
-from pephubclient.constants import RegistryPath
 from peppy import Project as peppyProject
 from peppy.const import CONFIG_KEY, NAME_KEY, SAMPLE_MODS_KEY
-from pydantic import ValidationError
-from rich.console import Console
-from rich.pretty import pprint
 from ubiquerg import convert_value, deep_update, expandpath, parse_registry_path
 from yacman import load_yaml
 from yaml.parser import ParserError
@@ -39,6 +41,7 @@ from .const import (
     PipelineLevel,
 )
 from .exceptions import MisconfigurationException, PipelineInterfaceConfigError
+from .writer import background_writer
 
 _LOGGER = getLogger(__name__)
 
@@ -130,6 +133,122 @@ def fetch_sample_flags(
     ]
 
 
+def find_cleanup_scripts(results_folder: str) -> dict[str, list[str]]:
+    """Find the cleanup scripts in the sample folders of a results folder.
+
+    The results folder and each sample folder are listed once, rather than
+    globbing every sample's folder separately.
+
+    Args:
+        results_folder (str): Folder holding a folder per sample.
+
+    Returns:
+        dict[str, list[str]]: Sorted paths to the '*_cleanup.sh' files, by
+            the path to the sample folder holding them.
+    """
+    scripts = {}
+    try:
+        folders = [e.path for e in os.scandir(results_folder) if e.is_dir()]
+    except FileNotFoundError:
+        return scripts
+    for folder in folders:
+        with os.scandir(folder) as entries:
+            found = sorted(
+                e.path
+                for e in entries
+                if e.name.endswith("_cleanup.sh") and e.is_file()
+            )
+        if found:
+            scripts[folder] = found
+    return scripts
+
+
+def acquire_claim(path: str, ttl: float) -> bool:
+    """Atomically claim a unit of work by exclusively creating a claim file.
+
+    Claims are advisory; they let concurrent looper processes that share an
+    output directory agree on which of them submits a given job. A claim
+    whose file is older than the given TTL is considered stale and is broken.
+
+    Args:
+        path (str): Path to the claim file.
+        ttl (float): Age, in seconds, after which an existing claim is stale.
+
+    Returns:
+        bool: Whether the claim was acquired.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    for _ in range(2):
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            try:
+                stale = os.stat(path)
+            except FileNotFoundError:
+                continue  # released in the meantime
+            age = time.time() - stale.st_mtime
+            if age < ttl:
+                return False
+            _LOGGER.info(f"Breaking stale claim ({age:.0f}s old): {path}")
+            _break_stale_claim(path, stale)
+            continue
+        with os.fdopen(fd, "w") as f:
+            f.write(f"{socket.gethostname()} {os.getpid()} {time.time()}\n")
+        return True
+    return False
+
+
+def _break_stale_claim(path: str, stale: os.stat_result) -> bool:
+    """Remove a claim file that was found stale, unless it's been replaced since.
+
+    Several processes may find the same claim stale at once, and by the time
+    one of them acts, another may already have broken it and made a fresh
+    claim. So the file is first renamed to a name unique to this process,
+    which only one of them can do, and removed only if it is still the file
+    that was found stale; a fresh claim is put back. If yet another claim
+    took its place meanwhile, the fresh one is left under the unique name
+    rather than removed, since its holder still believes it owns the sample.
+
+    Args:
+        path (str): Path to the claim file.
+        stale (os.stat_result): Status of the claim file when found stale.
+
+    Returns:
+        bool: Whether the stale claim was removed.
+    """
+    tombstone = f"{path}.{uuid.uuid4().hex}.stale"
+    try:
+        os.rename(path, tombstone)
+    except FileNotFoundError:
+        return False
+    current = os.stat(tombstone)
+    if (current.st_ino, current.st_mtime_ns) == (stale.st_ino, stale.st_mtime_ns):
+        os.remove(tombstone)
+        return True
+    try:
+        os.link(tombstone, path)
+    except FileExistsError:
+        _LOGGER.warning(
+            f"Claim was replaced while restoring it: {path}; "
+            f"the replaced claim is kept as {tombstone}"
+        )
+        return False
+    os.remove(tombstone)
+    return False
+
+
+def release_claim(path: str) -> None:
+    """Remove a claim file, if it exists.
+
+    Args:
+        path (str): Path to the claim file.
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
 def get_sample_status(sample: str, flags: list[str]) -> str | None:
     """Get a sample status.
 
@@ -250,6 +369,8 @@ def jinja_render_template_strictly(template: str, namespaces: dict) -> str:
         """
         return " ".join(x) if isinstance(x, list) else x
 
+    import jinja2
+
     env = jinja2.Environment(
         undefined=jinja2.StrictUndefined,
         variable_start_string="{",
@@ -463,6 +584,9 @@ def init_generic_pipeline(pipelinepath: str | None = None):
     Returns:
         bool: True if successful.
     """
+    from rich.console import Console
+    from rich.pretty import pprint
+
     console = Console()
 
     # Destination one level down from CWD in pipeline folder
@@ -607,6 +731,9 @@ def initiate_looper_config(
     Returns:
         bool: Whether the file was initialized.
     """
+    from rich.console import Console
+    from rich.pretty import pprint
+
     console = Console()
     console.clear()
     console.rule("\n[magenta]Looper initialization[/magenta]")
@@ -666,6 +793,7 @@ def looper_config_tutorial() -> bool:
     Returns:
         bool: Whether the file was initialized.
     """
+    from rich.console import Console
 
     console = Console()
     console.clear()
@@ -937,14 +1065,15 @@ def read_looper_config_file(looper_config_path: str) -> dict:
     return return_dict
 
 
-def dotfile_path(directory: str = os.getcwd(), must_exist: bool = False) -> str:
+def dotfile_path(directory: str | None = None, must_exist: bool = False) -> str:
     """Get the path to the looper dotfile.
 
     If file existence is forced this function will look for it in
     the directory parents.
 
     Args:
-        directory (str): Directory path to start the search in.
+        directory (str): Directory path to start the search in. Defaults to
+            the current working directory.
         must_exist (bool): Whether the file must exist.
 
     Returns:
@@ -953,7 +1082,7 @@ def dotfile_path(directory: str = os.getcwd(), must_exist: bool = False) -> str:
     Raises:
         OSError: If the file does not exist.
     """
-    cur_dir = directory
+    cur_dir = directory or os.getcwd()
     if not must_exist:
         return os.path.join(cur_dir, LOOPER_DOTFILE_NAME)
     while True:
@@ -995,8 +1124,16 @@ def is_pephub_registry_path(input_string: str) -> bool:
     Returns:
         bool: True if input is a registry path.
     """
+    registry_path = parse_registry_path(input_string)
+    if registry_path is None:
+        # not a registry path at all; skip loading the client to validate it
+        return False
+
+    from pephubclient.constants import RegistryPath
+    from pydantic import ValidationError
+
     try:
-        RegistryPath(**parse_registry_path(input_string))
+        RegistryPath(**registry_path)
     except (ValidationError, TypeError):
         return False
     return True
@@ -1148,7 +1285,263 @@ def desired_samples_range_skipped(arg: str, num_samples: int) -> Iterable[int]:
         return intv.to_range()
 
 
-def write_submit_script(fp: str, content: str, data: dict) -> str:
+def parse_shard(arg: str) -> tuple[int, int]:
+    """Parse a shard specification of the form 'K/N'.
+
+    Args:
+        arg (str): CLI specification of the shard, e.g. '2/4' for the second
+            of four shards.
+
+    Returns:
+        tuple[int, int]: 1-based shard index and total number of shards.
+
+    Raises:
+        ValueError: If the specification is malformed or out of range.
+    """
+    try:
+        k, n = (int(x) for x in str(arg).split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must be specified as K/N, e.g. 1/4: {arg}")
+    if n < 1 or not 1 <= k <= n:
+        raise ValueError(f"Shard index must be between 1 and {n}: {arg}")
+    return k, n
+
+
+def sample_in_shard(sample_id: str, shard: int, num_shards: int) -> bool:
+    """Determine whether a sample belongs to the given shard.
+
+    Assignment uses a hash of the sample identifier, so it is stable across
+    processes, hosts and sample table orderings.
+
+    Args:
+        sample_id (str): Sample identifier (value of the sample table index).
+        shard (int): 1-based shard index.
+        num_shards (int): Total number of shards.
+
+    Returns:
+        bool: Whether the sample is assigned to the given shard.
+    """
+    digest = hashlib.md5(str(sample_id).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % num_shards == shard - 1
+
+
+class ProgressReport:
+    """Periodic log of the progress of many similar operations.
+
+    Args:
+        total (int): Number of operations.
+        action (str): What is done, like 'Removed', to report.
+        unit (str): What the operations are done to, like 'folders'.
+        interval (float): Seconds between reports.
+    """
+
+    def __init__(
+        self, total: int, action: str, unit: str, interval: float = 5.0
+    ) -> None:
+        self.total = total
+        self.done = 0
+        self.action = action
+        self.unit = unit
+        self.interval = interval
+        self._start = self._last = time.perf_counter()
+
+    def update(self, n: int = 1) -> None:
+        """Count finished operations, and report if it's time to.
+
+        Args:
+            n (int): Number of operations finished.
+        """
+        self.done += n
+        now = time.perf_counter()
+        if now - self._last >= self.interval:
+            self._last = now
+            _LOGGER.info(self._message(now))
+
+    def finish(self) -> None:
+        """Report the number of operations done and their throughput."""
+        _LOGGER.info(self._message(time.perf_counter()))
+
+    def _message(self, now: float) -> str:
+        elapsed = now - self._start
+        rate = self.done / elapsed if elapsed else 0.0
+        return (
+            f"{self.action} {self.done} of {self.total} {self.unit} "
+            f"in {elapsed:.1f} s ({rate:.1f}/s)"
+        )
+
+
+def write_if_changed(path: str, content: str) -> bool:
+    """Write a text file atomically, unless it already holds the content.
+
+    The content is written to a temporary file in the same folder that then
+    replaces the target, so readers never see a partly written file.
+
+    Args:
+        path (str): Path to the file to write.
+        content (str): Text to write.
+
+    Returns:
+        bool: Whether the file was written.
+    """
+    data = content.encode()
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+    _write_atomically(path, data)
+    return True
+
+
+def _write_atomically(path: str, data: bytes) -> None:
+    """Replace a file with the given content through a temporary file."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            # mkstemp creates the file readable only by the owner
+            os.fchmod(f.fileno(), 0o666 & ~_umask())
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+class WriteManifest:
+    """Record of the files looper wrote to a folder, to skip rewriting them.
+
+    The record is a JSON Lines file in the folder, with the hash, size and
+    modification time of each file as it was written. A file is known to
+    be unchanged if its hash is the same as that of the new content and a
+    `stat` shows the size and modification time that were recorded, so
+    the file itself needn't be read. Writes only append to the record; it
+    is compacted when it's loaded and holds many superseded entries.
+
+    Args:
+        folder (str): Folder of the files.
+    """
+
+    FILENAME = ".looper_manifest.jsonl"
+
+    def __init__(self, folder: str) -> None:
+        self.path = os.path.join(folder, self.FILENAME)
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self) -> dict:
+        entries = {}
+        lines = 0
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        entry = json.loads(line)
+                        entries[entry["name"]] = entry
+                    except (ValueError, KeyError, TypeError):
+                        continue  # e.g. a line cut short by a crash
+        except OSError:
+            return entries
+        if lines > 2 * len(entries) + 100:
+            _write_atomically(
+                self.path,
+                "".join(json.dumps(e) + "\n" for e in entries.values()).encode(),
+            )
+        return entries
+
+    def write(self, path: str, content: str) -> bool:
+        """Write a file of the folder atomically, unless it's unchanged.
+
+        Args:
+            path (str): Path to the file to write.
+            content (str): Text to write.
+
+        Returns:
+            bool: Whether the file was written.
+        """
+        data = content.encode()
+        digest = hashlib.sha1(data).hexdigest()
+        name = os.path.basename(path)
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+            entry = self._entries.get(name)
+        if entry is not None and entry["sha1"] == digest:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                pass
+            else:
+                if (stat.st_size, stat.st_mtime_ns) == (entry["size"], entry["mtime"]):
+                    return False
+        _write_atomically(path, data)
+        stat = os.stat(path)
+        entry = {
+            "name": name,
+            "sha1": digest,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+        }
+        with self._lock:
+            self._entries[name] = entry
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        return True
+
+
+_MANIFESTS = {}
+_MANIFESTS_LOCK = threading.Lock()
+
+
+def write_manifest(folder: str) -> WriteManifest:
+    """Get the manifest of the files looper wrote to a folder.
+
+    Args:
+        folder (str): Folder of the files.
+
+    Returns:
+        WriteManifest: Manifest of the folder, shared within the process.
+    """
+    folder = os.path.abspath(folder)
+    with _MANIFESTS_LOCK:
+        if folder not in _MANIFESTS:
+            _MANIFESTS[folder] = WriteManifest(folder)
+        return _MANIFESTS[folder]
+
+
+def _read_umask() -> int:
+    """Read the mask by setting it, which changes it for all threads briefly."""
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+
+# mask of the process when looper was imported, read on the importing thread
+# before any writer threads are started
+_UMASK = _read_umask()
+
+
+def _umask() -> int:
+    """The file mode creation mask of the process.
+
+    The current mask is read from /proc/self/status where there is one,
+    which leaves the mask alone; elsewhere, the mask at import is used.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    return _UMASK
+
+
+def write_submit_script(
+    fp: str, content: str, data: dict, background: bool = False
+) -> str:
     """Write a submission script for divvy by populating a template with data.
 
     Args:
@@ -1157,6 +1550,8 @@ def write_submit_script(fp: str, content: str, data: dict) -> str:
             will be filled by given data.
         data (Mapping): A "pool" from which values are available to replace
             keys in the template.
+        background (bool): Whether to queue the write to the background
+            writer rather than wait for it; see `looper.writer`.
 
     Returns:
         str: Path to the submission script.
@@ -1181,11 +1576,19 @@ def write_submit_script(fp: str, content: str, data: dict) -> str:
         outdir = os.path.dirname(fp)
         if outdir and not os.path.isdir(outdir):
             os.makedirs(outdir)
-        with open(fp, "w") as f:
-            f.write(content)
+        manifest = write_manifest(outdir or ".")
+        if background:
+            background_writer().submit(fp, _write_script, manifest, fp, content)
+        else:
+            _write_script(manifest, fp, content)
         return fp
 
 
+def _write_script(manifest: "WriteManifest", fp: str, content: str) -> None:
+    if not manifest.write(fp, content):
+        _LOGGER.debug(f"Submission script unchanged: {fp}")
+
+
 def inspect_looper_config_file(looper_config_dict) -> None:
     """Inspects looper config by printing it to terminal.
 
@@ -0,0 +1,130 @@
+"""Background writing of the files looper produces for the jobs it submits.
+
+Submission scripts and plugin outputs are queued to a pool of threads, so
+that rendering the next ones goes on while the writes drain. Before a
+script is handed to the scheduler, `wait` makes sure it and everything
+queued before it, like the files its commands read, is written.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+__all__ = ["BackgroundWriter", "background_writer"]
+
+_LOGGER = logging.getLogger(__name__)
+
+# Writes are I/O bound, so threads overlap them well despite the GIL
+WRITER_THREADS = 8
+# Writes queued at most, so that pending content doesn't pile up in memory
+MAX_PENDING_WRITES = 256
+
+
+class BackgroundWriter:
+    """Bounded queue of file writes, carried out by a pool of threads.
+
+    Args:
+        max_workers (int): Number of writing threads.
+        max_pending (int): Number of queued writes at which `submit` blocks
+            until one of them is done.
+    """
+
+    def __init__(
+        self, max_workers: int = WRITER_THREADS, max_pending: int = MAX_PENDING_WRITES
+    ) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="looper-writer"
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        # path -> future of its latest write, in the order they were queued
+        self._pending = OrderedDict()
+
+    def submit(self, path: str, write, *args) -> Future:
+        """Queue a write of a file.
+
+        A write queued while an earlier one of the same file is pending
+        waits for that one first, so the last content queued wins.
+
+        Args:
+            path (str): Path to the file, to refer to the write by.
+            write (Callable): Function that writes the file.
+            *args: Arguments to call the function with.
+
+        Returns:
+            concurrent.futures.Future: Future of the result of the function.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            previous = self._pending.get(path)
+        if previous is not None:
+            previous.result()
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(write, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        with self._lock:
+            self._pending.pop(path, None)
+            self._pending[path] = future
+        return future
+
+    def wait(self, path: str) -> None:
+        """Wait until a file, and all queued before it, is written.
+
+        Args:
+            path (str): Path to the file; if no write of it is pending, only
+                the writes queued so far are waited for.
+
+        Raises:
+            Exception: The error of the first of the writes that failed.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            paths = list(self._pending)
+        if path in paths:
+            paths = paths[: paths.index(path) + 1]
+        for p in paths:
+            with self._lock:
+                future = self._pending.get(p)
+            if future is None:
+                continue
+            try:
+                future.result()
+            finally:
+                with self._lock:
+                    if self._pending.get(p) is future:
+                        del self._pending[p]
+
+    def flush(self) -> None:
+        """Wait until all queued writes are done.
+
+        Raises:
+            Exception: The error of the first of the writes that failed.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            last = next(reversed(self._pending))
+        self.wait(last)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def background_writer() -> BackgroundWriter:
+    """Get the background writer of the process.
+
+    Returns:
+        BackgroundWriter: The writer, created on first use.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = BackgroundWriter()
+        return _writer
@@ -0,0 +1,53 @@
+"""Benchmark configuration with environment variable gating.
+
+Benchmarks need pytest-benchmark and only run with RUN_BENCHMARKS=true:
+
+    RUN_BENCHMARKS=true pytest tests/benchmarks --benchmark-autosave
+    RUN_BENCHMARKS=true pytest tests/benchmarks --benchmark-compare
+
+Settings:
+- LOOPER_BENCHMARK_SIZES: comma-separated sample counts, default 1000,10000
+- LOOPER_BENCHMARK_LATENCY: seconds per fake sbatch submission, default 0
+- LOOPER_BENCHMARK_FAILURE_RATE: fraction of failing submissions, default 0
+"""
+
+import os
+
+import pytest
+
+from tests.benchmarks.synthetic import make_fake_sbatch, make_synthetic_pep
+
+pytest.importorskip("pytest_benchmark")
+
+SIZES = [int(n) for n in os.getenv("LOOPER_BENCHMARK_SIZES", "1000,10000").split(",")]
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmarks unless RUN_BENCHMARKS=true."""
+    if os.getenv("RUN_BENCHMARKS") == "true":
+        return
+    skip_marker = pytest.mark.skip(
+        reason="Benchmarks disabled. Set RUN_BENCHMARKS=true to run."
+    )
+    for item in items:
+        if "benchmarks" in str(item.fspath):
+            item.add_marker(skip_marker)
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda n: f"{n}_samples")
+def synthetic_pep(request, tmp_path_factory):
+    """A synthetic PEP per benchmarked size, shared by a module's benchmarks."""
+    root = tmp_path_factory.mktemp(f"pep_{request.param}")
+    return make_synthetic_pep(
+        str(root), request.param, num_pipelines=2, schema_attributes=5, lump_n=10
+    )
+
+
+@pytest.fixture(scope="module")
+def fake_divcfg(tmp_path_factory):
+    """Divvy config with a stand-in sbatch, see `make_fake_sbatch`."""
+    return make_fake_sbatch(
+        str(tmp_path_factory.mktemp("scheduler")),
+        latency=float(os.getenv("LOOPER_BENCHMARK_LATENCY", "0")),
+        failure_rate=float(os.getenv("LOOPER_BENCHMARK_FAILURE_RATE", "0")),
+    )
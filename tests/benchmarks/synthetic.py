@@ -0,0 +1,280 @@
+"""Synthetic PEPs and a stand-in scheduler for benchmarking looper.
+
+Can also be run as a script to generate a PEP to profile by hand:
+
+    python -m tests.benchmarks.synthetic DIRECTORY --samples 10000
+"""
+
+import argparse
+import csv
+import os
+import shutil
+from dataclasses import dataclass
+
+from yaml import dump
+
+from looper.const import DEFAULT_CONFIG_FILEPATH
+
+SLURM_TEMPLATE = os.path.join(
+    os.path.dirname(DEFAULT_CONFIG_FILEPATH), "divvy_templates", "slurm_template.sub"
+)
+
+# Statuses assigned to the samples, in turn, when pipestat results are made
+STATUSES = ["completed", "failed", "running", "waiting"]
+
+
+@dataclass
+class SyntheticPEP:
+    """Files of a generated PEP.
+
+    Attributes:
+        root (str): Directory holding everything.
+        looper_config (str): Path to the looper config.
+        output_dir (str): Output directory of the project.
+        sample_names (list[str]): Names of the samples.
+        pipeline_names (list[str]): Names of the sample pipelines.
+        lump_n (int | None): Number of commands per job to submit with.
+    """
+
+    root: str
+    looper_config: str
+    output_dir: str
+    sample_names: list
+    pipeline_names: list
+    lump_n: int | None = None
+
+    @property
+    def results_file(self) -> str:
+        return os.path.join(self.output_dir, "results.yaml")
+
+    @property
+    def flag_dir(self) -> str:
+        return os.path.join(self.output_dir, "flags")
+
+    def args(self, command: str, *extra: str) -> list[str]:
+        """Command line for a looper command on this PEP."""
+        args = [command, "--config", self.looper_config, *extra]
+        if self.lump_n and command in ("run", "rerun"):
+            args += ["--lump-n", str(self.lump_n)]
+        return args
+
+    def reset_outputs(self, results: bool = True) -> None:
+        """Remove all output and, optionally, write pipestat results anew.
+
+        Every sample gets a reported result and a status flag for each
+        pipeline, cycling through `STATUSES`.
+        """
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+        os.makedirs(self.flag_dir)
+        if not results:
+            return
+        records = {}
+        for pipeline_name in self.pipeline_names:
+            samples = {}
+            for i, name in enumerate(self.sample_names):
+                samples[name] = {
+                    "meta": {
+                        "pipestat_created_time": "2024-01-01 00:00:00",
+                        "pipestat_modified_time": "2024-01-01 00:00:00",
+                    },
+                    "number_of_lines": i,
+                }
+                status = STATUSES[i % len(STATUSES)]
+                flag = f"{pipeline_name}_{name}_{status}.flag"
+                with open(os.path.join(self.flag_dir, flag), "w") as f:
+                    f.write(status)
+            records[pipeline_name] = {"project": {}, "sample": samples}
+        with open(self.results_file, "w") as f:
+            dump(records, f)
+
+
+def make_synthetic_pep(
+    root: str,
+    num_samples: int,
+    num_pipelines: int = 1,
+    subsamples_per_sample: int = 0,
+    schema_attributes: int = 0,
+    lump_n: int | None = None,
+) -> SyntheticPEP:
+    """Write a PEP with pipestat-enabled sample pipelines.
+
+    Args:
+        root (str): Directory to write the PEP to.
+        num_samples (int): Number of samples.
+        num_pipelines (int): Number of sample pipelines every sample is
+            assigned to.
+        subsamples_per_sample (int): Rows per sample in a subsample table;
+            0 for no subsample table.
+        schema_attributes (int): Number of sample attributes, all of them
+            required by the input schema of every pipeline.
+        lump_n (int | None): Number of commands per job to submit with.
+
+    Returns:
+        SyntheticPEP: The generated files.
+    """
+    project_dir = os.path.join(root, "project")
+    pipeline_dir = os.path.join(root, "pipeline")
+    output_dir = os.path.join(root, "results")
+    os.makedirs(project_dir, exist_ok=True)
+    os.makedirs(pipeline_dir, exist_ok=True)
+
+    attributes = [f"attr_{j}" for j in range(schema_attributes)]
+    sample_names = [f"sample_{i:07d}" for i in range(num_samples)]
+    with open(os.path.join(project_dir, "samples.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["sample_name", "protocol", "file", *attributes])
+        for i, name in enumerate(sample_names):
+            values = [f"{name}_{a}" for a in attributes]
+            writer.writerow([name, f"PROTO{i % 3}", "local_files", *values])
+
+    project_config = {
+        "pep_version": "2.1.0",
+        "sample_table": "samples.csv",
+        "sample_modifiers": {
+            "derive": {
+                "attributes": ["file"],
+                "sources": {"local_files": "../data/{sample_name}.txt"},
+            },
+        },
+    }
+    if subsamples_per_sample:
+        project_config["subsample_table"] = "subsamples.csv"
+        with open(os.path.join(project_dir, "subsamples.csv"), "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["sample_name", "subsample_name", "read"])
+            for name in sample_names:
+                for k in range(subsamples_per_sample):
+                    writer.writerow([name, f"sub{k}", f"{name}_{k}.fq"])
+    with open(os.path.join(project_dir, "project_config.yaml"), "w") as f:
+        dump(project_config, f)
+
+    input_schema = {
+        "description": "Synthetic input schema",
+        "properties": {
+            "samples": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        a: {"type": "string", "description": a}
+                        for a in ["sample_name", *attributes]
+                    },
+                    "required": ["sample_name", *attributes],
+                },
+            }
+        },
+        "required": ["samples"],
+    }
+    with open(os.path.join(pipeline_dir, "input_schema.yaml"), "w") as f:
+        dump(input_schema, f)
+
+    pipeline_names = [f"bench_pipeline_{k}" for k in range(num_pipelines)]
+    pifaces = []
+    for pipeline_name in pipeline_names:
+        with open(os.path.join(pipeline_dir, f"{pipeline_name}_schema.yaml"), "w") as f:
+            dump(
+                {
+                    "pipeline_name": pipeline_name,
+                    "samples": {
+                        "number_of_lines": {
+                            "type": "integer",
+                            "description": "Number of lines in the input file",
+                        }
+                    },
+                },
+                f,
+            )
+        piface = os.path.join(pipeline_dir, f"{pipeline_name}.yaml")
+        with open(piface, "w") as f:
+            dump(
+                {
+                    "pipeline_name": pipeline_name,
+                    "input_schema": "input_schema.yaml",
+                    "output_schema": f"{pipeline_name}_schema.yaml",
+                    "sample_interface": {
+                        "command_template": "count_lines.sh {sample.file} "
+                        "{sample.sample_name} {pipestat.results_file}"
+                    },
+                },
+                f,
+            )
+        pifaces.append(piface)
+
+    looper_config = os.path.join(root, ".looper.yaml")
+    with open(looper_config, "w") as f:
+        dump(
+            {
+                "pep_config": os.path.join(project_dir, "project_config.yaml"),
+                "output_dir": output_dir,
+                "pipeline_interfaces": pifaces,
+                "pipestat": {
+                    "results_file_path": os.path.join(output_dir, "results.yaml"),
+                    "flag_file_dir": os.path.join(output_dir, "flags"),
+                },
+            },
+            f,
+        )
+    return SyntheticPEP(
+        root=root,
+        looper_config=looper_config,
+        output_dir=output_dir,
+        sample_names=sample_names,
+        pipeline_names=pipeline_names,
+        lump_n=lump_n,
+    )
+
+
+def make_fake_sbatch(
+    directory: str, latency: float = 0.0, failure_rate: float = 0.0
+) -> str:
+    """Write a divvy config whose 'fake' package submits to a stand-in sbatch.
+
+    The stand-in waits for the given latency, fails at the given rate and
+    otherwise prints a job ID like `sbatch` does.
+
+    Args:
+        directory (str): Directory to write the script and config to.
+        latency (float): Seconds each submission takes.
+        failure_rate (float): Fraction of submissions that fail, 0 to 1.
+
+    Returns:
+        str: Path to the divvy config.
+    """
+    sbatch = os.path.join(directory, "fake_sbatch")
+    threshold = round(failure_rate * 32768)
+    with open(sbatch, "w") as f:
+        f.write(
+            "#!/bin/bash\n"
+            f"sleep {latency}\n"
+            f"if (( RANDOM < {threshold} )); then\n"
+            '    echo "sbatch: error: Batch job submission failed" >&2\n'
+            "    exit 1\n"
+            "fi\n"
+            'echo "Submitted batch job $$"\n'
+        )
+    os.chmod(sbatch, 0o755)
+    package = {
+        "submission_template": SLURM_TEMPLATE,
+        "submission_command": sbatch,
+        "job_id_pattern": r"Submitted batch job (\d+)",
+    }
+    divcfg = os.path.join(directory, "divvy_config.yaml")
+    with open(divcfg, "w") as f:
+        dump({"compute_packages": {"default": package, "fake": package}}, f)
+    return divcfg
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic PEP")
+    parser.add_argument("directory")
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--pipelines", type=int, default=1)
+    parser.add_argument("--subsamples", type=int, default=0)
+    parser.add_argument("--schema-attributes", type=int, default=0)
+    parser.add_argument("--results", action="store_true")
+    a = parser.parse_args()
+    pep = make_synthetic_pep(
+        a.directory, a.samples, a.pipelines, a.subsamples, a.schema_attributes
+    )
+    pep.reset_outputs(results=a.results)
+    print(pep.looper_config)
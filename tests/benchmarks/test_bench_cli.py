@@ -0,0 +1,65 @@
+"""Timing of looper commands on synthetic PEPs."""
+
+import subprocess
+import sys
+
+import pytest
+
+from looper.cli_pydantic import main
+
+ROUNDS = 3
+
+
+def _looper(args):
+    try:
+        main(test_args=args)
+    except SystemExit:
+        # failed submissions, with a failure rate set
+        pass
+
+
+def _bench_command(benchmark, pep, args, results=True):
+    benchmark.pedantic(
+        _looper,
+        args=(args,),
+        setup=lambda: pep.reset_outputs(results=results),
+        rounds=ROUNDS,
+    )
+
+
+def test_run_dry(benchmark, synthetic_pep):
+    args = synthetic_pep.args("run", "--dry-run")
+    _bench_command(benchmark, synthetic_pep, args, results=False)
+
+
+def test_run(benchmark, synthetic_pep, fake_divcfg):
+    args = synthetic_pep.args("run", "--divvy", fake_divcfg, "--package", "fake")
+    _bench_command(benchmark, synthetic_pep, args, results=False)
+
+
+def test_rerun(benchmark, synthetic_pep, fake_divcfg):
+    args = synthetic_pep.args("rerun", "--divvy", fake_divcfg, "--package", "fake")
+    _bench_command(benchmark, synthetic_pep, args)
+
+
+def test_check(benchmark, synthetic_pep):
+    _bench_command(benchmark, synthetic_pep, synthetic_pep.args("check"))
+
+
+def test_table(benchmark, synthetic_pep):
+    _bench_command(benchmark, synthetic_pep, synthetic_pep.args("table"))
+
+
+def test_destroy(benchmark, synthetic_pep):
+    args = synthetic_pep.args("destroy", "--force-yes")
+    _bench_command(benchmark, synthetic_pep, args)
+
+
+@pytest.mark.parametrize("args", [["--help"], ["check", "--help"]], ids=" ".join)
+def test_startup(benchmark, args):
+    benchmark.pedantic(
+        subprocess.run,
+        args=([sys.executable, "-m", "looper.cli_pydantic", *args],),
+        kwargs=dict(capture_output=True, check=True),
+        rounds=5,
+    )
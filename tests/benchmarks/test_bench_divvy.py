@@ -0,0 +1,26 @@
+"""Timing of writing submission scripts with divvy."""
+
+from looper.divvy import ComputingConfiguration
+from tests.benchmarks.synthetic import SLURM_TEMPLATE
+
+NUM_SCRIPTS = 1000
+
+
+def _write_scripts(dcc, directory):
+    for i in range(NUM_SCRIPTS):
+        looper = {
+            "job_name": f"bench_pipeline_sample_{i}",
+            "log_file": f"{directory}/sample_{i}.log",
+            "command": f"count_lines.sh sample_{i}.txt sample_{i}",
+        }
+        dcc.write_script(f"{directory}/sample_{i}.sub", extra_vars=[{"looper": looper}])
+
+
+def test_divvy_write(benchmark, tmp_path):
+    dcc = ComputingConfiguration(
+        entries={
+            "compute_packages": {"default": {"submission_template": SLURM_TEMPLATE}}
+        }
+    )
+    dcc.activate_package("default")
+    benchmark.pedantic(_write_scripts, args=(dcc, tmp_path), rounds=3)
@@ -4,11 +4,13 @@ Test organization:
 - tests/unit/ - Fast unit tests with no file I/O
 - tests/integration/ - CLI integration tests (set RUN_INTEGRATION_TESTS=true to run)
 - tests/divvytests/ - Divvy compute configuration tests
+- tests/benchmarks/ - Timing of commands on synthetic PEPs (set RUN_BENCHMARKS=true to run)
 
 Run commands:
 - pytest tests/unit tests/divvytests  # Fast tests (default)
 - RUN_INTEGRATION_TESTS=true pytest tests/integration  # Integration tests
 - ./tests/scripts/test-integration.sh  # Integration tests via script
+- RUN_BENCHMARKS=true pytest tests/benchmarks  # Benchmarks, needs pytest-benchmark
 """
 
 
@@ -11,7 +11,7 @@ import peppy
 import pytest
 from yaml import dump, safe_load
 
-from looper.const import LOOPER_DOTFILE_NAME, OUTDIR_KEY
+from looper.const import DEFAULT_CONFIG_FILEPATH, LOOPER_DOTFILE_NAME, OUTDIR_KEY
 
 
 # Skip all integration tests unless explicitly enabled
@@ -115,6 +115,37 @@ def test_args_expansion(pth=None, cmd=None, appendix=None, dry=True):
     return x
 
 
+SLURM_TEMPLATE = os.path.join(
+    os.path.dirname(DEFAULT_CONFIG_FILEPATH), "divvy_templates", "slurm_template.sub"
+)
+
+
+def make_fake_scheduler(tmp_path, response):
+    """Write a divvy config whose 'fake' package logs each submission.
+
+    The submission command appends its arguments to a log file and prints the
+    given response, like a scheduler would.
+
+    Returns:
+        tuple[str, pathlib.Path]: Path to the divvy config and to the log.
+    """
+    log = tmp_path / "submissions.log"
+    sub = tmp_path / "fake_sbatch"
+    sub.write_text(f'#!/bin/bash\necho "$@" >> {log}\necho "{response}"\n')
+    sub.chmod(0o755)
+    divcfg = tmp_path / "divvy_config.yaml"
+    package = {
+        "submission_template": SLURM_TEMPLATE,
+        "submission_command": str(sub),
+        "job_id_pattern": r"Submitted batch job (\d+)",
+        "dependency_template": "--dependency=afterok:{JOB_IDS}",
+        "dependency_delimiter": ":",
+    }
+    with open(divcfg, "w") as f:
+        dump({"compute_packages": {"default": package, "fake": package}}, f)
+    return str(divcfg), log
+
+
 def verify_filecount_in_dir(dirpath, pattern, count):
     """Check if expected number of files matching pattern exist in directory."""
     assert os.path.isdir(dirpath)
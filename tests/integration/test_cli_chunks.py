@@ -0,0 +1,56 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from looper.cli_pydantic import main
+from looper.project import _chunk_rows
+from tests.integration.conftest import get_outdir
+
+
+def _sub_scripts(looper_config):
+    sd = os.path.join(get_outdir(looper_config), "submission")
+    scripts = {}
+    for f in os.listdir(sd):
+        if f.endswith(".sub"):
+            with open(os.path.join(sd, f)) as fh:
+                scripts[f] = fh.read()
+    shutil.rmtree(sd)
+    return scripts
+
+
+@pytest.mark.parametrize("chunk_size", ["1", "2", "100"])
+def test_chunked_run_matches_whole_run(prep_temp_pep, chunk_size):
+    x = ["run", "--config", prep_temp_pep, "--dry-run"]
+    whole = main(test_args=x)
+    whole_scripts = _sub_scripts(prep_temp_pep)
+
+    chunked = main(test_args=x + ["--chunk-size", chunk_size])
+    assert chunked == whole
+    assert _sub_scripts(prep_temp_pep) == whole_scripts
+    assert len(whole_scripts) == 6
+
+
+def test_chunked_run_configures_pipestat(prep_temp_pep_pipestat):
+    x = ["run", "--config", prep_temp_pep_pipestat, "--dry-run"]
+    whole = main(test_args=x)
+    whole_scripts = _sub_scripts(prep_temp_pep_pipestat)
+
+    chunked = main(test_args=x + ["--chunk-size", "1"])
+    assert chunked == whole
+    assert chunked["Pipestat compatible"]
+    assert _sub_scripts(prep_temp_pep_pipestat) == whole_scripts
+
+
+@pytest.mark.parametrize("other", [["--limit", "1"], ["--lump-j", "1"]])
+def test_chunk_size_rejects_whole_table_options(prep_temp_pep, other):
+    x = ["run", "--config", prep_temp_pep, "--dry-run", "--chunk-size", "1"]
+    with pytest.raises(SystemExit):
+        main(test_args=x + other)
+
+
+def test_chunks_keep_rows_of_a_sample_together():
+    table = pd.DataFrame({"sample_name": ["a", "b", "a", "c", "b", "d"]})
+    chunks = _chunk_rows(table, "sample_name", 2)
+    assert [c.tolist() for c in chunks] == [[0, 1, 2, 4], [3, 5]]
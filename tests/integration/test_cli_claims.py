@@ -0,0 +1,44 @@
+import os
+
+from looper.cli_pydantic import main
+from tests.integration.conftest import (
+    get_outdir,
+    make_fake_scheduler,
+    mod_yaml_data,
+)
+
+
+def _claims(looper_config):
+    sd = os.path.join(get_outdir(looper_config), "submission")
+    return sorted(f for f in os.listdir(sd) if f.endswith(".claim"))
+
+
+def test_claimed_samples_are_skipped(prep_temp_pep, tmp_path):
+    divcfg, log = make_fake_scheduler(tmp_path, "Submitted batch job 1")
+    x = ["run", "--config", prep_temp_pep, "--divvy", divcfg, "--package", "fake"]
+    x += ["--claim-ttl", "3600"]
+
+    main(test_args=x)
+    assert len(log.read_text().splitlines()) == 6
+    assert len(_claims(prep_temp_pep)) == 6
+
+    # A second looper process finds every sample claimed and submits nothing
+    main(test_args=x)
+    assert len(log.read_text().splitlines()) == 6
+
+
+def test_claims_released_when_script_fails_to_render(prep_temp_pep, tmp_path):
+    piface = os.path.join(
+        os.path.dirname(prep_temp_pep), "pipeline", "pipeline_interface1_sample.yaml"
+    )
+    with mod_yaml_data(piface) as piface_data:
+        piface_data["sample_interface"]["command_template"] = (
+            "pipeline1.py {sample.no_such_attribute}"
+        )
+    divcfg, log = make_fake_scheduler(tmp_path, "Submitted batch job 1")
+    x = ["run", "--config", prep_temp_pep, "--divvy", divcfg, "--package", "fake"]
+    main(test_args=x + ["--claim-ttl", "3600"])
+
+    assert len(log.read_text().splitlines()) == 3
+    assert all(c.startswith("OTHER_PIPELINE2_") for c in _claims(prep_temp_pep))
+    assert len(_claims(prep_temp_pep)) == 3
@@ -6,6 +6,7 @@ from peppy import Project
 from yaml import dump, safe_load
 
 from looper.cli_pydantic import main
+from looper.conductor import submission_shard
 from looper.const import FLAGS, OUTDIR_KEY, PIPESTAT_KEY
 from looper.exceptions import (
     LooperReportError,
@@ -211,6 +212,267 @@ class TestLooperCheck:
             raise pytest.fail("DID RAISE {0}".format(Exception))
 
 
+class TestLooperDestroy:
+    def test_destroy_removes_pipestat_records(self, prep_temp_pep_pipestat):
+        tp = prep_temp_pep_pipestat
+        results_dir = os.path.join(get_outdir(tp), "example_pipestat_pipeline")
+        results_file = os.path.join(results_dir, "results.yaml")
+        os.makedirs(results_dir)
+        sample_names = [
+            s.sample_name for s in Project(get_project_config_path(tp)).samples
+        ]
+        records = {name: {"number_of_lines": 1} for name in sample_names}
+        records["not_in_project"] = {"number_of_lines": 2}
+        with open(results_file, "w") as f:
+            dump(
+                {
+                    "example_pipestat_pipeline": {
+                        "project": {},
+                        "sample": records,
+                    }
+                },
+                f,
+            )
+
+        main(test_args=["destroy", "--config", tp, "--force-yes"])
+
+        with open(results_file) as f:
+            left = safe_load(f)["example_pipestat_pipeline"]["sample"]
+        assert list(left) == ["not_in_project"]
+
+    def test_destroy_removes_sample_folders(self, prep_temp_pep):
+        tp = prep_temp_pep
+        prj = Project(get_project_config_path(tp))
+        results = os.path.join(get_outdir(tp), "results_pipeline")
+        folders = [os.path.join(results, s.sample_name) for s in prj.samples]
+        for folder in folders:
+            os.makedirs(os.path.join(folder, "nested"))
+            with open(os.path.join(folder, "nested", "out.txt"), "w") as f:
+                f.write("result")
+
+        main(test_args=["destroy", "--config", tp, "--force-yes", "--jobs", "2"])
+
+        assert not any(os.path.exists(folder) for folder in folders)
+
+    @pytest.mark.parametrize(
+        "flag_option, kept", [("--exc-flag", [0]), ("--sel-flag", [1, 2])]
+    )
+    def test_destroy_selects_by_flag(self, prep_temp_pep, flag_option, kept):
+        # destroy works on compacted samples, whose objects come and go
+        tp = prep_temp_pep
+        prj = Project(get_project_config_path(tp))
+        outdir = get_outdir(tp)
+        results = os.path.join(outdir, "results_pipeline")
+        folders = [os.path.join(results, s.sample_name) for s in prj.samples]
+        for folder in folders:
+            os.makedirs(folder)
+        flagged = prj.samples[0].sample_name
+        with open(os.path.join(outdir, f"PIPELINE1_{flagged}_failed.flag"), "w") as f:
+            f.write("failed")
+
+        main(
+            test_args=[
+                "destroy",
+                "--config",
+                tp,
+                "--force-yes",
+                flag_option,
+                "failed",
+            ]
+        )
+
+        assert [i for i, f in enumerate(folders) if os.path.exists(f)] == kept
+
+
+class TestLooperLink:
+    @staticmethod
+    def _report_files(tp, sample_names):
+        schema = os.path.join(
+            os.path.dirname(tp), "pipeline_pipestat", "pipestat_output_schema.yaml"
+        )
+        with open(schema) as f:
+            schema_data = safe_load(f)
+        schema_data["samples"]["output_file"] = {
+            "type": "file",
+            "description": "Output of the pipeline",
+        }
+        with open(schema, "w") as f:
+            dump(schema_data, f)
+        data_dir = os.path.join(os.path.dirname(tp), "data")
+        records = {
+            name: {
+                "output_file": {
+                    "path": os.path.join(data_dir, f"{name}.txt"),
+                    "title": f"Output of {name}",
+                }
+            }
+            for name in sample_names
+        }
+        results_dir = os.path.join(get_outdir(tp), "example_pipestat_pipeline")
+        os.makedirs(results_dir, exist_ok=True)
+        with open(os.path.join(results_dir, "results.yaml"), "w") as f:
+            dump({"example_pipestat_pipeline": {"project": {}, "sample": records}}, f)
+
+    def test_link_updates_only_changed_links(self, prep_temp_pep_pipestat):
+        tp = prep_temp_pep_pipestat
+        link_dir = os.path.join(get_outdir(tp), "output_file")
+
+        def link(name):
+            return os.path.join(link_dir, f"{name}_output_file_{name}.txt")
+
+        self._report_files(tp, ["frog_1"])
+        main(test_args=["link", "--config", tp])
+        with open(link("frog_1")) as f:
+            assert f.read()
+        linked = os.lstat(link("frog_1"))
+
+        self._report_files(tp, ["frog_1", "frog_2"])
+        main(test_args=["link", "--config", tp])
+        assert os.path.isfile(link("frog_2"))
+        # the link of the unchanged result is left alone
+        assert os.lstat(link("frog_1")).st_ino == linked.st_ino
+
+        self._report_files(tp, ["frog_2"])
+        main(test_args=["link", "--config", tp])
+        assert not os.path.lexists(link("frog_1"))
+        assert os.path.isfile(link("frog_2"))
+
+
+class TestLooperReport:
+    @staticmethod
+    def _report_lines(tp, lines_by_sample):
+        results_dir = os.path.join(get_outdir(tp), "example_pipestat_pipeline")
+        os.makedirs(results_dir, exist_ok=True)
+        records = {
+            name: {"number_of_lines": lines} for name, lines in lines_by_sample.items()
+        }
+        with open(os.path.join(results_dir, "results.yaml"), "w") as f:
+            dump({"example_pipestat_pipeline": {"project": {}, "sample": records}}, f)
+
+    def test_report_renders_only_changed_pages(self, prep_temp_pep_pipestat):
+        tp = prep_temp_pep_pipestat
+        self._report_lines(tp, {"frog_1": 1, "frog_2": 2})
+        index = main(test_args=["report", "--config", tp, "--jobs", "2"])[
+            "report_directory"
+        ]
+        reports = os.path.dirname(index)
+
+        def mtimes():
+            return {
+                name: os.stat(os.path.join(reports, name)).st_mtime_ns
+                for name in ["index.html", "frog_1.html", "frog_2.html"]
+            }
+
+        built = mtimes()
+        # nothing changed, nothing is rewritten
+        assert main(test_args=["report", "--config", tp])["report_directory"] == index
+        assert mtimes() == built
+
+        self._report_lines(tp, {"frog_1": 1, "frog_2": 20})
+        main(test_args=["report", "--config", tp])
+        rebuilt = mtimes()
+        assert rebuilt["frog_1.html"] == built["frog_1.html"]
+        assert rebuilt["frog_2.html"] != built["frog_2.html"]
+        assert rebuilt["index.html"] != built["index.html"]
+        with open(os.path.join(reports, "frog_2.html")) as f:
+            assert "20" in f.read()
+
+
+class TestLooperTable:
+    def test_table_tsv_has_typed_column_per_result(self, prep_temp_pep_pipestat):
+        tp = prep_temp_pep_pipestat
+        TestLooperReport._report_lines(tp, {"frog_1": 1, "frog_2": 22})
+        (path,) = main(test_args=["table", "--config", tp, "--format", "tsv"])
+        assert path.endswith("results.tsv")
+        df = pd.read_csv(path, sep="\t")
+        assert list(df.columns) == ["record_identifier", "number_of_lines"]
+        assert dict(zip(df.record_identifier, df.number_of_lines)) == {
+            "frog_1": 1,
+            "frog_2": 22,
+        }
+
+    def test_table_parquet(self, prep_temp_pep_pipestat):
+        pq = pytest.importorskip("pyarrow.parquet")
+        tp = prep_temp_pep_pipestat
+        TestLooperReport._report_lines(tp, {"frog_1": 1, "frog_2": 22})
+        (path,) = main(test_args=["table", "--config", tp, "--format", "parquet"])
+        table = pq.read_table(path)
+        assert str(table.schema.field("number_of_lines").type) == "int64"
+        assert table.column("number_of_lines").to_pylist() == [1, 22]
+
+    def test_table_rejects_unknown_format(self, prep_temp_pep_pipestat):
+        tp = prep_temp_pep_pipestat
+        with pytest.raises(SystemExit):
+            main(test_args=["table", "--config", tp, "--format", "xlsx"])
+
+
+class TestLooperClean:
+    @staticmethod
+    def _make_cleanup_scripts(tp, exit_code=0):
+        prj = Project(get_project_config_path(tp))
+        results = os.path.join(get_outdir(tp), "results_pipeline")
+        intermediates = []
+        for s in prj.samples:
+            folder = os.path.join(results, s.sample_name)
+            os.makedirs(folder)
+            for step in ["align", "sort"]:
+                intermediate = os.path.join(folder, f"{step}.tmp")
+                with open(intermediate, "w") as f:
+                    f.write("intermediate")
+                with open(os.path.join(folder, f"{step}_cleanup.sh"), "w") as f:
+                    f.write(f"rm {intermediate}\n")
+                intermediates.append(intermediate)
+        with open(os.path.join(folder, "fail_cleanup.sh"), "w") as f:
+            f.write(f"exit {exit_code}\n")
+        return intermediates
+
+    def test_clean_runs_cleanup_scripts(self, prep_temp_pep):
+        tp = prep_temp_pep
+        intermediates = self._make_cleanup_scripts(tp)
+        x = ["clean", "--config", tp, "--force-yes", "--jobs", "3"]
+        assert main(test_args=x) == 0
+        assert not any(os.path.exists(f) for f in intermediates)
+
+    def test_clean_reports_failed_cleanup_scripts(self, prep_temp_pep):
+        tp = prep_temp_pep
+        intermediates = self._make_cleanup_scripts(tp, exit_code=3)
+        x = ["clean", "--config", tp, "--force-yes", "--jobs", "3"]
+        assert main(test_args=x) == 1
+        # the other scripts run regardless
+        assert not any(os.path.exists(f) for f in intermediates)
+
+    def test_clean_submits_cleanup_jobs(self, prep_temp_pep):
+        tp = prep_temp_pep
+        intermediates = self._make_cleanup_scripts(tp)
+        x = ["clean", "--config", tp, "--force-yes", "--submit"]
+        assert main(test_args=x) == 0
+        # the default compute package runs the jobs right away
+        assert not any(os.path.exists(f) for f in intermediates)
+        sd = os.path.join(get_outdir(tp), "submission")
+        subs = sorted(f for f in os.listdir(sd) if f.endswith("_cleanup.sub"))
+        assert len(subs) == 3
+        with open(os.path.join(sd, subs[0])) as f:
+            assert "align_cleanup.sh" in f.read()
+
+    def test_clean_shards_cleanup_jobs(self, prep_temp_pep):
+        tp = prep_temp_pep
+        self._make_cleanup_scripts(tp)
+        x = ["clean", "--config", tp, "--force-yes", "--submit"]
+        assert main(test_args=x + ["--sharded-submission"]) == 0
+        sd = os.path.join(get_outdir(tp), "submission")
+        assert not [f for f in os.listdir(sd) if f.endswith(".sub")]
+        subs = [
+            os.path.join(shard, f)
+            for shard in os.listdir(sd)
+            for f in os.listdir(os.path.join(sd, shard))
+            if f.endswith("_cleanup.sub")
+        ]
+        assert len(subs) == 3
+        for sub in subs:
+            name = os.path.basename(sub)[: -len(".sub")]
+            assert os.path.dirname(sub) == submission_shard(name)
+
+
 class TestSelector:
     @pytest.mark.parametrize("flag_id", ["completed"])
     @pytest.mark.parametrize(
@@ -622,6 +884,37 @@ class TestSelector:
 
         assert len(subs_list) == 3
 
+    @pytest.mark.parametrize(
+        ["expression", "expected_subs"],
+        [
+            ("protocol == 'PROTO1'", 4),
+            ("protocol in ['PROTO1', 'PROTO2'] and read_length > 50", 4),
+            ("read_length > 50 and sample_name != 'sample3'", 2),
+            ("read_length > 100", 0),
+        ],
+    )
+    def test_selecting_by_expression(self, prep_temp_pep, expression, expected_subs):
+        """Verify selecting samples with an expression over their attributes"""
+        tp = prep_temp_pep
+        sample_csv = os.path.join(
+            os.path.dirname(get_project_config_path(tp)), "annotation_sheet.csv"
+        )
+        df = pd.read_csv(sample_csv)
+        df["read_length"] = [30, 60, 90]
+        df.to_csv(sample_csv, index=False)
+
+        x = ["run", "--dry-run", "--config", tp, "--sel-expr", expression]
+        main(test_args=x)
+
+        sd = os.path.join(get_outdir(tp), "submission")
+        subs = os.listdir(sd) if os.path.isdir(sd) else []
+        assert len([f for f in subs if f.endswith(".sub")]) == expected_subs
+
+    def test_invalid_selection_expression(self, prep_temp_pep):
+        x = ["run", "--dry-run", "--config", prep_temp_pep, "--sel-expr", "protocol =="]
+        with pytest.raises(MisconfigurationException):
+            main(test_args=x)
+
 
 class TestLooperInspect:
     @pytest.mark.parametrize("cmd", ["inspect"])
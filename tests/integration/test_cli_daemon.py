@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from pipestat import PipestatManager
+
+from looper.daemon import forward
+from tests.integration.conftest import get_outdir, make_fake_scheduler
+
+
+@pytest.fixture
+def daemon_socket(tmp_path):
+    path = str(tmp_path / "looper.sock")
+    code = (
+        f"from looper.cli_pydantic import main; main(['daemon', '--socket', {path!r}])"
+    )
+    proc = subprocess.Popen([sys.executable, "-c", code])
+    deadline = time.time() + 30
+    while not os.path.exists(path):
+        assert proc.poll() is None, "daemon exited"
+        assert time.time() < deadline, "daemon did not start"
+        time.sleep(0.1)
+    yield path
+    proc.terminate()
+    proc.wait()
+
+
+def test_daemon_runs_forwarded_commands(prep_temp_pep, daemon_socket, capsys):
+    tp = prep_temp_pep
+    for _ in range(2):
+        assert forward(["run", "--config", tp, "--dry-run"], daemon_socket) == 0
+        err = capsys.readouterr().err
+        assert "6 would have been" in err
+    sd = os.path.join(get_outdir(tp), "submission")
+    assert len([f for f in os.listdir(sd) if f.endswith(".sub")]) == 6
+
+
+def test_daemon_reports_failures(prep_temp_pep, daemon_socket, capsys):
+    code = forward(["run", "--config", prep_temp_pep, "--bogus"], daemon_socket)
+    assert code == 2
+    assert "unrecognized arguments" in capsys.readouterr().err
+
+
+def test_daemon_sees_results_reported_between_commands(
+    prep_temp_pep_pipestat, daemon_socket
+):
+    tp = prep_temp_pep_pipestat
+    summary = os.path.join(
+        get_outdir(tp), "example_pipestat_pipeline_stats_summary.tsv"
+    )
+    assert forward(["table", "--config", tp], daemon_socket) == 0
+    with open(summary) as f:
+        assert "4242" not in f.read()
+
+    psm = PipestatManager(
+        config_file=os.path.join(
+            get_outdir(tp), "pipestat_config_example_pipestat_pipeline.yaml"
+        )
+    )
+    psm.report(record_identifier="frog_1", values={"number_of_lines": 4242})
+
+    assert forward(["table", "--config", tp], daemon_socket) == 0
+    with open(summary) as f:
+        assert "4242" in f.read()
+
+
+def test_daemon_forwards_submission_command_output(
+    prep_temp_pep, daemon_socket, tmp_path, capsys
+):
+    divcfg, log = make_fake_scheduler(tmp_path, "Submitted batch job 1")
+    sub = tmp_path / "fake_sbatch"
+    sub.write_text(sub.read_text() + "echo scheduler says hi >&2\n")
+    x = ["run", "--config", prep_temp_pep, "--divvy", divcfg, "--package", "fake"]
+    assert forward(x, daemon_socket) == 0
+    assert len(log.read_text().splitlines()) == 6
+    assert capsys.readouterr().err.count("scheduler says hi") == 6
+
+
+def test_daemon_leaves_local_execution_to_client(prep_temp_pep, daemon_socket):
+    x = ["run", "--config", prep_temp_pep, "--package", "local"]
+    assert forward(x, daemon_socket) is None
+    sd = os.path.join(get_outdir(prep_temp_pep), "submission")
+    assert not os.path.isdir(sd) or not os.listdir(sd)
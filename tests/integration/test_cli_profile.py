@@ -0,0 +1,25 @@
+import json
+
+from looper.cli_pydantic import main
+from tests.integration.conftest import make_fake_scheduler
+
+
+def test_profile_trace_covers_phases(prep_temp_pep, tmp_path):
+    divcfg, _ = make_fake_scheduler(tmp_path, "Submitted batch job 1")
+    trace = tmp_path / "trace.json"
+    x = ["run", "--config", prep_temp_pep, "--divvy", divcfg, "--package", "fake"]
+    main(test_args=x + ["--profile-trace", str(trace)])
+
+    events = json.loads(trace.read_text())["traceEvents"]
+    names = {e["name"] for e in events}
+    assert {
+        "config.read",
+        "project.init",
+        "piface.parse",
+        "conductor.add_sample",
+        "script.render",
+        "script.divvy_write",
+        "job.submit",
+    } <= names
+    assert sum(e["name"] == "job.submit" for e in events) == 6
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
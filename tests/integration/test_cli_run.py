@@ -1,14 +1,23 @@
+import json
 import os.path
+import shutil
+import time
 
 import pytest
 from peppy.const import *
-from yaml import dump
+from yaml import dump, safe_load
 
 from looper.cli_pydantic import main
+from looper.conductor import submission_shard
 from looper.const import *
 from looper.exceptions import MisconfigurationException
+from looper.plugins import read_sample_jsonl
 from looper.project import Project
-from looper.utils import is_PEP_file_type, is_pephub_registry_path
+from looper.utils import (
+    is_PEP_file_type,
+    is_pephub_registry_path,
+    write_if_changed,
+)
 from tests.integration.conftest import (
     assert_content_in_all_files,
     assert_content_not_in_any_files,
@@ -333,6 +342,19 @@ class TestLooperRunpBehavior:
         except Exception:
             raise pytest.fail("DID RAISE {0}".format(Exception))
 
+    def test_looper_runp_plan_to_stdout(self, prep_temp_pep, capsys):
+        tp = prep_temp_pep
+        x = test_args_expansion(tp, "runp", ["--plan", "-"])
+        main(test_args=x)
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert len(records) == 2
+        for r in records:
+            assert r["sample"] is None
+            assert r["action"] == "submit"
+            assert "--project-name" in r["command"]
+        sd = os.path.join(get_outdir(tp), "submission")
+        assert not os.path.isdir(sd) or not os.listdir(sd)
+
     def test_looper_single_pipeline(self, prep_temp_pep):
         tp = prep_temp_pep
 
@@ -435,6 +457,267 @@ class TestLooperRunPreSubmissionHooks:
         sd = os.path.join(get_outdir(tp), "submission")
         verify_filecount_in_dir(sd, "test.txt", 3)
 
+    @pytest.mark.parametrize("hook_type", ["python", "command"])
+    def test_looper_batch_hooks(self, prep_temp_pep, hook_type):
+        tp = prep_temp_pep
+        pep_dir = os.path.dirname(tp)
+        pipeline_interface1 = os.path.join(
+            pep_dir, "pipeline/pipeline_interface1_sample.yaml"
+        )
+        script = os.path.join(pep_dir, "pipeline", "batch_hook.py")
+        with open(script, "w") as f:
+            f.write(
+                "import json, sys\n"
+                "lines = sys.stdin.readlines()\n"
+                "for line in lines:\n"
+                "    name = json.loads(line)['sample_name']\n"
+                "    tag = f'{name}_of_{len(lines)}'\n"
+                "    print(json.dumps({'sample': {'batch_tag': tag}}))\n"
+            )
+
+        with mod_yaml_data(pipeline_interface1) as piface_data:
+            piface_data[PRE_SUBMIT_HOOK_KEY][PRE_SUBMIT_PY_FUN_KEY] = []
+            if hook_type == "python":
+                hooks = {PRE_SUBMIT_BATCH_PY_FUN_KEY: [f"{__name__}.tag_samples"]}
+            else:
+                hooks = {PRE_SUBMIT_BATCH_CMD_KEY: [f"python3 {script}"]}
+            piface_data[PRE_SUBMIT_HOOK_KEY].update(hooks)
+            piface_data["sample_interface"]["command_template"] += (
+                " --tag {sample.batch_tag}"
+            )
+        BATCH_CALLS.clear()
+        x = test_args_expansion(tp, "run", ["--lump-n", "3"])
+        main(test_args=x)
+
+        if hook_type == "python":
+            assert BATCH_CALLS == [3]
+        sd = os.path.join(get_outdir(tp), "submission")
+        subs = [os.path.join(sd, f) for f in os.listdir(sd) if f.endswith(".sub")]
+        assert_content_in_all_files(
+            [f for f in subs if "PIPELINE1" in f], "--tag sample1_of_3"
+        )
+
+    def test_looper_batch_hook_compute_updates_are_per_sample(self, prep_temp_pep):
+        tp = prep_temp_pep
+        pep_dir = os.path.dirname(tp)
+        pipeline_interface1 = os.path.join(
+            pep_dir, "pipeline/pipeline_interface1_sample.yaml"
+        )
+        with mod_yaml_data(pipeline_interface1) as piface_data:
+            piface_data[PRE_SUBMIT_HOOK_KEY] = {
+                PRE_SUBMIT_BATCH_PY_FUN_KEY: [f"{__name__}.tag_compute"]
+            }
+            piface_data["sample_interface"]["command_template"] += (
+                " --ctag {compute.sample_tag}"
+            )
+        main(test_args=test_args_expansion(tp, "run", ["--lump-n", "3"]))
+
+        sd = os.path.join(get_outdir(tp), "submission")
+        (sub,) = [f for f in os.listdir(sd) if "PIPELINE1" in f and f.endswith(".sub")]
+        with open(os.path.join(sd, sub)) as f:
+            content = f.read()
+        for name in ["sample1", "sample2", "sample3"]:
+            assert f"--ctag {name}_compute" in content
+
+    def test_looper_batch_hook_update_count_checked(self, prep_temp_pep):
+        tp = prep_temp_pep
+        pep_dir = os.path.dirname(tp)
+        pipeline_interface1 = os.path.join(
+            pep_dir, "pipeline/pipeline_interface1_sample.yaml"
+        )
+        with mod_yaml_data(pipeline_interface1) as piface_data:
+            piface_data[PRE_SUBMIT_HOOK_KEY][PRE_SUBMIT_BATCH_CMD_KEY] = [
+                "{%raw%}echo {}{%endraw%}"
+            ]
+        x = test_args_expansion(tp, "run", ["--lump-n", "3"])
+        with pytest.raises(TypeError, match="one update per sample"):
+            main(test_args=x)
+
+    @pytest.mark.parametrize(
+        "plugin,appendix",
+        [
+            ("write_sample_yaml", "_sample.yaml"),
+            ("write_sample_yaml_prj", "_sample_prj.yaml"),
+        ],
+    )
+    def test_looper_batch_plugins_match_sample_plugins(
+        self, prep_temp_pep, plugin, appendix
+    ):
+        tp = prep_temp_pep
+        pep_dir = os.path.dirname(tp)
+        pipeline_interface1 = os.path.join(
+            pep_dir, "pipeline/pipeline_interface1_sample.yaml"
+        )
+        sd = os.path.join(get_outdir(tp), "submission")
+
+        def _run(hooks):
+            with mod_yaml_data(pipeline_interface1) as piface_data:
+                piface_data[PRE_SUBMIT_HOOK_KEY] = hooks
+            main(test_args=test_args_expansion(tp, "run", ["--lump-n", "3"]))
+            written = {}
+            for f in os.listdir(sd):
+                if f.endswith(appendix):
+                    with open(os.path.join(sd, f)) as fh:
+                        written[f] = safe_load(fh)
+            shutil.rmtree(sd)
+            return written
+
+        single = _run({PRE_SUBMIT_PY_FUN_KEY: [f"looper.{plugin}"]})
+        batch = _run({PRE_SUBMIT_BATCH_PY_FUN_KEY: [f"looper.{plugin}_batch"]})
+        assert len(single) == 3
+        assert batch == single
+
+    def test_looper_sample_jsonl_plugin(self, prep_temp_pep):
+        tp = prep_temp_pep
+        pep_dir = os.path.dirname(tp)
+        pipeline_interface1 = os.path.join(
+            pep_dir, "pipeline/pipeline_interface1_sample.yaml"
+        )
+        with mod_yaml_data(pipeline_interface1) as piface_data:
+            piface_data[PRE_SUBMIT_HOOK_KEY] = {
+                PRE_SUBMIT_BATCH_PY_FUN_KEY: ["looper.write_sample_jsonl"]
+            }
+            piface_data["sample_interface"]["command_template"] += (
+                " --samples {sample.sample_jsonl_path}"
+                " --offset {sample.sample_jsonl_offset}"
+            )
+        main(test_args=test_args_expansion(tp, "run", ["--lump-n", "3"]))
+
+        sd = os.path.join(get_outdir(tp), "submission")
+        (jsonl,) = [f for f in os.listdir(sd) if f.endswith("_samples.jsonl")]
+        path = os.path.join(sd, jsonl)
+        sample = read_sample_jsonl(path, "sample3")
+        assert sample["sample_name"] == "sample3"
+        with open(path) as f:
+            assert len(f.readlines()) == 3
+        subs = [os.path.join(sd, f) for f in os.listdir(sd) if "PIPELINE1" in f]
+        assert_content_in_all_files(
+            [f for f in subs if f.endswith(".sub")], f"--samples {path}"
+        )
+
+    @pytest.mark.parametrize(
+        "hooks",
+        [
+            {
+                PRE_SUBMIT_PY_FUN_KEY: ["looper.write_custom_template"],
+                PRE_SUBMIT_CMD_KEY: [
+                    "python3 {script} {sample.custom_template_output}"
+                ],
+            },
+            {
+                PRE_SUBMIT_BATCH_PY_FUN_KEY: ["looper.write_custom_template_batch"],
+                PRE_SUBMIT_BATCH_CMD_KEY: ["python3 {script}"],
+            },
+        ],
+    )
+    def test_looper_command_reads_plugin_output(
+        self, prep_temp_pep, hooks, monkeypatch
+    ):
+        tp = prep_temp_pep
+        pep_dir = os.path.dirname(tp)
+        pipeline_interface1 = os.path.join(
+            pep_dir, "pipeline/pipeline_interface1_sample.yaml"
+        )
+        template = os.path.join(pep_dir, "pipeline", "custom_template.txt")
+        with open(template, "w") as f:
+            f.write("{{ sample.sample_name }}")
+        script = os.path.join(pep_dir, "pipeline", "read_output.py")
+        with open(script, "w") as f:
+            f.write(
+                "import json, sys\n"
+                "def tag(path):\n"
+                "    with open(path) as f:\n"
+                "        return json.dumps({'sample': {'written': f.read()}})\n"
+                "if len(sys.argv) > 1:\n"
+                "    print(tag(sys.argv[1]))\n"
+                "else:\n"
+                "    for line in sys.stdin:\n"
+                "        print(tag(json.loads(line)['custom_template_output']))\n"
+            )
+        with mod_yaml_data(pipeline_interface1) as piface_data:
+            piface_data[PRE_SUBMIT_HOOK_KEY] = {
+                key: [v.replace("{script}", script) for v in value]
+                for key, value in hooks.items()
+            }
+            piface_data["var_templates"]["custom_template"] = template
+            piface_data["sample_interface"]["command_template"] += (
+                " --written {sample.written}"
+            )
+
+        def slow_write(path, content):
+            time.sleep(0.2)
+            return write_if_changed(path, content)
+
+        monkeypatch.setattr("looper.plugins.write_if_changed", slow_write)
+        main(test_args=test_args_expansion(tp, "run", ["--lump-n", "3"]))
+
+        sd = os.path.join(get_outdir(tp), "submission")
+        subs = [
+            os.path.join(sd, f)
+            for f in os.listdir(sd)
+            if "PIPELINE1" in f and f.endswith(".sub")
+        ]
+        # the commands wait for the output of the plugins
+        for name in ["sample1", "sample2", "sample3"]:
+            assert_content_in_all_files(subs, f"--written {name}")
+
+    @pytest.mark.parametrize(
+        "hooks",
+        [
+            {PRE_SUBMIT_PY_FUN_KEY: ["looper.write_custom_template"]},
+            {PRE_SUBMIT_BATCH_PY_FUN_KEY: ["looper.write_custom_template_batch"]},
+        ],
+    )
+    def test_looper_custom_template_plugin(self, prep_temp_pep, hooks):
+        tp = prep_temp_pep
+        pep_dir = os.path.dirname(tp)
+        pipeline_interface1 = os.path.join(
+            pep_dir, "pipeline/pipeline_interface1_sample.yaml"
+        )
+        template = os.path.join(pep_dir, "pipeline", "custom_template.txt")
+        with open(template, "w") as f:
+            f.write("name: {{ sample.sample_name }}\n")
+        with mod_yaml_data(pipeline_interface1) as piface_data:
+            piface_data[PRE_SUBMIT_HOOK_KEY] = hooks
+            piface_data["var_templates"]["custom_template"] = template
+        x = test_args_expansion(tp, "run", ["--lump-n", "3"])
+        output = os.path.join(get_outdir(tp), "submission", "sample1config.yaml")
+
+        main(test_args=x)
+        with open(output) as f:
+            assert f.read() == "name: sample1"
+        # unchanged output isn't rewritten
+        mtime = os.stat(output).st_mtime_ns
+        main(test_args=x)
+        assert os.stat(output).st_mtime_ns == mtime
+
+        # a changed template is compiled anew
+        with open(template, "w") as f:
+            f.write("sample: {{ sample.sample_name }}\n")
+        main(test_args=x)
+        with open(output) as f:
+            assert f.read() == "sample: sample1"
+
+
+BATCH_CALLS = []
+
+
+def tag_samples(pooled):
+    """Batch pre-submit function used in the tests above."""
+    BATCH_CALLS.append(len(pooled))
+    return [
+        {"sample": {"batch_tag": f"{ns['sample'].sample_name}_of_{len(pooled)}"}}
+        for ns in pooled
+    ]
+
+
+def tag_compute(pooled):
+    """Batch pre-submit function giving each sample its own compute setting."""
+    return [
+        {"compute": {"sample_tag": f"{ns['sample'].sample_name}_compute"}}
+        for ns in pooled
+    ]
+
 
 class TestLooperRunSubmissionScript:
     def test_looper_run_produces_submission_scripts(self, prep_temp_pep):
@@ -449,6 +732,108 @@ class TestLooperRunSubmissionScript:
         sd = os.path.join(outdir, "submission")
         verify_filecount_in_dir(sd, ".sub", 6)
 
+    def test_looper_sharded_submission(self, prep_temp_pep):
+        tp = prep_temp_pep
+        x = test_args_expansion(tp, "run", ["--sharded-submission"])
+        main(test_args=x)
+
+        sd = os.path.join(get_outdir(tp), "submission")
+        assert not [f for f in os.listdir(sd) if f.endswith((".sub", ".yaml"))]
+        subs = []
+        for shard in os.listdir(sd):
+            if os.path.isdir(os.path.join(sd, shard)):
+                for f in os.listdir(os.path.join(sd, shard)):
+                    if f.endswith(".sub"):
+                        subs.append(os.path.join(sd, shard, f))
+        assert len(subs) == 6
+        for sub in subs:
+            name = os.path.basename(sub)[: -len(".sub")]
+            assert os.path.basename(os.path.dirname(sub)) == submission_shard(name)
+            # the log goes next to the script
+            assert_content_in_all_files([sub], sub[: -len(".sub")] + ".log")
+        yamls = [
+            os.path.join(shard, f)
+            for shard in os.listdir(sd)
+            if os.path.isdir(os.path.join(sd, shard))
+            for f in os.listdir(os.path.join(sd, shard))
+            if f.endswith(".yaml")
+        ]
+        assert yamls
+        for path in yamls:
+            name = os.path.splitext(os.path.basename(path))[0]
+            assert os.path.dirname(path) == submission_shard(name)
+
+    def test_looper_plan(self, prep_temp_pep, tmp_path):
+        tp = prep_temp_pep
+        outdir = get_outdir(tp)
+        sample_name = Project(get_project_config_path(tp)).samples[0].sample_name
+        flag_dir = os.path.join(outdir, "results_pipeline", sample_name)
+        os.makedirs(flag_dir)
+        with open(
+            os.path.join(flag_dir, f"PIPELINE1_{sample_name}_completed.flag"), "w"
+        ) as f:
+            f.write("completed")
+
+        plan_path = str(tmp_path / "plan.jsonl")
+        x = test_args_expansion(tp, "run", ["--plan", plan_path, "--lump-n", "2"])
+        result = main(test_args=x)
+
+        # no job scripts, no submission
+        sd = os.path.join(outdir, "submission")
+        assert not [f for f in os.listdir(sd) if f.endswith(".sub")]
+        assert result[DEBUG_JOBS] == 0
+        with open(plan_path) as f:
+            records = [json.loads(line) for line in f]
+        assert len(records) == 6
+        skipped = [r for r in records if r["action"] == "skip"]
+        assert [(r["pipeline"], r["sample"]) for r in skipped] == [
+            ("PIPELINE1", sample_name)
+        ]
+        # statuses are the flag files, when pipestat isn't configured
+        assert skipped[0]["status"][0].endswith("_completed.flag")
+        assert "Skipping sample" in skipped[0]["skip_reasons"][0]
+        submitted = [r for r in records if r["action"] == "submit"]
+        assert len(submitted) == 5
+        pipeline1_jobs = {
+            r["job_name"] for r in submitted if r["pipeline"] == "PIPELINE1"
+        }
+        assert pipeline1_jobs == {"PIPELINE1_lump1"}
+        for r in submitted:
+            assert r["sample"] in r["command"]
+            assert r["compute_package"] == "default"
+            assert isinstance(r["resources"], dict)
+
+    def test_looper_skips_unchanged_submission_scripts(self, prep_temp_pep):
+        tp = prep_temp_pep
+        x = test_args_expansion(tp, "run")
+        sd = os.path.join(get_outdir(tp), "submission")
+
+        def _mtimes():
+            return {
+                f: os.stat(os.path.join(sd, f)).st_mtime_ns
+                for f in os.listdir(sd)
+                if f.endswith(".sub")
+            }
+
+        main(test_args=x)
+        written = _mtimes()
+        assert len(written) == 6
+        main(test_args=x)
+        assert _mtimes() == written
+
+        # scripts edited outside of looper are rewritten
+        edited = os.path.join(sd, sorted(written)[0])
+        with open(edited, "a") as f:
+            f.write("# edited\n")
+        main(test_args=x)
+        with open(edited) as f:
+            assert "# edited" not in f.read()
+
+        # and so are scripts with new content
+        main(test_args=x + ["--command-extra=--new-arg"])
+        assert all(_mtimes()[f] != written[f] for f in written)
+        assert_content_in_all_files([os.path.join(sd, f) for f in written], "--new-arg")
+
     def test_looper_lumping(self, prep_temp_pep):
         tp = prep_temp_pep
         x = test_args_expansion(tp, "run", ["--lump-n", "2"])
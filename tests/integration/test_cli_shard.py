@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from looper.cli_pydantic import main
+from looper.project import Project
+from looper.utils import sample_folder, sample_in_shard
+from tests.integration.conftest import get_outdir, get_project_config_path
+
+
+def _sub_files(looper_config):
+    sd = os.path.join(get_outdir(looper_config), "submission")
+    if not os.path.isdir(sd):
+        return set()
+    return {f for f in os.listdir(sd) if f.endswith(".sub")}
+
+
+@pytest.mark.parametrize("num_shards", [2, 3])
+def test_run_shards_partition_samples(prep_temp_pep, num_shards):
+    tp = prep_temp_pep
+    x = ["run", "--config", tp, "--dry-run", "--shard"]
+    per_shard = []
+    for k in range(1, num_shards + 1):
+        before = _sub_files(tp)
+        main(test_args=x + [f"{k}/{num_shards}"])
+        per_shard.append(_sub_files(tp) - before)
+
+    union = set().union(*per_shard)
+    assert sum(len(s) for s in per_shard) == len(union)
+    # 3 samples, 2 sample pipelines each
+    assert len(union) == 6
+
+
+def test_destroy_shards_partition_samples(prep_temp_pep):
+    tp = prep_temp_pep
+    prj = Project(cfg=get_project_config_path(tp), output_dir=get_outdir(tp))
+    folders = {s.sample_name: sample_folder(prj, s) for s in prj.samples}
+    for folder in folders.values():
+        os.makedirs(folder)
+
+    x = ["destroy", "--config", tp, "--force-yes"]
+    main(test_args=x + ["--shard", "1/2"])
+    removed = {name for name, f in folders.items() if not os.path.exists(f)}
+    main(test_args=x + ["--shard", "2/2"])
+
+    assert removed == {name for name in folders if sample_in_shard(name, 1, 2)}
+    assert all(not os.path.exists(f) for f in folders.values())
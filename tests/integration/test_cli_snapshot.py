@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from looper.cli_pydantic import main
+from looper.const import DEBUG_COMMANDS
+from looper.project import Project
+from looper.snapshot import SNAPSHOT_DIRNAME
+from tests.integration.conftest import get_outdir
+
+
+def _count_constructions(monkeypatch):
+    calls = []
+    init = Project.__init__
+
+    def counting_init(self, *args, **kwargs):
+        calls.append(1)
+        init(self, *args, **kwargs)
+
+    monkeypatch.setattr(Project, "__init__", counting_init)
+    return calls
+
+
+def test_snapshot_reused_until_sample_table_changes(prep_temp_pep, monkeypatch):
+    tp = prep_temp_pep
+    calls = _count_constructions(monkeypatch)
+    x = ["run", "--config", tp, "--dry-run", "--project-snapshot"]
+
+    assert main(test_args=x)[DEBUG_COMMANDS] == "6 of 6"
+    assert os.listdir(os.path.join(get_outdir(tp), SNAPSHOT_DIRNAME))
+    assert main(test_args=x)[DEBUG_COMMANDS] == "6 of 6"
+    assert len(calls) == 1
+
+    table = os.path.join(os.path.dirname(tp), "project", "annotation_sheet.csv")
+    with open(table, "a") as f:
+        f.write("sample4,PROTO1,SRA,SRR5210417,GSM2471256,SRA_1,SRA_2\n")
+    assert main(test_args=x)[DEBUG_COMMANDS] == "8 of 8"
+    assert len(calls) == 2
+
+
+def test_snapshot_keyed_by_arguments(prep_temp_pep, monkeypatch):
+    tp = prep_temp_pep
+    calls = _count_constructions(monkeypatch)
+    x = ["run", "--config", tp, "--dry-run", "--project-snapshot"]
+    main(test_args=x)
+    main(test_args=x + ["--skip-file-checks"])
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("untrusted", ["world_writable", "foreign_owner"])
+def test_untrusted_snapshot_is_ignored(prep_temp_pep, monkeypatch, untrusted):
+    tp = prep_temp_pep
+    x = ["run", "--config", tp, "--dry-run", "--project-snapshot"]
+    main(test_args=x)
+    cache = os.path.join(get_outdir(tp), SNAPSHOT_DIRNAME)
+    (snapshot,) = os.listdir(cache)
+    if untrusted == "world_writable":
+        os.chmod(os.path.join(cache, snapshot), 0o666)
+    else:
+        uid = os.getuid()
+        monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+
+    calls = _count_constructions(monkeypatch)
+    assert main(test_args=x)[DEBUG_COMMANDS] == "6 of 6"
+    assert len(calls) == 1
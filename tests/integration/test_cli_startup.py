@@ -35,3 +35,50 @@ def test_subcommand_help_startup_time():
 
     assert result.returncode == 0, f"run --help failed: {result.stderr}"
     assert elapsed < 0.5, f"CLI run --help took {elapsed:.2f}s, should be < 0.5s"
+
+
+def _import_times(*args):
+    """Run the looper CLI with -X importtime.
+
+    Returns:
+        dict: Cumulative import time in microseconds of each imported module;
+            nested imports are keyed with their indentation.
+    """
+    result = subprocess.run(
+        [
+            "python",
+            "-X",
+            "importtime",
+            "-c",
+            "from looper.cli_pydantic import main_cli; main_cli()",
+            *args,
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name[1:]] = int(cumulative)
+    return times
+
+
+def test_version_import_budget():
+    """Ensure --version imports next to nothing beyond the interpreter."""
+    times = _import_times("--version")
+    loaded = {name.strip() for name in times}
+    for heavy in ["pydantic_settings", "peppy", "pandas", "eido", "pipestat"]:
+        assert heavy not in loaded
+    looper_time = sum(t for name, t in times.items() if name.startswith("looper"))
+    assert looper_time < 150_000, f"--version imports took {looper_time} us"
+
+
+def test_check_skips_unneeded_imports(prep_temp_pep_pipestat):
+    """Ensure check doesn't load the dependencies of other commands."""
+    times = _import_times("check", "--config", prep_temp_pep_pipestat)
+    loaded = {name.strip() for name in times}
+    for unneeded in ["pephubclient", "jinja2", "psutil"]:
+        assert unneeded not in loaded
@@ -0,0 +1,32 @@
+import pytest
+
+from looper.cli_pydantic import main
+from tests.integration.conftest import make_fake_scheduler
+
+
+def test_then_runp_depends_on_sample_jobs(prep_temp_pep, tmp_path):
+    divcfg, log = make_fake_scheduler(tmp_path, "Submitted batch job 42")
+    x = ["run", "--config", prep_temp_pep, "--divvy", divcfg, "--package", "fake"]
+    main(test_args=x + ["--then-runp"])
+    lines = log.read_text().splitlines()
+    dependent = [line for line in lines if "--dependency=afterok:" in line]
+    # 6 sample jobs, then 2 project pipelines waiting on all of them
+    assert len(lines) == 8
+    assert len(dependent) == 2
+    assert all(":".join(["42"] * 6) in line for line in dependent)
+
+
+def test_then_runp_refuses_unknown_job_ids(prep_temp_pep, tmp_path):
+    divcfg, log = make_fake_scheduler(tmp_path, "queued")
+    x = ["run", "--config", prep_temp_pep, "--divvy", divcfg, "--package", "fake"]
+    with pytest.raises(SystemExit):
+        main(test_args=x + ["--then-runp"])
+    lines = log.read_text().splitlines()
+    assert len(lines) == 6
+    assert not any("--dependency" in line for line in lines)
+
+
+def test_then_runp_rejects_shard(prep_temp_pep):
+    x = ["run", "--config", prep_temp_pep, "--dry-run", "--then-runp"]
+    with pytest.raises(SystemExit):
+        main(test_args=x + ["--shard", "1/2"])
@@ -0,0 +1,117 @@
+import os
+import time
+
+from looper.cli_pydantic import main
+from looper.const import DEBUG_COMMANDS
+from looper.project import Project
+from tests.integration.conftest import (
+    get_outdir,
+    get_project_config_path,
+    make_fake_scheduler,
+    mod_yaml_data,
+)
+
+
+def test_watch_submits_each_sample_once(prep_temp_pep):
+    tp = prep_temp_pep
+    x = ["watch", "--config", tp, "--dry-run", "--poll-interval", "0"]
+    x += ["--max-polls", "2"]
+    result = main(test_args=x)
+    assert result[DEBUG_COMMANDS] == 6
+    sd = os.path.join(get_outdir(tp), "submission")
+    assert len([f for f in os.listdir(sd) if f.endswith(".sub")]) == 6
+
+
+def test_reload_samples_reuses_interfaces(prep_temp_pep):
+    tp = prep_temp_pep
+    prj = Project(
+        cfg=get_project_config_path(tp),
+        sample_pipeline_interfaces=[
+            os.path.join(
+                os.path.dirname(tp), "pipeline/pipeline_interface1_sample.yaml"
+            )
+        ],
+    )
+    assert len(prj.samples) == 3
+    piface = prj.get_sample_piface("sample1")[0]
+
+    with open(prj.sample_table_sources[0], "a") as f:
+        f.write("sample4,PROTO1,SRA,SRR5210417,GSM2471256,SRA_1,SRA_2\n")
+    prj.reload_samples()
+
+    assert len(prj.samples) == 4
+    assert prj.get_sample_piface("sample4")[0] is piface
+
+
+def _sleep_then(monkeypatch, action):
+    """Make the first pause between polls run the given action instead."""
+    calls = []
+
+    def fake_sleep(seconds):
+        if not calls:
+            action()
+        calls.append(seconds)
+
+    monkeypatch.setattr("looper.looper.time.sleep", fake_sleep)
+
+
+def test_watch_submits_appended_sample(prep_temp_pep, monkeypatch):
+    tp = prep_temp_pep
+    table = os.path.join(os.path.dirname(tp), "project", "annotation_sheet.csv")
+
+    def append_sample():
+        with open(table, "a") as f:
+            f.write("sample4,PROTO1,SRA,SRR5210417,GSM2471256,SRA_1,SRA_2\n")
+        later = time.time() + 5
+        os.utime(table, (later, later))
+
+    _sleep_then(monkeypatch, append_sample)
+    x = ["watch", "--config", tp, "--dry-run", "--poll-interval", "0"]
+    result = main(test_args=x + ["--max-polls", "2"])
+    # 3 samples, then the appended one, each with 2 sample pipelines
+    assert result[DEBUG_COMMANDS] == 8
+
+
+def test_watch_retries_samples_missing_inputs(prep_temp_pep, monkeypatch, tmp_path):
+    tp = prep_temp_pep
+    schema = tmp_path / "input_schema.yaml"
+    schema.write_text(
+        "properties:\n"
+        "  samples:\n"
+        "    type: array\n"
+        "    items:\n"
+        "      type: object\n"
+        "      tangible: [read1]\n"
+    )
+    piface = os.path.join(
+        os.path.dirname(tp), "pipeline", "pipeline_interface1_sample.yaml"
+    )
+    with mod_yaml_data(piface) as piface_data:
+        piface_data["input_schema"] = str(schema)
+    with mod_yaml_data(get_project_config_path(tp)) as config_data:
+        sources = config_data["sample_modifiers"]["derive"]["sources"]
+        sources["SRA_1"] = str(tmp_path / "{SRR}_1.fastq.gz")
+
+    _sleep_then(monkeypatch, lambda: (tmp_path / "SRR5210416_1.fastq.gz").touch())
+    x = ["watch", "--config", tp, "--dry-run", "--poll-interval", "0"]
+    result = main(test_args=x + ["--max-polls", "3"])
+    # OTHER_PIPELINE2 for every sample, PIPELINE1 only for sample1 once its
+    # input file appears
+    assert result[DEBUG_COMMANDS] == 4
+
+
+def test_watch_retries_failed_submissions(prep_temp_pep, monkeypatch, tmp_path):
+    divcfg, log = make_fake_scheduler(tmp_path, "Submitted batch job 1")
+    # The scheduler is down until the first pause between polls
+    down = tmp_path / "down"
+    down.touch()
+    sub = tmp_path / "fake_sbatch"
+    lines = sub.read_text().splitlines()
+    lines.insert(1, f"[ -e {down} ] && exit 1")
+    sub.write_text("\n".join(lines) + "\n")
+
+    _sleep_then(monkeypatch, down.unlink)
+    x = ["watch", "--config", prep_temp_pep, "--divvy", divcfg, "--package", "fake"]
+    result = main(test_args=x + ["--poll-interval", "0", "--max-polls", "3"])
+    assert result[DEBUG_COMMANDS] == 6
+    assert len(log.read_text().splitlines()) == 6
@@ -0,0 +1,42 @@
+import gc
+
+from looper.project import CompactSamples, Project, fetch_samples
+from tests.integration.conftest import get_outdir, get_project_config_path
+
+
+def _project(looper_config):
+    return Project(
+        cfg=get_project_config_path(looper_config),
+        output_dir=get_outdir(looper_config),
+    )
+
+
+def test_compact_samples_match_full_samples(prep_temp_pep):
+    expected = [s.to_dict() for s in _project(prep_temp_pep).samples]
+    prj = _project(prep_temp_pep)
+    prj.compact_samples()
+
+    assert isinstance(prj.samples, CompactSamples)
+    assert [s.to_dict() for s in prj.samples] == expected
+    assert prj.samples[-1].sample_name == "sample3"
+    assert prj.samples[0].project is prj
+
+
+def test_compact_samples_are_created_on_access(prep_temp_pep):
+    prj = _project(prep_temp_pep)
+    prj.compact_samples()
+
+    sample = prj.samples[1]
+    assert prj.samples[1] is sample
+    del sample
+    gc.collect()
+    assert len(prj.samples._live) == 0
+
+
+def test_selection_on_compact_samples(prep_temp_pep):
+    prj = _project(prep_temp_pep)
+    prj.compact_samples()
+    selected = fetch_samples(
+        prj, selector_attribute="protocol", selector_include=["PROTO1"]
+    )
+    assert [s.sample_name for s in selected] == ["sample1", "sample2"]
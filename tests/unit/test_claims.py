@@ -0,0 +1,106 @@
+"""Tests for advisory claim files"""
+
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from looper.utils import _break_stale_claim, acquire_claim, release_claim
+
+
+def test_claim_is_exclusive(tmp_path):
+    claim = str(tmp_path / "claims" / "PIPELINE1_sample1.claim")
+    assert acquire_claim(claim, ttl=60)
+    assert os.path.isfile(claim)
+    assert not acquire_claim(claim, ttl=60)
+
+
+def test_released_claim_can_be_reacquired(tmp_path):
+    claim = str(tmp_path / "PIPELINE1_sample1.claim")
+    assert acquire_claim(claim, ttl=60)
+    release_claim(claim)
+    assert not os.path.exists(claim)
+    assert acquire_claim(claim, ttl=60)
+
+
+def test_stale_claim_is_broken(tmp_path):
+    claim = str(tmp_path / "PIPELINE1_sample1.claim")
+    assert acquire_claim(claim, ttl=60)
+    old = time.time() - 120
+    os.utime(claim, (old, old))
+    assert acquire_claim(claim, ttl=60)
+    assert os.path.getmtime(claim) > old
+
+
+def test_release_missing_claim(tmp_path):
+    release_claim(str(tmp_path / "missing.claim"))
+
+
+def test_fresh_claim_survives_late_breaker(tmp_path):
+    """A process acting on an outdated stale observation keeps its hands off."""
+    claim = str(tmp_path / "PIPELINE1_sample1.claim")
+    assert acquire_claim(claim, ttl=60)
+    old = time.time() - 120
+    os.utime(claim, (old, old))
+    seen_stale = os.stat(claim)
+
+    assert acquire_claim(claim, ttl=60)  # another process breaks and reclaims
+    with open(claim) as f:
+        fresh = f.read()
+    assert not _break_stale_claim(claim, seen_stale)
+    with open(claim) as f:
+        assert f.read() == fresh
+    assert not acquire_claim(claim, ttl=60)
+    assert os.listdir(tmp_path) == ["PIPELINE1_sample1.claim"]
+
+
+def _acquire_after(barrier, claim, results):
+    barrier.wait()
+    results.put(acquire_claim(claim, ttl=60))
+
+
+@pytest.mark.parametrize("attempt", range(5))
+def test_concurrent_breakers_acquire_once(tmp_path, attempt):
+    claim = str(tmp_path / "PIPELINE1_sample1.claim")
+    assert acquire_claim(claim, ttl=60)
+    old = time.time() - 120
+    os.utime(claim, (old, old))
+
+    ctx = multiprocessing.get_context("fork")
+    num_procs = 6
+    barrier, results = ctx.Barrier(num_procs), ctx.Queue()
+    procs = [
+        ctx.Process(target=_acquire_after, args=(barrier, claim, results))
+        for _ in range(num_procs)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    assert sorted(results.get() for _ in procs) == [False] * (num_procs - 1) + [True]
+
+
+def test_fresh_claim_is_kept_if_restoring_it_fails(tmp_path, monkeypatch):
+    """A fresh claim is never removed, even if a third one took its place."""
+    claim = str(tmp_path / "PIPELINE1_sample1.claim")
+    assert acquire_claim(claim, ttl=60)
+    old = time.time() - 120
+    os.utime(claim, (old, old))
+    seen_stale = os.stat(claim)
+    assert acquire_claim(claim, ttl=60)
+    with open(claim) as f:
+        fresh = f.read()
+
+    link = os.link
+
+    def link_after_third_claim(src, dst):
+        with open(dst, "w") as f:
+            f.write("third")
+        link(src, dst)
+
+    monkeypatch.setattr(os, "link", link_after_third_claim)
+    assert not _break_stale_claim(claim, seen_stale)
+    (tombstone,) = [p for p in os.listdir(tmp_path) if p.endswith(".stale")]
+    with open(tmp_path / tombstone) as f:
+        assert f.read() == fresh
@@ -0,0 +1,88 @@
+"""Tests for the looper daemon client and project cache"""
+
+import os
+import time
+
+import pytest
+
+from looper.daemon import (
+    DAEMON_SOCKET_VARNAME,
+    ProjectCache,
+    _command_name,
+    _private_dir_problem,
+    default_socket_path,
+    forward,
+    serve,
+)
+
+
+@pytest.mark.parametrize(
+    ["argv", "expected"],
+    [
+        (["run", "--dry-run"], "run"),
+        (["--silent", "check"], "check"),
+        (["--verbosity", "5", "table", "--config", "x.yaml"], "table"),
+        (["--help"], None),
+    ],
+)
+def test_command_name(argv, expected):
+    assert _command_name(argv) == expected
+
+
+def test_forward_without_daemon(tmp_path):
+    assert forward(["run"], str(tmp_path / "missing.sock")) is None
+
+
+def test_forward_skips_interactive_commands(tmp_path):
+    assert forward(["destroy"], str(tmp_path / "missing.sock")) is None
+
+
+def test_default_socket_in_runtime_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv(DAEMON_SOCKET_VARNAME, raising=False)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert default_socket_path() == str(tmp_path / "looper.sock")
+
+
+def test_default_socket_in_private_temp_dir(monkeypatch):
+    monkeypatch.delenv(DAEMON_SOCKET_VARNAME, raising=False)
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    socket_dir = os.path.dirname(default_socket_path())
+    assert os.path.basename(socket_dir) == f"looper-{os.getuid()}"
+
+
+def test_shared_socket_dir_is_refused(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    assert "writable by other users" in _private_dir_problem(str(shared))
+    assert serve(str(shared / "looper.sock")) == 1
+    assert not (shared / "looper.sock").exists()
+
+
+class TestProjectCache:
+    def test_hit(self, tmp_path):
+        src = tmp_path / "project_config.yaml"
+        src.write_text("name: test\n")
+        cache = ProjectCache()
+        prj = object()
+        cache.put("key", prj, [str(src)])
+        assert cache.get("key") is prj
+        assert cache.get("other") is None
+
+    def test_changed_source_invalidates(self, tmp_path):
+        src = tmp_path / "annotation_sheet.csv"
+        src.write_text("sample_name\ns1\n")
+        cache = ProjectCache()
+        cache.put("key", object(), [str(src)])
+        later = time.time() + 10
+        os.utime(src, (later, later))
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_removed_source_invalidates(self, tmp_path):
+        src = tmp_path / "pipeline_interface.yaml"
+        src.write_text("pipeline_name: test\n")
+        cache = ProjectCache()
+        cache.put("key", object(), [str(src)])
+        src.unlink()
+        assert cache.get("key") is None
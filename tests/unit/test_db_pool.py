@@ -0,0 +1,64 @@
+"""Tests for the database engines shared by pipestat managers"""
+
+from types import SimpleNamespace
+
+import pytest
+from pipestat import PipestatManager
+
+from looper.db_pool import dispose_engines, share_engine, shared_engine
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_engines():
+    dispose_engines()
+    yield
+    dispose_engines()
+
+
+def _db_psm(db_url, **dbconf):
+    """Pipestat manager backed by a database, with an engine of its own."""
+    backend = SimpleNamespace(
+        db_url=db_url,
+        show_db_logs=False,
+        db_engine_key=sqlalchemy.create_engine(db_url),
+    )
+    return SimpleNamespace(backend=backend, cfg={"_config": {"database": dbconf}})
+
+
+def test_one_engine_per_database(tmp_path):
+    first = f"sqlite:///{tmp_path / 'first.sqlite'}"
+    second = f"sqlite:///{tmp_path / 'second.sqlite'}"
+    assert shared_engine(first) is shared_engine(first)
+    assert shared_engine(first) is not shared_engine(second)
+
+
+def test_managers_of_a_database_share_its_pool(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'results.sqlite'}"
+    psms = [_db_psm(db_url, pool_size=3, pool_recycle="60") for _ in range(3)]
+    own = psms[0].backend.db_engine_key
+    assert all(share_engine(psm) for psm in psms)
+    engines = {id(psm.backend.db_engine_key) for psm in psms}
+    assert len(engines) == 1
+    engine = psms[0].backend.db_engine_key
+    assert engine is not own
+    assert engine.pool.size() == 3
+    assert engine.pool._recycle == 60
+    with engine.connect() as conn:
+        assert conn.execute(sqlalchemy.text("select 1")).scalar() == 1
+
+
+def test_file_backed_manager_is_left_alone(tmp_path):
+    schema = tmp_path / "schema.yaml"
+    schema.write_text(
+        "pipeline_name: pl\n"
+        "samples:\n"
+        "  reads:\n"
+        "    type: integer\n"
+        "    description: reads\n"
+    )
+    psm = PipestatManager(
+        schema_path=str(schema), results_file_path=str(tmp_path / "results.yaml")
+    )
+    assert not share_engine(psm)
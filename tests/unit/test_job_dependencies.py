@@ -0,0 +1,66 @@
+"""Tests for scheduler job ID capture and dependency rendering."""
+
+import pytest
+import yaml
+
+from looper.conductor import _parse_job_id, _render_dependency
+from looper.const import DEFAULT_CONFIG_FILEPATH
+
+
+class TestParseJobId:
+    @pytest.mark.parametrize(
+        ["output", "pattern", "expected"],
+        [
+            ("Submitted batch job 12345\n", r"Submitted batch job (\d+)", "12345"),
+            (
+                'Your job 678 ("job") has been submitted\n',
+                r"Your job (\d+)",
+                "678",
+            ),
+            ("Job <42> is submitted to queue <normal>.", r"<\d+>", "<42>"),
+        ],
+    )
+    def test_matches(self, output, pattern, expected):
+        assert _parse_job_id(output, pattern) == expected
+
+    @pytest.mark.parametrize("output", ["", None, "sbatch: error: invalid partition"])
+    def test_no_match(self, output):
+        assert _parse_job_id(output, r"Submitted batch job (\d+)") is None
+
+
+class TestRenderDependency:
+    def test_slurm(self):
+        compute = {
+            "dependency_template": "--dependency=afterok:{JOB_IDS}",
+            "dependency_delimiter": ":",
+        }
+        assert (
+            _render_dependency(compute, ["1", "2", "3"]) == "--dependency=afterok:1:2:3"
+        )
+
+    def test_sge(self):
+        compute = {
+            "dependency_template": "-hold_jid {JOB_IDS}",
+            "dependency_delimiter": ",",
+        }
+        assert _render_dependency(compute, ["1", "2"]) == "-hold_jid 1,2"
+
+    def test_default_delimiter(self):
+        compute = {"dependency_template": "--dependency=afterok:{JOB_IDS}"}
+        assert _render_dependency(compute, ["1", "2"]) == "--dependency=afterok:1:2"
+
+    def test_no_template(self):
+        assert _render_dependency({"submission_command": "sbatch"}, ["1"]) is None
+
+    def test_no_jobs(self):
+        compute = {"dependency_template": "--dependency=afterok:{JOB_IDS}"}
+        assert _render_dependency(compute, []) is None
+
+
+@pytest.mark.parametrize("package", ["slurm", "sge"])
+def test_default_packages_chain(package):
+    """Default scheduler packages capture IDs and render dependencies."""
+    with open(DEFAULT_CONFIG_FILEPATH) as f:
+        compute = yaml.safe_load(f)["compute_packages"][package]
+    assert _render_dependency(compute, ["7"]) is not None
+    assert compute["job_id_pattern"]
@@ -0,0 +1,36 @@
+"""Tests for timing of looper's phases"""
+
+from looper import profiling
+from looper.profiling import Profiler, phase
+
+
+def test_phase_is_shared_noop_without_session():
+    assert phase("a") is phase("b")
+    with phase("a"):
+        pass
+
+
+def test_phases_are_recorded_in_session():
+    with profiling.profiling() as profiler:
+        for _ in range(3):
+            with phase("outer"):
+                with phase("inner"):
+                    pass
+    with phase("after"):
+        pass
+    rows = {r["phase"]: r for r in profiler.summary()}
+    assert set(rows) == {"outer", "inner"}
+    assert rows["outer"]["count"] == 3
+    assert rows["outer"]["total"] >= rows["inner"]["total"]
+
+
+def test_summary_statistics():
+    profiler = Profiler()
+    profiler.events = [("x", 0, d * 10**6, 1) for d in range(1, 101)]
+    (row,) = profiler.summary()
+    assert row["count"] == 100
+    assert row["p50"] == 0.050
+    assert row["p95"] == 0.095
+    assert row["max"] == 0.100
+    assert abs(row["mean"] - 0.0505) < 1e-12
+    assert "x" in profiler.format_summary()
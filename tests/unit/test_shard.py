@@ -0,0 +1,40 @@
+"""Tests for deterministic sharding of samples"""
+
+import pytest
+
+from looper.utils import parse_shard, sample_in_shard
+
+
+@pytest.mark.parametrize(
+    ["arg", "expected"], [("1/1", (1, 1)), ("2/4", (2, 4)), ("4/4", (4, 4))]
+)
+def test_parse_shard(arg, expected):
+    assert parse_shard(arg) == expected
+
+
+@pytest.mark.parametrize("arg", ["", "2", "0/4", "5/4", "1/0", "a/b", "1/2/3", "-1/2"])
+def test_parse_shard__invalid(arg):
+    with pytest.raises(ValueError):
+        parse_shard(arg)
+
+
+@pytest.mark.parametrize("num_shards", [1, 2, 3, 7])
+def test_shards_partition_samples(num_shards):
+    """Every sample is assigned to exactly one shard."""
+    sample_ids = [f"sample{i}" for i in range(200)]
+    for sample_id in sample_ids:
+        assigned = [
+            k
+            for k in range(1, num_shards + 1)
+            if sample_in_shard(sample_id, k, num_shards)
+        ]
+        assert len(assigned) == 1
+
+
+def test_shard_assignment_is_stable():
+    """Assignment depends only on the sample identifier, not on ordering."""
+    sample_ids = [f"sample{i}" for i in range(50)]
+    first = [s for s in sample_ids if sample_in_shard(s, 1, 3)]
+    second = [s for s in reversed(sample_ids) if sample_in_shard(s, 1, 3)]
+    assert sorted(first) == sorted(second)
+    assert 0 < len(first) < len(sample_ids)
@@ -0,0 +1,60 @@
+"""Tests for the streaming table export"""
+
+import csv
+
+from pipestat import PipestatManager
+from yaml import dump
+
+from looper.table import export_table, iter_record_chunks
+
+
+def _psm(tmp_path, num_records):
+    schema = tmp_path / "schema.yaml"
+    schema.write_text(
+        dump(
+            {
+                "pipeline_name": "pl",
+                "samples": {
+                    "reads": {"type": "integer", "description": "reads"},
+                    "ratio": {"type": "number", "description": "ratio"},
+                    "plot": {"type": "file", "description": "plot"},
+                },
+            }
+        )
+    )
+    psm = PipestatManager(
+        schema_path=str(schema), results_file_path=str(tmp_path / "results.yaml")
+    )
+    for i in range(num_records):
+        psm.report(record_identifier=f"s{i}", values={"reads": i})
+    return psm
+
+
+def test_records_come_in_chunks(tmp_path):
+    psm = _psm(tmp_path, 7)
+    chunks = list(iter_record_chunks(psm, chunk_size=3))
+    assert [len(c) for c in chunks] == [3, 3, 1]
+    assert {r["record_identifier"] for c in chunks for r in c} == {
+        f"s{i}" for i in range(7)
+    }
+
+
+def test_tsv_has_column_per_result(tmp_path):
+    psm = _psm(tmp_path, 2)
+    psm.report(
+        record_identifier="s1",
+        values={"ratio": 0.5, "plot": {"path": "p.txt", "title": "Plot"}},
+    )
+    path = export_table(psm, "tsv", output_dir=str(tmp_path / "out"), chunk_size=1)
+    with open(path) as f:
+        rows = list(csv.DictReader(f, delimiter="\t"))
+    assert list(rows[0]) == ["record_identifier", *psm.result_schemas]
+    by_id = {r["record_identifier"]: r for r in rows}
+    assert by_id["s0"] == {
+        "record_identifier": "s0",
+        "reads": "0",
+        "ratio": "",
+        "plot": "",
+    }
+    assert by_id["s1"]["ratio"] == "0.5"
+    assert '"title": "Plot"' in by_id["s1"]["plot"]
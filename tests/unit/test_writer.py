@@ -0,0 +1,73 @@
+"""Tests for the background writer"""
+
+import os
+import stat
+import threading
+
+import pytest
+
+from looper.utils import write_if_changed
+from looper.writer import BackgroundWriter
+
+
+def test_wait_covers_writes_queued_before():
+    gate = threading.Event()
+    done = []
+    writer = BackgroundWriter(max_workers=2)
+    writer.submit("a", lambda: (gate.wait(), done.append("a")))
+    writer.submit("b", done.append, "b")
+    writer.submit("c", lambda: (gate.wait(), done.append("c")))
+    gate.set()
+    writer.wait("b")
+    assert {"a", "b"} <= set(done)
+    writer.flush()
+    assert sorted(done) == ["a", "b", "c"]
+
+
+def test_writes_of_a_path_keep_their_order():
+    done = []
+    gate = threading.Event()
+    writer = BackgroundWriter(max_workers=4)
+    writer.submit("a", lambda: (gate.wait(), done.append(1)))
+    threading.Timer(0.05, gate.set).start()
+    writer.submit("a", done.append, 2)
+    writer.flush()
+    assert done == [1, 2]
+
+
+def test_errors_surface_on_wait():
+    def fail():
+        raise OSError("disk full")
+
+    writer = BackgroundWriter()
+    writer.submit("a", fail)
+    with pytest.raises(OSError, match="disk full"):
+        writer.wait("a")
+    # a failed write is reported once
+    writer.flush()
+
+
+def test_pending_writes_are_bounded():
+    gate = threading.Event()
+    writer = BackgroundWriter(max_workers=1, max_pending=2)
+    writer.submit("a", gate.wait)
+    writer.submit("b", gate.wait)
+    queued = threading.Event()
+    t = threading.Thread(target=lambda: (writer.submit("c", len, ""), queued.set()))
+    t.start()
+    assert not queued.wait(0.1)
+    gate.set()
+    assert queued.wait(5)
+    t.join()
+    writer.flush()
+
+
+def test_written_files_follow_the_current_umask(tmp_path):
+    old = os.umask(0o027)
+    try:
+        path = tmp_path / "script.sub"
+        assert write_if_changed(str(path), "echo hi\n")
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
+        assert os.umask(0o027) == 0o027
+    finally:
+        os.umask(old)